@@ -0,0 +1,202 @@
+"""
+AKIŞ SAYAÇLARI
+On binlerce ürünlü kataloglarda çift sayım tablosu yüz milyonlarca anahtara
+çıkabilir. Bu modül çiftleri sabit bellekte, hata sınırları bilinen iki özetle
+sayar:
+
+    CountMinSketch : her çift için üst sınır (asla eksik saymaz);
+                     hata ≤ ε·(toplam çift) en az 1-δ olasılıkla
+    MisraGries     : en sık çiftlerin tablosu (Space-Saving'in birleştirilebilir
+                     eşi); sayılar asla fazla değildir, eksik sayım ≤ toplam azaltma
+
+İkisi birlikte her çift için [alt, üst] aralığı verir: alt sınırı min_support'u
+geçen çiftler kesin olarak sıktır.
+"""
+
+import math
+
+import numpy as np
+
+
+_ANAHTAR_KAYDIRMA = 32           # Çift anahtarı: id1 << 32 | id2
+_BLOK_CIFT = 4_000_000           # Bir seferde üretilen en fazla çift sayısı (bellek sınırı)
+
+
+def cift_anahtarlari(sepet_verisi):
+    """
+    Her sepetin tüm (id1 < id2) çiftlerini int64 anahtar dizisi olarak üretir
+    Sepetler bloklar halinde işlenir; her blok için bir dizi döner (generator)
+    """
+    indptr, indices = sepet_verisi.indptr, sepet_verisi.indices.astype(np.int64)
+    boyutlar = np.diff(indptr)
+    kumulatif = np.cumsum(boyutlar * (boyutlar - 1) // 2)
+
+    bas = 0
+    while bas < len(boyutlar):
+        onceki = kumulatif[bas - 1] if bas else 0
+        son = max(int(np.searchsorted(kumulatif, onceki + _BLOK_CIFT, side='right')), bas + 1)
+
+        # Sepet içindeki her konum, kendinden sonraki konumlarla eşleşir
+        konumlar = np.arange(indptr[bas], indptr[son])
+        sonraki = np.repeat(indptr[bas + 1:son + 1], boyutlar[bas:son]) - konumlar - 1
+        ilk = np.repeat(konumlar, sonraki)
+        baslangic = np.repeat(np.cumsum(sonraki) - sonraki, sonraki)
+        ikinci = ilk + 1 + (np.arange(len(ilk)) - baslangic)
+        yield (indices[ilk] << _ANAHTAR_KAYDIRMA) | indices[ikinci]
+        bas = son
+
+
+def anahtardan_cift(anahtar):
+    return (int(anahtar) >> _ANAHTAR_KAYDIRMA, int(anahtar) & ((1 << _ANAHTAR_KAYDIRMA) - 1))
+
+
+class CountMinSketch:
+    """
+    derinlik x genişlik sayaç tablosu; her satır ayrı bir çarp-kaydır hash'i kullanır
+    Tahmin satırlardaki en küçük sayaçtır: gerçek ≤ tahmin ≤ gerçek + ε·toplam
+    """
+
+    def __init__(self, genislik, derinlik, tohum=0):
+        self.bit = max(int(math.ceil(math.log2(genislik))), 1)
+        self.genislik = 1 << self.bit
+        self.derinlik = derinlik
+        rng = np.random.default_rng(tohum)
+        self._carpanlar = rng.integers(1, 2**63, derinlik, dtype=np.uint64) | np.uint64(1)
+        self._eklenenler = rng.integers(0, 2**63, derinlik, dtype=np.uint64)
+        self.sayaclar = np.zeros((derinlik, self.genislik), dtype=np.int64)
+        self.toplam = 0
+
+    @classmethod
+    def hatadan(cls, epsilon=1e-4, delta=0.01, tohum=0):
+        """
+        Hata oranı ε ve başarısızlık olasılığı δ için boyutlandırır
+        (çarp-kaydır hash'i 2-evrensel olduğundan genişlik 2e/ε alınır)
+        """
+        return cls(2 * math.e / epsilon, math.ceil(math.log(1 / delta)), tohum)
+
+    @property
+    def epsilon(self):
+        return 2 * math.e / self.genislik
+
+    @property
+    def hata_payi(self):
+        """Tahminin gerçek sayıyı en fazla ne kadar aşabileceği (1-δ olasılıkla)"""
+        return self.epsilon * self.toplam
+
+    def _hashler(self, anahtarlar):
+        anahtarlar = np.asarray(anahtarlar, dtype=np.int64).view(np.uint64)
+        kaydirma = np.uint64(64 - self.bit)
+        return [((anahtarlar * a + b) >> kaydirma).astype(np.int64)
+                for a, b in zip(self._carpanlar, self._eklenenler)]
+
+    def ekle(self, anahtarlar, sayilar):
+        """Tekil anahtarları verilen sayılarla ekler"""
+        # np.add.at tam sayı toplar; bincount'un float64 ağırlıkları 2^53'ü aşınca yuvarlanırdı
+        sayilar = np.asarray(sayilar, dtype=np.int64)
+        for satir, hashler in zip(self.sayaclar, self._hashler(anahtarlar)):
+            np.add.at(satir, hashler, sayilar)
+        self.toplam += int(sayilar.sum())
+
+    def tahmin(self, anahtarlar):
+        """Anahtarların üst sınır tahminleri (satırlardaki en küçük sayaç)"""
+        return np.min([satir[hashler] for satir, hashler
+                       in zip(self.sayaclar, self._hashler(anahtarlar))], axis=0)
+
+    def bellek(self):
+        return self.sayaclar.nbytes
+
+
+class MisraGries:
+    """
+    En fazla kapasite kadar anahtarın sayısını tutan sık öğe özeti
+    Yeni bir parça özetle birleştirilir; tablo taşarsa (kapasite+1)'inci en büyük
+    sayı tüm sayılardan düşülür ve sıfıra inenler atılır. Her anahtar için:
+    sayı ≤ gerçek ≤ sayı + azaltma, azaltma ≤ toplam / (kapasite + 1)
+    """
+
+    def __init__(self, kapasite=100_000):
+        self.kapasite = kapasite
+        self.anahtarlar = np.zeros(0, dtype=np.int64)   # Sıralı
+        self.sayilar = np.zeros(0, dtype=np.int64)
+        self.azaltma = 0
+
+    def ekle(self, anahtarlar, sayilar):
+        """Tekil (sıralı) anahtarları ve parçadaki sayılarını özete katar"""
+        birlesik = np.concatenate([self.anahtarlar, anahtarlar])
+        agirliklar = np.concatenate([self.sayilar, np.asarray(sayilar, dtype=np.int64)])
+        self.anahtarlar, ters = np.unique(birlesik, return_inverse=True)
+        self.sayilar = np.zeros(len(self.anahtarlar), dtype=np.int64)
+        np.add.at(self.sayilar, ters, agirliklar)
+
+        if len(self.anahtarlar) > self.kapasite:
+            esik = np.partition(self.sayilar, -(self.kapasite + 1))[-(self.kapasite + 1)]
+            self.azaltma += int(esik)
+            self.sayilar -= esik
+            kalan = self.sayilar > 0
+            self.anahtarlar, self.sayilar = self.anahtarlar[kalan], self.sayilar[kalan]
+
+    def bellek(self):
+        return self.anahtarlar.nbytes + self.sayilar.nbytes
+
+
+class AkisCiftSayaci:
+    """
+    Sepet parçalarını akış halinde alan, sabit bellekli yaklaşık çift sayacı
+    epsilon, delta: Count-Min hata sınırı; kapasite: sık çift tablosunun boyutu
+    """
+
+    def __init__(self, epsilon=1e-4, delta=0.01, kapasite=100_000, tohum=0):
+        self.sketch = CountMinSketch.hatadan(epsilon, delta, tohum)
+        self.sik_ciftler = MisraGries(kapasite)
+        self.toplam_sepet = 0
+
+    def guncelle(self, sepet_verisi):
+        """Bir sepet parçasının tüm çiftlerini iki özete ekler"""
+        for anahtarlar in cift_anahtarlari(sepet_verisi):
+            tekil, sayilar = np.unique(anahtarlar, return_counts=True)
+            self.sketch.ekle(tekil, sayilar)
+            self.sik_ciftler.ekle(tekil, sayilar)
+        self.toplam_sepet += sepet_verisi.sepet_sayisi
+
+    def tahmin(self, urun1, urun2):
+        """Tek bir çiftin (alt, üst) sepet sayısı sınırları"""
+        urun1, urun2 = min(urun1, urun2), max(urun1, urun2)
+        anahtar = (urun1 << _ANAHTAR_KAYDIRMA) | urun2
+        ust = int(self.sketch.tahmin([anahtar])[0])
+        konum = np.searchsorted(self.sik_ciftler.anahtarlar, anahtar)
+        if konum < len(self.sik_ciftler.anahtarlar) and self.sik_ciftler.anahtarlar[konum] == anahtar:
+            alt = int(self.sik_ciftler.sayilar[konum])
+            return alt, min(ust, alt + self.sik_ciftler.azaltma)
+        return 0, min(ust, self.sik_ciftler.azaltma)
+
+    def destekli_ciftler(self, min_support=0.05):
+        """
+        (kesin, olasi) döndürür; ikisi de {(id1, id2): {'sepet_sayisi', 'support',
+        'ust_sepet_sayisi'}} formatındadır ('sepet_sayisi' alt sınırdır)
+            kesin : alt sınırı min_support'u geçen çiftler (kesinlikle sık)
+            olasi : sadece üst sınırı geçen çiftler (sık olabilir)
+        Tablo dışındaki bir çift en fazla 'azaltma' kadar görülmüş olabilir;
+        azaltma eşiğin altındaysa sık çiftlerin hepsi bu iki sözlüktedir.
+        """
+        min_sepet_sayisi = max(int(min_support * self.toplam_sepet), 1)
+        anahtarlar = self.sik_ciftler.anahtarlar
+        alt = self.sik_ciftler.sayilar
+        ust = np.minimum(self.sketch.tahmin(anahtarlar), alt + self.sik_ciftler.azaltma)
+
+        kesin, olasi = {}, {}
+        for anahtar, alt_sayi, ust_sayi in zip(anahtarlar.tolist(), alt.tolist(), ust.tolist()):
+            if ust_sayi < min_sepet_sayisi:
+                continue
+            hedef = kesin if alt_sayi >= min_sepet_sayisi else olasi
+            hedef[anahtardan_cift(anahtar)] = {'sepet_sayisi': alt_sayi,
+                                               'support': alt_sayi / self.toplam_sepet,
+                                               'ust_sepet_sayisi': ust_sayi}
+        return kesin, olasi
+
+    def eksiksiz_mi(self, min_support=0.05):
+        """Eşiği geçen her çiftin tabloda olduğu garanti mi?"""
+        return self.sik_ciftler.azaltma < max(int(min_support * self.toplam_sepet), 1)
+
+    def bellek(self):
+        """Özetlerin bayt cinsinden bellek kullanımı (veri boyutundan bağımsız)"""
+        return self.sketch.bellek() + self.sik_ciftler.bellek()
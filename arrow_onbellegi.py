@@ -0,0 +1,138 @@
+"""
+ARROW ÖNBELLEĞİ
+Uzun formatlı satış kayıtlarından hazırlanan seyrek sepetleri, kaynak dosyanın
+yanına sıkıştırılmamış Arrow IPC dosyası olarak yazar. Sonraki yüklemelerde
+dosya memory-map ile açılır ve ürün ID sütunu kopyalanmadan (zero-copy) NumPy
+dizisi olarak kullanılır.
+
+Tablo sütunları (her satır bir sepet-ürün çifti, CSR sırasında):
+    islem : dictionary<int64 sepet kodu, orijinal işlem ID'si>
+    urun  : int32  ürün ID'si
+Şema metadata'sı ürün isimlerini, sepet sayısını, kaynak sütun isimlerini ve
+kaynak dosyanın parmak izini (boyut, mtime, içerik özeti) taşır.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from sepet_veri import (
+    SepetVerisi, UrunSozlugu, uzun_format_yukle, kaynak_parmak_izi, parmak_izi_uyuyor
+)
+
+
+ONBELLEK_UZANTI = '.sepet.arrow'
+_METADATA_ANAHTARI = b'sepet_onbellegi'
+
+
+def onbellek_yolu(kaynak_yolu):
+    """Kaynak dosyanın yanındaki Arrow önbellek dosyasının yolu"""
+    return str(kaynak_yolu) + ONBELLEK_UZANTI
+
+
+def onbellege_yaz(sepet_verisi, dosya_yolu, bilgi, islemler):
+    """
+    SepetVerisi'nin CSR dizilerini Arrow IPC dosyasına yazar
+    bilgi: metadata'ya eklenecek kaynak parmak izi ve sütun isimleri
+    islemler: sepet koduna göre sıralı orijinal işlem ID'leri
+    """
+    sepet_kodlari = np.repeat(np.arange(sepet_verisi.sepet_sayisi, dtype=np.int64),
+                              sepet_verisi.sepet_boyutlari())
+    # Sepet kodları sözlük indeksi olarak saklanır; işlem ID'leri bir kez yazılır
+    islem = pa.DictionaryArray.from_arrays(sepet_kodlari, pa.array(np.asarray(islemler)))
+    tablo = pa.table({'islem': islem, 'urun': sepet_verisi.indices})
+    metadata = dict(bilgi, urunler=sepet_verisi.urunler,
+                    sepet_sayisi=sepet_verisi.sepet_sayisi)
+    tablo = tablo.replace_schema_metadata(
+        {_METADATA_ANAHTARI: json.dumps(metadata, ensure_ascii=False)}
+    )
+
+    # Yarım kalmış dosya bırakmamak için önce geçici dosyaya yaz
+    gecici_yol = dosya_yolu + '.tmp'
+    with pa.OSFile(gecici_yol, 'wb') as hedef:
+        with pa.ipc.new_file(hedef, tablo.schema) as yazici:
+            yazici.write_table(tablo)
+    os.replace(gecici_yol, dosya_yolu)
+
+
+def onbellek_bilgisi(dosya_yolu):
+    """Önbellek dosyasının metadata'sını okur (veriye dokunmadan)"""
+    with pa.memory_map(dosya_yolu, 'r') as kaynak:
+        sema = pa.ipc.open_file(kaynak).schema
+    return json.loads(sema.metadata[_METADATA_ANAHTARI])
+
+
+def onbellekten_oku(dosya_yolu):
+    """
+    Arrow IPC önbelleğini memory-map ile açıp SepetVerisi kurar
+    Ürün ID'leri dosyadaki tampon üzerinden kopyalanmadan okunur
+    """
+    tablo = pa.ipc.open_file(pa.memory_map(dosya_yolu, 'r')).read_all()
+    bilgi = json.loads(tablo.schema.metadata[_METADATA_ANAHTARI])
+
+    indices = _sutun_dizisi(tablo.column('urun'))
+    islem = tablo.column('islem').combine_chunks()
+    sepet_kodlari = islem.indices.to_numpy(zero_copy_only=True)
+
+    sepet_sayisi = bilgi['sepet_sayisi']
+    indptr = np.zeros(sepet_sayisi + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sepet_kodlari, minlength=sepet_sayisi), out=indptr[1:])
+
+    veri = _ham_veri(islem.dictionary.to_numpy(zero_copy_only=False), sepet_kodlari,
+                     indices, bilgi['urunler'], bilgi['sutunlar'])
+    return SepetVerisi(veri, UrunSozlugu(bilgi['urunler']), None, indptr, indices)
+
+
+def _ham_veri(islemler, sepet_kodlari, indices, urunler, sutunlar):
+    # Görüntüleme için ham veri orijinal işlem ID'si + ürün ismi olarak kurulur
+    # (CSR sırasında, aynı sepette tekrarlanan ürünler teke indirilmiş haliyle);
+    # ilk ve sonraki yüklemeler aynı tabloyu döndürür
+    islem_sutunu, urun_sutunu = sutunlar
+    return pd.DataFrame({
+        islem_sutunu: np.asarray(islemler)[sepet_kodlari],
+        urun_sutunu: pd.Categorical.from_codes(indices, urunler)
+    })
+
+
+def _sutun_dizisi(sutun):
+    # Tek parçalı sütun doğrudan NumPy görünümüne çevrilir (zero-copy)
+    if sutun.num_chunks == 1:
+        return sutun.chunk(0).to_numpy(zero_copy_only=True)
+    return sutun.to_numpy()
+
+
+def onbellekli_uzun_format_yukle(dosya_yolu, islem_sutunu='transaction_id',
+                                 urun_sutunu='product'):
+    """
+    uzun_format_yukle'nin önbellekli hali
+    Önbellek, kaynak dosyanın boyutu/mtime'ı/içerik özeti veya sütun
+    seçimi değişince geçersiz sayılır ve yeniden yazılır
+    """
+    yol = onbellek_yolu(dosya_yolu)
+    sutunlar = [islem_sutunu, urun_sutunu]
+
+    if os.path.exists(yol):
+        try:
+            bilgi = onbellek_bilgisi(yol)
+            if bilgi.get('sutunlar') == sutunlar and parmak_izi_uyuyor(bilgi.get('kaynak'), dosya_yolu):
+                return onbellekten_oku(yol)
+        except (pa.ArrowInvalid, KeyError, ValueError):
+            pass  # Bozuk önbellek yeniden yazılır
+
+    parmak_izi = kaynak_parmak_izi(dosya_yolu)
+    sepet_verisi = uzun_format_yukle(dosya_yolu, islem_sutunu, urun_sutunu)
+    # İşlem ID'leri uzun_format_yukle'deki sepet kodu sırasıyla (ilk görülme) alınır
+    islemler = pd.unique(sepet_verisi.veri[islem_sutunu])
+    try:
+        onbellege_yaz(sepet_verisi, yol, {'kaynak': parmak_izi, 'sutunlar': sutunlar}, islemler)
+    except PermissionError:
+        pass  # Kaynak klasörü yazılamıyorsa önbelleksiz devam edilir
+
+    # Ham veri önbellekten okunan haliyle aynı (CSR sıralı, tekrarsız) tabloya çevrilir
+    sepet_kodlari = np.repeat(np.arange(sepet_verisi.sepet_sayisi), sepet_verisi.sepet_boyutlari())
+    veri = _ham_veri(islemler, sepet_kodlari, sepet_verisi.indices,
+                     sepet_verisi.urunler, sutunlar)
+    return SepetVerisi(veri, sepet_verisi.sozluk, None, sepet_verisi.indptr, sepet_verisi.indices)
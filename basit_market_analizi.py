@@ -3,12 +3,28 @@ BASIT MARKET SEPETİ ANALİZİ
 Bu dosya öğrenciler için Market Basket Analysis'in temellerini öğretmek amacıyla yazılmıştır.
 """
 
-import pandas as pd
 import numpy as np
-from itertools import combinations
+from collections import Counter
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from sepet_veri import (
+    SepetVerisi, UrunSozlugu, onehot_parcalari, listelerden_sepet_verisi, sozluge_esle
+)
+from arrow_onbellegi import onbellekli_uzun_format_yukle
+from bitset_deposu import sepet_verisi_yukle
+from sonuc_onbellegi import onbellekli
+from onizleme import ornek_madencilik, ORNEK_BOYUTU
+from akis_sayaclari import AkisCiftSayaci
+from zaman_penceresi import KayanPencereSayaci, SonumluSayac
+from oge_madenciligi import (
+    MADENCILER, KUME_MODLARI, en_sik_k_kume, kume_kurallari, son_madencilik
+)
+from birliktelik_motoru import (
+    urun_frekanslari, cift_frekanslari, destek_filtrele, kural_olustur,
+    en_iyi_k_kural, urun_icin_oneriler
+)
+
 
 class BasitMarketAnalizi:
     """
@@ -16,33 +32,240 @@ class BasitMarketAnalizi:
     """
     
     def __init__(self):
-        self.veri = None
-        self.sepetler = []
-        self.urun_sayilari = {}
-        self.birliktelikler = {}
-        
+        self.sepet_verisi = None     # CSR sepet deposu (ürün ID'leri)
+        self.sozluk = None           # Ürün ismi <-> ID eşlemesi
+        self.toplam_sepet = 0
+        self.urun_sayilari = None    # Ürün ID'sine göre sepet sayıları
+        self.cift_sayilari = None    # (id1, id2) -> birlikte görüldüğü sepet sayısı
+        self.cift_sayaci = None      # Yaklaşık akış modunda sabit bellekli çift sayacı
+        self.zaman_sayaci = None     # Kayan pencere / sönümlü modda zaman damgalı sayaç
+        self.sepet_boyutu_dagilimi = None  # Sepet boyutu -> sepet sayısı
+        self.birliktelikler = {}     # (id1, id2) -> {'sepet_sayisi', 'support'}
+        self.min_support = None      # Son birliktelik analizinin eşiği
+        self.sik_kumeler = {}        # Sık küme analizi sonucu: (id1, id2, ...) -> destek bilgisi
+        
+    @property
+    def veri(self):
+        """Ham veri tablosu; bitset deposundan yüklendiyse ilk erişimde kurulur"""
+        return self.sepet_verisi.veri if self.sepet_verisi is not None else None
+    
     def veri_yukle(self, dosya_yolu):
         """
         Veriyi yükler ve sepet formatına çevirir
+        Ham tabloyu döndürür (sıcak yüklemede tablo bu ilk erişimde kurulur)
         """
         print("📁 Veri yükleniyor...")
         
-        # CSV dosyasını oku
-        self.veri = pd.read_csv(dosya_yolu, index_col=0)
-        print(f"✅ Veri yüklendi: {self.veri.shape[0]} sepet, {self.veri.shape[1]} ürün")
+        # Güncel bitset dosyası varsa memmap ile aç, yoksa CSV'yi okuyup dosyayı yaz
+        self._sepet_verisini_ayarla(sepet_verisi_yukle(dosya_yolu))
+        print(f"✅ Veri yüklendi: {len(self.sozluk)} ürün")
         
-        # Sepetleri oluştur (True olan ürünleri liste haline getir)
-        for i, satir in self.veri.iterrows():
-            sepet = []
-            for urun in self.veri.columns:
-                if satir[urun] == True or satir[urun] == 'True':
-                    sepet.append(urun)
-            if sepet:  # Boş sepetleri ekleme
-                self.sepetler.append(sepet)
+        print(f"✅ {self.toplam_sepet} sepet hazırlandı")
+        return self.veri
+    
+    def uzun_format_yukle(self, dosya_yolu, islem_sutunu='transaction_id', urun_sutunu='product'):
+        """
+        (işlem, ürün) satırlarından oluşan satış kayıtlarını yükler (CSV veya Parquet)
+        Geniş tablo kurulmadan sepetler doğrudan seyrek formatta oluşturulur.
+        İlk yüklemede kaynağın yanına Arrow önbelleği yazılır, sonrakilerde o okunur.
+        Döndürülen ham veri CSR sırasında ve sepet içi tekrarları atılmış haldedir.
+        """
+        print("📁 Uzun formatlı veri yükleniyor...")
         
-        print(f"✅ {len(self.sepetler)} sepet hazırlandı")
+        self._sepet_verisini_ayarla(
+            onbellekli_uzun_format_yukle(dosya_yolu, islem_sutunu, urun_sutunu)
+        )
+        print(f"✅ Veri yüklendi: {len(self.sepet_verisi.indices)} sepet-ürün çifti, "
+              f"{self.toplam_sepet} sepet, {len(self.sozluk)} ürün")
         return self.veri
     
+    def _sepet_verisini_ayarla(self, sepet_verisi):
+        """
+        Yeni yüklenen SepetVerisi'ni analiz durumuna yerleştirir, eski sayımları siler
+        """
+        self.sepet_verisi = sepet_verisi
+        self.sozluk = sepet_verisi.sozluk
+        self.toplam_sepet = sepet_verisi.sepet_sayisi
+        self.urun_sayilari = None
+        self.cift_sayilari = None
+        self.cift_sayaci = None
+        self.zaman_sayaci = None
+        self.sepet_boyutu_dagilimi = None
+        self.birliktelikler = {}
+        self.min_support = None
+        self.sik_kumeler = {}
+    
+    def akisla_yukle(self, dosya_yolu, parca_boyutu=100_000, yaklasik=False, kapasite=100_000,
+                     epsilon=1e-4):
+        """
+        RAM'e sığmayan dosyalar için akış modu
+        CSV parça parça okunur; ham veri ve sepetler tutulmaz, sadece ürün ve
+        çift sayım tabloları güncellenir. Bellek kullanımı satır sayısına değil
+        parça boyutuna ve sayım tablolarına bağlıdır.
+        yaklasik: Çiftler tam tablo yerine sabit bellekli özetlerde sayılır
+                  (Count-Min + sık çift tablosu); çok büyük kataloglar için
+        kapasite, epsilon: Sık çift tablosu boyutu ve Count-Min hata oranı
+        """
+        print(f"📁 Veri parça parça yükleniyor (parça boyutu: {parca_boyutu})...")
+        
+        self.sepet_verisi = None
+        self.sozluk = None
+        self.toplam_sepet = 0
+        self.urun_sayilari = None
+        self.cift_sayilari = None if yaklasik else Counter()
+        self.cift_sayaci = AkisCiftSayaci(epsilon=epsilon, kapasite=kapasite) if yaklasik else None
+        self.zaman_sayaci = None
+        self.sepet_boyutu_dagilimi = None
+        self.birliktelikler = {}
+        self.min_support = None
+        self.sik_kumeler = {}
+        
+        for i, parca in enumerate(onehot_parcalari(dosya_yolu, parca_boyutu), 1):
+            self._sayimlari_guncelle(parca)
+            print(f"  Parça {i}: toplam {self.toplam_sepet} sepet işlendi")
+        
+        print(f"✅ {self.toplam_sepet} sepet, {len(self.sozluk)} ürün sayıldı")
+        if yaklasik:
+            print(f"   Çift özetleri: {self.cift_sayaci.bellek() / 1024**2:.1f} MB (sabit)")
+    
+    def sepet_ekle(self, yeni_sepetler, zamanlar=None):
+        """
+        Artımlı güncelleme: yeni bir sepet grubunu (ör. günün satışları) ekler
+        Sadece yeni sepetler taranır; ürün ve çift sayım tabloları yerinde
+        güncellenir, destekler ve kurallar bu sayımlardan yeniden türetilir.
+        yeni_sepetler: ürün ismi listeleri veya SepetVerisi
+        zamanlar: Her sepetin zaman damgası (kayan pencere / sönümlü modda)
+        """
+        if self.zaman_sayaci is None:
+            self._sayim_tablolarini_hazirla()
+        
+        if isinstance(yeni_sepetler, SepetVerisi):
+            parca = sozluge_esle(yeni_sepetler, self.sozluk)
+        else:
+            if zamanlar is not None:
+                # Boş sepetler eklenmediği için zamanları da atlanır
+                zamanlar = [zaman for zaman, sepet in zip(zamanlar, yeni_sepetler) if sepet]
+            parca = listelerden_sepet_verisi(yeni_sepetler, self.sozluk)
+        
+        if self.zaman_sayaci is not None:
+            # Pencereden çıkan sepetler sayaç içinde düşülür
+            self.zaman_sayaci.ekle(parca, zamanlar)
+            self._zaman_sayimlarini_al()
+        else:
+            self._sayimlari_guncelle(parca)
+        
+        # Destekler yeni toplam sepet sayısına göre sayımlardan yeniden türetilir
+        if self.min_support is not None:
+            self.birliktelikler = self._destekli_ciftler(self.min_support)
+        
+        print(f"✅ {parca.sepet_sayisi} yeni sepet eklendi (toplam {self.toplam_sepet:.0f})")
+    
+    def kayan_pencere_kur(self, son_sepet=None, son_gun=None, zamanlar=None):
+        """
+        Kayan pencere modu: sayımlar sadece son N sepeti veya son N günü kapsar
+        Yüklü sepetler varsa pencere onlarla başlar (gün penceresi için zamanlar
+        verilmelidir); sonraki sepetler sepet_ekle(yeni_sepetler, zamanlar) ile
+        eklenir, pencereden çıkan en eski sepetler sayımlardan düşülür.
+        zamanlar: Yüklü (dolu) sepetlerin zaman damgaları, yüklenme sırasıyla
+        """
+        self._zaman_sayacini_kur(KayanPencereSayaci(son_sepet, son_gun), zamanlar)
+        sinirlar = [f"son {son_sepet} sepet" if son_sepet is not None else None,
+                    f"son {son_gun} gün" if son_gun is not None else None]
+        print(f"🪟 Kayan pencere: {' / '.join(s for s in sinirlar if s)}")
+    
+    def sonumlu_sayim_kur(self, yari_omur_gun=None, yari_omur_sepet=None, zamanlar=None):
+        """
+        Üstel sönümlü mod: her sepetin ağırlığı yaşı bir yarı ömür arttıkça yarıya iner
+        Yaş gün (zaman damgalarından) veya sepet sırası cinsinden verilir.
+        Sayımlar ve toplam sepet sayısı ağırlıklı (etkin) değerlerdir.
+        Yüklü sepetler varsa sayım onlarla başlar (gün cinsinden yarı ömür için
+        zamanlar verilmelidir).
+        """
+        self._zaman_sayacini_kur(SonumluSayac(yari_omur_gun, yari_omur_sepet), zamanlar)
+        birim = "gün" if yari_omur_gun is not None else "sepet"
+        print(f"⏳ Sönümlü sayım: yarı ömür {yari_omur_gun or yari_omur_sepet} {birim}")
+    
+    def _zaman_sayacini_kur(self, sayac, zamanlar=None):
+        """
+        Zaman damgalı sayacı etkinleştirir ve yüklü sepetleri ona aktarır; eski
+        sayım tabloları bırakılır (ürün sözlüğü korunur, ID'ler uyumlu kalır)
+        Sepetleri tutulmayan veri (akış modu, artımlı eklemeler) ya da zaman
+        damgası gereken sayaç için zamanı verilmemiş sepetler aktarılamaz; o
+        durumda sayaç boş başlar ve sadece sonraki sepet_ekle çağrıları sayılır.
+        """
+        yuklu = self.sepet_verisi
+        if yuklu is not None and yuklu.sepet_sayisi != self.toplam_sepet:
+            yuklu = None   # Artımlı eklenen sepetler sepet_verisi'nde yok
+        
+        if yuklu is not None and (zamanlar is not None or not sayac.zaman_gerekli):
+            sayac.ekle(yuklu, zamanlar)
+        elif self.toplam_sepet:
+            neden = ("zaman damgaları verilmedi" if yuklu is not None
+                     else "sepetlerin tamamı bellekte değil")
+            print(f"⚠️ Yüklü {self.toplam_sepet:.0f} sepet sayaca aktarılmadı ({neden}); "
+                  "sadece bundan sonra eklenen sepetler sayılır")
+        
+        self.sepet_verisi = None
+        if self.sozluk is None:
+            self.sozluk = UrunSozlugu()
+        self.cift_sayilari = None
+        self.cift_sayaci = None
+        self.zaman_sayaci = sayac
+        self.birliktelikler = {}
+        self.min_support = None
+        self.sik_kumeler = {}
+        self._zaman_sayimlarini_al()
+    
+    def _zaman_sayimlarini_al(self):
+        """
+        Zaman sayacının güncel (pencere içi / sönümlü) sayımlarını analiz durumuna kopyalar
+        """
+        sayac = self.zaman_sayaci
+        self.toplam_sepet = sayac.toplam_sepet
+        self.urun_sayilari = sayac.urun_sayilari()
+        self.sepet_boyutu_dagilimi = sayac.sepet_boyutu_dagilimi()
+    
+    def _sayim_tablolarini_hazirla(self):
+        """
+        Artımlı güncellemeden önce sayım tablolarının hazır olmasını sağlar
+        Yüklenmiş sepetler bir kez sayılır; sonrasında tablolar yerinde güncellenir
+        """
+        if self.sozluk is None:
+            self.sozluk = UrunSozlugu()
+            self.urun_sayilari = np.zeros(0, dtype=np.int64)
+            self.sepet_boyutu_dagilimi = np.zeros(1, dtype=np.int64)
+            self.cift_sayilari = Counter()
+        
+        self._urun_popularitesini_hesapla()
+        self._sepet_boyutu_dagilimi()
+        if self.cift_sayilari is None and self.cift_sayaci is None:
+            self.cift_sayilari = onbellekli(self.sepet_verisi.parmak_izi(),
+                                            cift_frekanslari, self.sepet_verisi)
+    
+    def _sayimlari_guncelle(self, parca):
+        """
+        Bir parça sepetin ürün, çift ve sepet boyutu sayımlarını tablolara ekler
+        Sözlüğe yeni ürün eklendiyse sayım dizileri büyütülür
+        """
+        self.sozluk = parca.sozluk
+        urun_sayisi = len(self.sozluk)
+        
+        if self.urun_sayilari is None:
+            self.urun_sayilari = np.zeros(urun_sayisi, dtype=np.int64)
+            self.sepet_boyutu_dagilimi = np.zeros(urun_sayisi + 1, dtype=np.int64)
+        elif len(self.urun_sayilari) < urun_sayisi:
+            self.urun_sayilari = _buyut(self.urun_sayilari, urun_sayisi)
+            self.sepet_boyutu_dagilimi = _buyut(self.sepet_boyutu_dagilimi, urun_sayisi + 1)
+        
+        self.urun_sayilari += urun_frekanslari(parca)
+        if self.cift_sayaci is not None:
+            self.cift_sayaci.guncelle(parca)
+        else:
+            self.cift_sayilari.update(cift_frekanslari(parca))
+        self.sepet_boyutu_dagilimi += np.bincount(parca.sepet_boyutlari(),
+                                                  minlength=urun_sayisi + 1)
+        self.toplam_sepet += parca.sepet_sayisi
+    
     def temel_istatistikler(self):
         """
         Veri hakkında temel bilgileri gösterir
@@ -51,45 +274,58 @@ class BasitMarketAnalizi:
         print("=" * 40)
         
         # Toplam sepet sayısı
-        print(f"Toplam sepet sayısı: {len(self.sepetler)}")
+        print(f"Toplam sepet sayısı: {self.toplam_sepet:.0f}")
         
-        # Her sepetteki ortalama ürün sayısı
-        sepet_boyutlari = [len(sepet) for sepet in self.sepetler]
-        print(f"Ortalama ürün/sepet: {np.mean(sepet_boyutlari):.1f}")
-        print(f"En fazla ürün/sepet: {max(sepet_boyutlari)}")
-        print(f"En az ürün/sepet: {min(sepet_boyutlari)}")
+        # Her sepetteki ortalama ürün sayısı (boyut dağılımından)
+        dagilim = self._sepet_boyutu_dagilimi()
+        boyutlar = np.nonzero(dagilim)[0]
+        ortalama = (np.arange(len(dagilim)) * dagilim).sum() / dagilim.sum()
+        print(f"Ortalama ürün/sepet: {ortalama:.1f}")
+        print(f"En fazla ürün/sepet: {boyutlar.max()}")
+        print(f"En az ürün/sepet: {boyutlar.min()}")
         
         # Ürün popülaritesi
         self._urun_popularitesini_hesapla()
         
         print(f"\nEn popüler 5 ürün:")
-        sorted_urunler = sorted(self.urun_sayilari.items(), key=lambda x: x[1], reverse=True)
-        for urun, sayi in sorted_urunler[:5]:
-            yuzde = (sayi / len(self.sepetler)) * 100
+        for urun, sayi in self._populer_urunler()[:5]:
+            yuzde = (sayi / self.toplam_sepet) * 100
             print(f"  {urun}: {sayi} sepet (%{yuzde:.1f})")
     
     def _urun_popularitesini_hesapla(self):
         """
-        Her ürünün kaç sepette olduğunu hesaplar
+        Her ürünün kaç sepette olduğunu hesaplar (ID ile indekslenen dizi)
+        Akış modunda ve artımlı güncellemelerde sayımlar zaten günceldir
+        """
+        if self.urun_sayilari is None:
+            self.urun_sayilari = urun_frekanslari(self.sepet_verisi)
+    
+    def _sepet_boyutu_dagilimi(self):
+        """
+        Sepet boyutu -> sepet sayısı dağılımı
+        """
+        if self.sepet_boyutu_dagilimi is None:
+            self.sepet_boyutu_dagilimi = np.bincount(self.sepet_verisi.sepet_boyutlari(),
+                                                     minlength=len(self.sozluk) + 1)
+        return self.sepet_boyutu_dagilimi
+    
+    def _populer_urunler(self):
+        """
+        (ürün ismi, sepet sayısı) çiftlerini çoktan aza sıralı döndürür
         """
-        self.urun_sayilari = {}
-        for sepet in self.sepetler:
-            for urun in sepet:
-                if urun in self.urun_sayilari:
-                    self.urun_sayilari[urun] += 1
-                else:
-                    self.urun_sayilari[urun] = 1
+        sira = np.argsort(-self.urun_sayilari, kind='stable')
+        return [(self.sozluk.isim(urun_id), int(self.urun_sayilari[urun_id]))
+                for urun_id in sira if self.urun_sayilari[urun_id] > 0]
     
     def popular_urunleri_goster(self, top_n=10):
         """
         En popüler ürünleri grafik olarak gösterir
         """
-        if not self.urun_sayilari:
+        if self.urun_sayilari is None:
             self._urun_popularitesini_hesapla()
         
         # En popüler N ürünü al
-        sorted_urunler = sorted(self.urun_sayilari.items(), key=lambda x: x[1], reverse=True)
-        top_urunler = sorted_urunler[:top_n]
+        top_urunler = self._populer_urunler()[:top_n]
         
         # Grafik oluştur
         urunler = [item[0] for item in top_urunler]
@@ -118,40 +354,26 @@ class BasitMarketAnalizi:
         print(f"\n🔗 BİRLİKTELİK ANALİZİ (Min Support: %{min_support*100:.0f})")
         print("=" * 50)
         
-        toplam_sepet = len(self.sepetler)
+        toplam_sepet = self.toplam_sepet
         min_sepet_sayisi = int(min_support * toplam_sepet)
         
         print(f"Minimum sepet sayısı: {min_sepet_sayisi}")
         
-        # Tüm ürün çiftlerini kontrol et
-        tum_urunler = list(self.urun_sayilari.keys())
-        birliktelik_sayilari = {}
-        
-        for sepet in self.sepetler:
-            if len(sepet) >= 2:
-                # Bu sepetteki tüm ürün çiftleri
-                for urun1, urun2 in combinations(sepet, 2):
-                    # Alfabetik sıraya koy (Apple, Bread yerine her zaman aynı sıra)
-                    if urun1 > urun2:
-                        urun1, urun2 = urun2, urun1
-                    
-                    cift = (urun1, urun2)
-                    if cift in birliktelik_sayilari:
-                        birliktelik_sayilari[cift] += 1
-                    else:
-                        birliktelik_sayilari[cift] = 1
+        # Tüm ürün çiftlerini ID'ler üzerinden say (akış modunda zaten sayılı)
+        # Aynı veri için önceki çalıştırmaların sayımı disk önbelleğinden gelir
+        if self.cift_sayilari is None and self.cift_sayaci is None and self.zaman_sayaci is None:
+            self.cift_sayilari = onbellekli(self.sepet_verisi.parmak_izi(),
+                                            cift_frekanslari, self.sepet_verisi)
         
         # Minimum desteği geçen çiftleri filtrele
-        onemli_birliktelikler = {}
-        for cift, sayi in birliktelik_sayilari.items():
-            if sayi >= min_sepet_sayisi:
-                support = sayi / toplam_sepet
-                onemli_birliktelikler[cift] = {
-                    'sepet_sayisi': sayi,
-                    'support': support
-                }
+        onemli_birliktelikler = self._destekli_ciftler(min_support)
         
         print(f"✅ {len(onemli_birliktelikler)} önemli birliktelik bulundu")
+        if self.cift_sayaci is not None:
+            # Yaklaşık modda sadece alt sınırı eşiği geçen (kesin sık) çiftler kullanılır
+            _, olasi = self.cift_sayaci.destekli_ciftler(min_support)
+            print(f"   (yaklaşık sayım: {len(olasi)} çift daha eşiğin üzerinde olabilir"
+                  f"{'' if self.cift_sayaci.eksiksiz_mi(min_support) else ', tablo dışında da kalmış olabilir'})")
         
         # En güçlü birliktelikleri göster
         if onemli_birliktelikler:
@@ -160,14 +382,26 @@ class BasitMarketAnalizi:
                                          key=lambda x: x[1]['support'], reverse=True)
             
             for i, (cift, bilgi) in enumerate(sorted_birliktelikler[:10], 1):
-                urun1, urun2 = cift
+                urun1, urun2 = self.sozluk.isimlere_cevir(cift)
                 print(f"{i:2d}. {urun1} + {urun2}: "
-                      f"{bilgi['sepet_sayisi']} sepet "
+                      f"{bilgi['sepet_sayisi']:.0f} sepet "
                       f"(%{bilgi['support']*100:.1f})")
         
         self.birliktelikler = onemli_birliktelikler
+        self.min_support = min_support
         return onemli_birliktelikler
     
+    def _destekli_ciftler(self, min_support):
+        """
+        Eşiği geçen çiftler; yaklaşık modda sadece kesin sık olanlar
+        ('sepet_sayisi' orada gerçek sayının alt sınırıdır)
+        """
+        if self.cift_sayaci is not None:
+            return self.cift_sayaci.destekli_ciftler(min_support)[0]
+        if self.zaman_sayaci is not None:
+            return self.zaman_sayaci.destekli_ciftler(min_support)
+        return destek_filtrele(self.cift_sayilari, self.toplam_sepet, min_support)
+    
     def kural_analizi(self, min_confidence=0.3):
         """
         Association Rules (Birliktelik Kuralları) oluşturur
@@ -180,45 +414,16 @@ class BasitMarketAnalizi:
             print("❌ Önce birliktelik analizi yapmalısınız!")
             return
         
-        kurallar = []
-        toplam_sepet = len(self.sepetler)
-        
-        for (urun1, urun2), bilgi in self.birliktelikler.items():
-            birlikte_sayi = bilgi['sepet_sayisi']
-            
-            # Kural 1: urun1 → urun2
-            urun1_sayi = self.urun_sayilari[urun1]
-            confidence1 = birlikte_sayi / urun1_sayi
-            
-            if confidence1 >= min_confidence:
-                lift1 = confidence1 / (self.urun_sayilari[urun2] / toplam_sepet)
-                kurallar.append({
-                    'antecedent': urun1,      # Öncül
-                    'consequent': urun2,      # Sonuç
-                    'support': bilgi['support'],
-                    'confidence': confidence1,
-                    'lift': lift1
-                })
-            
-            # Kural 2: urun2 → urun1
-            urun2_sayi = self.urun_sayilari[urun2]
-            confidence2 = birlikte_sayi / urun2_sayi
-            
-            if confidence2 >= min_confidence:
-                lift2 = confidence2 / (self.urun_sayilari[urun1] / toplam_sepet)
-                kurallar.append({
-                    'antecedent': urun2,
-                    'consequent': urun1,
-                    'support': bilgi['support'],
-                    'confidence': confidence2,
-                    'lift': lift2
-                })
+        # Kurallar ürün ID'leri üzerinden oluşturulur (güvene göre sıralı)
+        if self.urun_sayilari is None:
+            self._urun_popularitesini_hesapla()
+        kurallar = kural_olustur(self.birliktelikler, self.urun_sayilari,
+                                 self.toplam_sepet, min_confidence)
         
         print(f"✅ {len(kurallar)} kural bulundu")
         
         if kurallar:
-            # Kuralları güvene göre sırala
-            kurallar.sort(key=lambda x: x['confidence'], reverse=True)
+            sozluk = self.sozluk
             
             print(f"\nEn güçlü 10 kural:")
             print("-" * 80)
@@ -226,11 +431,153 @@ class BasitMarketAnalizi:
             print("-" * 80)
             
             for i, kural in enumerate(kurallar[:10], 1):
-                print(f"{i:<3} {kural['antecedent']:<15} → {kural['consequent']:<15} "
+                print(f"{i:<3} {sozluk.isim(kural['antecedent']):<15} → "
+                      f"{sozluk.isim(kural['consequent']):<15} "
                       f"{kural['confidence']:<8.1%} {kural['lift']:<8.2f}")
         
         return kurallar
     
+    def sik_kume_analizi(self, min_support=0.05, max_uzunluk=None, algoritma='Apriori',
+                         mod='Tümü', top_n=5, paralel=False):
+        """
+        Her uzunluktaki sık öğe kümelerini (3'lü, 4'lü paketler...) bulur
+        max_uzunluk: En büyük küme boyutu (varsayılan sınırsız)
+        algoritma: 'Apriori', 'FP-Growth' (düşük destekler için) veya 'Eclat' (dikey)
+        mod: 'Tümü', 'Kapalı' (kayıpsız özet) veya 'Maksimal' (en kompakt özet)
+        paralel: Sepetler bölünüp tüm çekirdeklerde madenlenir (SON, 'Tümü' modunda)
+        """
+        baslik = algoritma if mod == 'Tümü' else f"{mod} kümeler"
+        print(f"\n🧺 SIK KÜME ANALİZİ - {baslik} (Min Support: %{min_support*100:.1f})")
+        print("=" * 50)
+        
+        # Akış modunda ve artımlı eklemelerden sonra sepetlerin tamamı bellekte değildir
+        if self.sepet_verisi is None or self.sepet_verisi.sepet_sayisi != self.toplam_sepet:
+            print("❌ Sık küme analizi için sepetlerin tamamının yüklenmiş olması gerekir (veri_yukle)!")
+            return
+        
+        # Kapalı/maksimal modlar kendi aramalarını yapar (tüm kümeler üretilmez)
+        if KUME_MODLARI[mod] is None and paralel:
+            self.sik_kumeler = onbellekli(self.sepet_verisi.parmak_izi(), son_madencilik,
+                                          self.sepet_verisi, min_support=min_support,
+                                          max_uzunluk=max_uzunluk, algoritma=algoritma)
+        elif KUME_MODLARI[mod] is None:
+            self.sik_kumeler = onbellekli(self.sepet_verisi.parmak_izi(), MADENCILER[algoritma],
+                                          self.sepet_verisi, min_support=min_support,
+                                          max_uzunluk=max_uzunluk)
+        else:
+            self.sik_kumeler = onbellekli(self.sepet_verisi.parmak_izi(), KUME_MODLARI[mod],
+                                          self.sepet_verisi, min_support=min_support)
+        
+        # Uzunluklara göre grupla
+        seviyeler = {}
+        for kume, bilgi in self.sik_kumeler.items():
+            seviyeler.setdefault(len(kume), []).append((kume, bilgi))
+        
+        for uzunluk in sorted(seviyeler):
+            kumeler = sorted(seviyeler[uzunluk], key=lambda x: x[1]['support'], reverse=True)
+            print(f"\n{uzunluk} ürünlü kümeler: {len(kumeler)} adet")
+            if uzunluk < 3:
+                continue
+            for kume, bilgi in kumeler[:top_n]:
+                print(f"   {' + '.join(self.sozluk.isimlere_cevir(kume))}: "
+                      f"{bilgi['sepet_sayisi']} sepet (%{bilgi['support']*100:.1f})")
+        
+        return self.sik_kumeler
+    
+    def onizleme_analizi(self, min_support=0.05, max_uzunluk=None, algoritma='Apriori',
+                         ornek_boyutu=ORNEK_BOYUTU, dogrula=False, top_n=5):
+        """
+        Sık kümeleri rastgele bir sepet örnekleminde hızlıca tahmin eder
+        Destekler %95 güven aralığıyla gösterilir; dogrula=True ise sonuç tam
+        veride tek geçişle kesinleştirilir
+        """
+        print(f"\n⚡ ÖN İZLEME (Min Support: %{min_support*100:.1f}, örneklem: {ornek_boyutu} sepet)")
+        print("=" * 50)
+        
+        if self.sepet_verisi is None or self.sepet_verisi.sepet_sayisi != self.toplam_sepet:
+            print("❌ Ön izleme için sepetlerin tamamının yüklenmiş olması gerekir (veri_yukle)!")
+            return
+        
+        kumeler, ozet = onbellekli(self.sepet_verisi.parmak_izi(), ornek_madencilik,
+                                   self.sepet_verisi, min_support=min_support,
+                                   max_uzunluk=max_uzunluk, algoritma=algoritma,
+                                   ornek_boyutu=ornek_boyutu, dogrula=dogrula)
+        if ozet['dogrulandi'] is None:
+            print(f"Örneklem eşiği: %{ozet['dusuk_esik']*100:.2f} (destekler tahmindir)")
+        elif ozet['dogrulandi']:
+            print("✅ Tam veride doğrulandı, destekler kesin")
+        else:
+            print(f"⚠️ Örneklem {ozet['sinir_ihlali']} sık kümeyi kaçırdı, tam veride yeniden hesaplandı")
+        
+        siralama = sorted(kumeler.items(), key=lambda x: x[1]['support'], reverse=True)
+        print(f"{len(kumeler)} sık küme")
+        for kume, bilgi in [oge for oge in siralama if len(oge[0]) > 1][:top_n]:
+            alt, ust = bilgi['guven_araligi']
+            print(f"   {' + '.join(self.sozluk.isimlere_cevir(kume))}: "
+                  f"%{bilgi['support']*100:.1f} (%{alt*100:.1f} - %{ust*100:.1f})")
+        
+        return kumeler
+    
+    def coklu_kural_analizi(self, min_support=0.02, min_confidence=0.3, max_uzunluk=None,
+                            algoritma='Apriori', top_n=10):
+        """
+        Birden fazla öncüllü kuralları ({Milk, Bread} → Butter gibi) gösterir
+        Kurallar tüm uzunluklardaki sık kümelerden üretilir
+        """
+        print(f"\n📋 ÇOK ÖNCÜLLÜ KURAL ANALİZİ (Min Support: %{min_support*100:.1f}, "
+              f"Min Confidence: %{min_confidence*100:.0f})")
+        print("=" * 50)
+        
+        if self.sepet_verisi is None or self.sepet_verisi.sepet_sayisi != self.toplam_sepet:
+            print("❌ Çok öncüllü kurallar için sepetlerin tamamının yüklenmiş olması gerekir (veri_yukle)!")
+            return
+        
+        kurallar = onbellekli(self.sepet_verisi.parmak_izi(), kume_kurallari, self.sepet_verisi,
+                              min_support=min_support, min_confidence=min_confidence,
+                              max_uzunluk=max_uzunluk, algoritma=algoritma)
+        coklu = [kural for kural in kurallar if len(kural['antecedent']) > 1]
+        print(f"✅ {len(kurallar)} kural bulundu ({len(coklu)} tanesi çok öncüllü)")
+        
+        for kural in coklu[:top_n]:
+            print(f"   {{{', '.join(self.sozluk.isimlere_cevir(kural['antecedent']))}}} → "
+                  f"{', '.join(self.sozluk.isimlere_cevir(kural['consequent']))}: "
+                  f"güven {kural['confidence']:.1%}, lift {kural['lift']:.2f}")
+        
+        return kurallar
+    
+    def en_iyi_k_analizi(self, k=10, min_uzunluk=2, olcut='confidence', min_sepet_sayisi=5):
+        """
+        Support tahmin etmeden en sık k öğe kümesini ve en iyi k kuralı gösterir
+        min_uzunluk: Listelenecek en küçük küme boyutu
+        olcut: Kuralların sıralanacağı ölçüt ('confidence' veya 'lift')
+        min_sepet_sayisi: Kural için çiftin en az birlikte görüldüğü sepet sayısı
+        """
+        print(f"\n🏆 EN İYİ {k} ANALİZİ (Support eşiği gerekmez)")
+        print("=" * 50)
+        
+        if self.sepet_verisi is None or self.sepet_verisi.sepet_sayisi != self.toplam_sepet:
+            print("❌ En iyi k analizi için sepetlerin tamamının yüklenmiş olması gerekir (veri_yukle)!")
+            return
+        
+        parmak_izi = self.sepet_verisi.parmak_izi()
+        kumeler = onbellekli(parmak_izi, en_sik_k_kume, self.sepet_verisi,
+                             k=k, min_uzunluk=min_uzunluk)
+        print(f"\nEn sık {k} küme ({min_uzunluk}+ ürünlü):")
+        for kume, bilgi in kumeler.items():
+            print(f"   {' + '.join(self.sozluk.isimlere_cevir(kume))}: "
+                  f"{bilgi['sepet_sayisi']} sepet (%{bilgi['support']*100:.1f})")
+        
+        kurallar = onbellekli(parmak_izi, en_iyi_k_kural, self.sepet_verisi, k=k, olcut=olcut,
+                              min_sepet_sayisi=min_sepet_sayisi)
+        print(f"\n{olcut.capitalize()} değeri en yüksek {k} kural "
+              f"(en az {min_sepet_sayisi} sepette birlikte):")
+        for kural in kurallar:
+            print(f"   {self.sozluk.isim(kural['antecedent'])} → "
+                  f"{self.sozluk.isim(kural['consequent'])}: "
+                  f"güven {kural['confidence']:.1%}, lift {kural['lift']:.2f}")
+        
+        return kumeler, kurallar
+    
     def onerileri_goster(self, secilen_urun, kurallar=None, top_n=5):
         """
         Belirli bir ürün için öneriler gösterir
@@ -242,26 +589,27 @@ class BasitMarketAnalizi:
             print("❌ Önce kural analizi yapmalısınız!")
             return
         
-        # Bu ürün için geçerli kuralları bul
-        uygun_kurallar = [kural for kural in kurallar 
-                         if kural['antecedent'] == secilen_urun]
+        sozluk = self.sozluk
+        
+        # Bu ürün için geçerli kuralları bul (güvene göre sıralı)
+        uygun_kurallar = []
+        if secilen_urun in sozluk:
+            uygun_kurallar = urun_icin_oneriler(kurallar, sozluk.id_al(secilen_urun))
         
         if not uygun_kurallar:
             print(f"❌ '{secilen_urun}' için öneri bulunamadı.")
             return
         
-        # Güvene göre sırala
-        uygun_kurallar.sort(key=lambda x: x['confidence'], reverse=True)
-        
         print(f"✅ {len(uygun_kurallar)} öneri bulundu:")
         print()
         
         for i, kural in enumerate(uygun_kurallar[:top_n], 1):
-            print(f"{i}. {kural['consequent']}")
+            sonuc = sozluk.isim(kural['consequent'])
+            print(f"{i}. {sonuc}")
             print(f"   Güven: %{kural['confidence']*100:.1f}")
             print(f"   Lift: {kural['lift']:.2f}")
             print(f"   Açıklama: '{secilen_urun}' alan müşterilerin "
-                  f"%{kural['confidence']*100:.0f}'i '{kural['consequent']}' da alıyor")
+                  f"%{kural['confidence']*100:.0f}'i '{sonuc}' da alıyor")
             print()
     
     def ozet_rapor(self):
@@ -271,24 +619,29 @@ class BasitMarketAnalizi:
         print("\n📝 ÖZET RAPOR")
         print("=" * 40)
         
-        if not self.veri is None:
-            print(f"🔸 Toplam sepet sayısı: {len(self.sepetler)}")
-            print(f"🔸 Toplam ürün çeşidi: {len(self.urun_sayilari)}")
+        if self.toplam_sepet:
+            print(f"🔸 Toplam sepet sayısı: {self.toplam_sepet:.0f}")
+            print(f"🔸 Toplam ürün çeşidi: {np.count_nonzero(self.urun_sayilari)}")
             
             if self.birliktelikler:
                 print(f"🔸 Bulunan birliktelik sayısı: {len(self.birliktelikler)}")
                 
                 # En popüler ürün
-                en_populer = max(self.urun_sayilari.items(), key=lambda x: x[1])
+                en_populer = self._populer_urunler()[0]
                 print(f"🔸 En popüler ürün: {en_populer[0]} ({en_populer[1]} sepet)")
                 
                 # En güçlü birliktelik
                 en_guclu = max(self.birliktelikler.items(), key=lambda x: x[1]['support'])
-                urun1, urun2 = en_guclu[0]
+                urun1, urun2 = self.sozluk.isimlere_cevir(en_guclu[0])
                 support = en_guclu[1]['support']
                 print(f"🔸 En güçlü birliktelik: {urun1} + {urun2} (%{support*100:.1f})")
 
 
+def _buyut(dizi, yeni_uzunluk):
+    """Sayım dizisini sonuna sıfır ekleyerek büyütür"""
+    return np.concatenate([dizi, np.zeros(yeni_uzunluk - len(dizi), dtype=dizi.dtype)])
+
+
 def main():
     """
     Ana program - adım adım Market Basket Analysis
@@ -8,10 +8,18 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from itertools import combinations
 import plotly.express as px
 import plotly.graph_objects as go
 
+from bitset_deposu import sepet_verisi_yukle
+from sonuc_onbellegi import onbellekli, ortak_onbellek
+from oge_madenciligi import en_sik_k_kume
+from birliktelik_motoru import (
+    urun_frekanslari, birliktelik_hesapla, kural_olustur, urun_icin_oneriler,
+    en_iyi_k_kural, KURAL_OLCUTLERI,
+    urun_sayilarini_isimlendir, birliktelikleri_isimlendir, kurallari_isimlendir
+)
+
 
 # Sayfa ayarları
 st.set_page_config(
@@ -36,97 +44,28 @@ sayfa = st.sidebar.selectbox(
 def veri_yukle():
     """Veriyi yükler ve işler"""
     try:
-        veri = pd.read_csv('data/basket_analysis.csv', index_col=0)
+        # Ham veri tablosu burada kurulmaz; sadece görüntüleme sayfasında açılır
+        sepet_verisi = sepet_verisi_yukle('data/basket_analysis.csv')
         
-        # Sepetleri oluştur
-        sepetler = []
-        for i, satir in veri.iterrows():
-            sepet = []
-            for urun in veri.columns:
-                if satir[urun] == True or satir[urun] == 'True':
-                    sepet.append(urun)
-            if sepet:
-                sepetler.append(sepet)
+        # Sonuç önbelleği anahtarı bir kez hesaplanıp önbelleğe alınan kopyada saklanır
+        sepet_verisi.parmak_izi()
         
-        return veri, sepetler
+        return sepet_verisi
     except FileNotFoundError:
         st.error("❌ data/basket_analysis.csv dosyası bulunamadı!")
-        return None, None
-
-def urun_sayilarini_hesapla(sepetler):
-    """Her ürünün kaç sepette olduğunu hesaplar"""
-    urun_sayilari = {}
-    for sepet in sepetler:
-        for urun in sepet:
-            urun_sayilari[urun] = urun_sayilari.get(urun, 0) + 1
-    return urun_sayilari
-
-def birliktelik_hesapla(sepetler, min_support=0.05):
-    """Ürün birlikteliklerini hesaplar"""
-    toplam_sepet = len(sepetler)
-    min_sepet_sayisi = int(min_support * toplam_sepet)
-    
-    birliktelik_sayilari = {}
-    
-    for sepet in sepetler:
-        if len(sepet) >= 2:
-            for urun1, urun2 in combinations(sepet, 2):
-                if urun1 > urun2:
-                    urun1, urun2 = urun2, urun1
-                
-                cift = (urun1, urun2)
-                birliktelik_sayilari[cift] = birliktelik_sayilari.get(cift, 0) + 1
-    
-    # Minimum desteği geçenleri filtrele
-    onemli_birliktelikler = {}
-    for cift, sayi in birliktelik_sayilari.items():
-        if sayi >= min_sepet_sayisi:
-            support = sayi / toplam_sepet
-            onemli_birliktelikler[cift] = {
-                'sepet_sayisi': sayi,
-                'support': support
-            }
-    
-    return onemli_birliktelikler
-
-def kural_olustur(birliktelikler, urun_sayilari, toplam_sepet, min_confidence=0.3):
-    """Association rules oluşturur"""
-    kurallar = []
-    
-    for (urun1, urun2), bilgi in birliktelikler.items():
-        birlikte_sayi = bilgi['sepet_sayisi']
-        
-        # Kural 1: urun1 → urun2
-        confidence1 = birlikte_sayi / urun_sayilari[urun1]
-        if confidence1 >= min_confidence:
-            lift1 = confidence1 / (urun_sayilari[urun2] / toplam_sepet)
-            kurallar.append({
-                'antecedent': urun1,
-                'consequent': urun2,
-                'support': bilgi['support'],
-                'confidence': confidence1,
-                'lift': lift1
-            })
-        
-        # Kural 2: urun2 → urun1
-        confidence2 = birlikte_sayi / urun_sayilari[urun2]
-        if confidence2 >= min_confidence:
-            lift2 = confidence2 / (urun_sayilari[urun1] / toplam_sepet)
-            kurallar.append({
-                'antecedent': urun2,
-                'consequent': urun1,
-                'support': bilgi['support'],
-                'confidence': confidence2,
-                'lift': lift2
-            })
-    
-    return sorted(kurallar, key=lambda x: x['confidence'], reverse=True)
+        return None
 
 # Veriyi yükle
-veri, sepetler = veri_yukle()
+sepet_verisi = veri_yukle()
 
-if veri is not None and sepetler is not None:
-    urun_sayilari = urun_sayilarini_hesapla(sepetler)
+if sepet_verisi is not None:
+    # Hesaplar ürün ID'leriyle yapılır, isimler sadece gösterim için
+    sozluk = sepet_verisi.sozluk
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    sepet_boyutlari = sepet_verisi.sepet_boyutlari()
+    urun_id_sayilari = urun_frekanslari(sepet_verisi)
+    urun_sayilari = urun_sayilarini_isimlendir(urun_id_sayilari, sozluk)
+    veri_parmak_izi = sepet_verisi.parmak_izi()
     
     # Sayfa içeriği
     if sayfa == "🏠 Ana Sayfa":
@@ -135,13 +74,13 @@ if veri is not None and sepetler is not None:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Toplam Sepet Sayısı", len(sepetler))
+            st.metric("Toplam Sepet Sayısı", toplam_sepet)
         
         with col2:
             st.metric("Toplam Ürün Çeşidi", len(urun_sayilari))
         
         with col3:
-            ortalama_urun = np.mean([len(sepet) for sepet in sepetler])
+            ortalama_urun = sepet_boyutlari.mean()
             st.metric("Ortalama Ürün/Sepet", f"{ortalama_urun:.1f}")
         
         st.markdown("---")
@@ -170,6 +109,7 @@ if veri is not None and sepetler is not None:
         
         st.subheader("Ham Veri")
         st.write("İlk 10 sepet:")
+        veri = sepet_verisi.veri
         st.dataframe(veri.head(10))
         
         st.subheader("Veri Özeti")
@@ -182,15 +122,17 @@ if veri is not None and sepetler is not None:
             
         with col2:
             st.write("**Sepet İstatistikleri:**")
-            sepet_boyutlari = [len(sepet) for sepet in sepetler]
-            st.write(f"- Ortalama ürün/sepet: {np.mean(sepet_boyutlari):.1f}")
-            st.write(f"- En fazla ürün: {max(sepet_boyutlari)}")
-            st.write(f"- En az ürün: {min(sepet_boyutlari)}")
+            st.write(f"- Ortalama ürün/sepet: {sepet_boyutlari.mean():.1f}")
+            st.write(f"- En fazla ürün: {sepet_boyutlari.max()}")
+            st.write(f"- En az ürün: {sepet_boyutlari.min()}")
         
         st.subheader("Örnek Sepetler")
         st.write("İlk 5 sepet ve içerdikleri ürünler:")
-        for i, sepet in enumerate(sepetler[:5], 1):
-            st.write(f"**Sepet {i}:** {', '.join(sepet)}")
+        # Sadece gösterilen sepetler ürün isimlerine çevrilir
+        indptr, indices = sepet_verisi.indptr, sepet_verisi.indices
+        for i in range(min(5, toplam_sepet)):
+            sepet = sozluk.isimlere_cevir(indices[indptr[i]:indptr[i + 1]])
+            st.write(f"**Sepet {i + 1}:** {', '.join(sepet)}")
     
     elif sayfa == "🔍 Popüler Ürünler":
         st.header("🔍 Popüler Ürünler")
@@ -203,7 +145,7 @@ if veri is not None and sepetler is not None:
         with col1:
             st.subheader("En Popüler 10 Ürün")
             for i, (urun, sayi) in enumerate(sorted_urunler[:10], 1):
-                yuzde = (sayi / len(sepetler)) * 100
+                yuzde = (sayi / toplam_sepet) * 100
                 st.write(f"{i}. **{urun}**: {sayi} sepet (%{yuzde:.1f})")
         
         with col2:
@@ -233,21 +175,35 @@ if veri is not None and sepetler is not None:
         st.header("🔗 Birliktelik Analizi")
         
         st.subheader("Parametreler")
-        min_support = st.slider(
-            "Minimum Support (Destek) Oranı:", 
-            0.01, 0.20, 0.05, 0.01,
-            help="Bir ürün çiftinin analiz edilmesi için minimum sepet yüzdesi"
+        esik_yontemi = st.radio(
+            "Eşik Yöntemi:", ["Minimum Support", "En Sık k Çift"], horizontal=True,
+            help="En Sık k Çift: support tahmin etmeden en çok birlikte alınan k çift"
         )
+        if esik_yontemi == "Minimum Support":
+            min_support = st.slider(
+                "Minimum Support (Destek) Oranı:", 
+                0.01, 0.20, 0.05, 0.01,
+                help="Bir ürün çiftinin analiz edilmesi için minimum sepet yüzdesi"
+            )
+            birliktelik_parametreleri = {'min_support': min_support}
+        else:
+            k_cift = st.slider("Çift Sayısı (k):", 5, 100, 20, 5)
+            birliktelik_parametreleri = {'k': k_cift}
         
         if st.button("🔍 Birliktelik Analizi Yap"):
-            birliktelikler = birliktelik_hesapla(sepetler, min_support)
+            if esik_yontemi == "Minimum Support":
+                birliktelikler = onbellekli(veri_parmak_izi, birliktelik_hesapla,
+                                            sepet_verisi, min_support=min_support)
+            else:
+                birliktelikler = onbellekli(veri_parmak_izi, en_sik_k_kume, sepet_verisi,
+                                            k=k_cift, min_uzunluk=2, max_uzunluk=2)
             
             if birliktelikler:
                 st.success(f"✅ {len(birliktelikler)} birliktelik bulundu!")
                 
                 # Birliktelikleri DataFrame'e çevir
                 birliktelik_listesi = []
-                for (urun1, urun2), bilgi in birliktelikler.items():
+                for (urun1, urun2), bilgi in birliktelikleri_isimlendir(birliktelikler, sozluk).items():
                     birliktelik_listesi.append({
                         'Ürün 1': urun1,
                         'Ürün 2': urun2,
@@ -281,6 +237,7 @@ if veri is not None and sepetler is not None:
                 
                 # Session state'e kaydet
                 st.session_state['birliktelikler'] = birliktelikler
+                st.session_state['birliktelik_parametreleri'] = birliktelik_parametreleri
                 
             else:
                 st.warning("❌ Hiç birliktelik bulunamadı. Support oranını düşürmeyi deneyin.")
@@ -293,22 +250,45 @@ if veri is not None and sepetler is not None:
             st.warning("⚠️ Önce 'Birliktelik Analizi' sayfasında analiz yapmalısınız!")
         else:
             st.subheader("Parametreler")
-            min_confidence = st.slider(
-                "Minimum Confidence (Güven) Oranı:", 
-                0.1, 0.9, 0.3, 0.05,
-                help="Bir kuralın geçerli sayılması için minimum güven yüzdesi"
+            kural_secimi = st.radio(
+                "Kural Seçimi:", ["Minimum Confidence", "En İyi k Kural"], horizontal=True,
+                help="En İyi k Kural: tüm çiftler içinden güveni veya lift'i en yüksek k kural"
             )
+            if kural_secimi == "Minimum Confidence":
+                min_confidence = st.slider(
+                    "Minimum Confidence (Güven) Oranı:", 
+                    0.1, 0.9, 0.3, 0.05,
+                    help="Bir kuralın geçerli sayılması için minimum güven yüzdesi"
+                )
+            else:
+                k_kural = st.slider("Kural Sayısı (k):", 5, 100, 20, 5)
+                kural_olcutu = st.selectbox("Sıralama Ölçütü:", KURAL_OLCUTLERI)
+                min_birlikte = st.number_input(
+                    "En Az Birlikte Alım (sepet):", min_value=1, value=5, step=1,
+                    help="Birkaç sepette görülen nadir çiftlerin tesadüfi kurallarını eler"
+                )
             
             if st.button("📋 Kural Analizi Yap"):
-                birliktelikler = st.session_state['birliktelikler']
-                kurallar = kural_olustur(birliktelikler, urun_sayilari, len(sepetler), min_confidence)
+                if kural_secimi == "Minimum Confidence":
+                    birliktelikler = st.session_state['birliktelikler']
+                    # Kurallar (veri, birliktelik eşiği, min confidence) için disk önbelleğinden gelir
+                    kurallar = ortak_onbellek.hesapla(
+                        veri_parmak_izi, 'kural_olustur',
+                        dict(st.session_state.get('birliktelik_parametreleri', {}),
+                             min_confidence=min_confidence),
+                        lambda: kural_olustur(birliktelikler, urun_id_sayilari, toplam_sepet, min_confidence)
+                    )
+                else:
+                    kurallar = onbellekli(veri_parmak_izi, en_iyi_k_kural, sepet_verisi,
+                                          k=k_kural, olcut=kural_olcutu,
+                                          min_sepet_sayisi=int(min_birlikte))
                 
                 if kurallar:
                     st.success(f"✅ {len(kurallar)} kural bulundu!")
                     
                     # Kuralları DataFrame'e çevir
                     kural_listesi = []
-                    for kural in kurallar:
+                    for kural in kurallari_isimlendir(kurallar, sozluk):
                         kural_listesi.append({
                             'Öncül': kural['antecedent'],
                             'Sonuç': kural['consequent'],
@@ -326,7 +306,7 @@ if veri is not None and sepetler is not None:
                     st.subheader("📖 Kural Açıklaması")
                     st.write("**En güçlü 3 kural:**")
                     
-                    for i, kural in enumerate(kurallar[:3], 1):
+                    for i, kural in enumerate(kurallari_isimlendir(kurallar[:3], sozluk), 1):
                         st.write(f"""
                         **{i}. {kural['antecedent']} → {kural['consequent']}**
                         - '{kural['antecedent']}' alan müşterilerin %{kural['confidence']*100:.0f}'i '{kural['consequent']}' da alıyor
@@ -358,8 +338,9 @@ if veri is not None and sepetler is not None:
             
             if st.button("🎯 Önerileri Göster"):
                 # Bu ürün için uygun kuralları bul
-                uygun_kurallar = [kural for kural in kurallar 
-                                 if kural['antecedent'] == secilen_urun]
+                uygun_kurallar = kurallari_isimlendir(
+                    urun_icin_oneriler(kurallar, sozluk.id_al(secilen_urun)), sozluk
+                )
                 
                 if uygun_kurallar:
                     st.success(f"✅ '{secilen_urun}' için {len(uygun_kurallar)} öneri bulundu!")
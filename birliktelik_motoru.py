@@ -0,0 +1,317 @@
+"""
+BİRLİKTELİK MOTORU
+Sayım, kural ve öneri hesaplarının ürün ID'leri üzerinde çalışan ortak hali.
+Sonuçlar ID anahtarlıdır; ürün isimlerine sadece gösterimde dönülür.
+"""
+
+from collections import Counter
+
+import numpy as np
+from scipy import sparse, stats
+
+
+YOGUN_URUN_SINIRI = 2048     # Bu kadar ürüne kadar yoğun matris çarpımı kullanılır
+_BLOK_SEPET = 1 << 16        # Yoğun çarpımda bir seferde işlenen sepet sayısı
+
+
+def urun_frekanslari(sepet_verisi):
+    """
+    Her ürün ID'sinin kaç sepette olduğunu dizi olarak döndürür
+    """
+    return np.bincount(sepet_verisi.indices, minlength=len(sepet_verisi.sozluk))
+
+
+def eslesme_matrisi(sepet_verisi):
+    """
+    Ürün x ürün birlikte görülme matrisi: C = Xᵀ·X (X: sepet x ürün 0/1 matrisi)
+    C[i, j] i ve j'yi birlikte içeren sepet sayısıdır, köşegen ürün frekanslarıdır.
+    Küçük kataloglarda yoğun (BLAS), büyüklerde scipy.sparse çarpımı kullanılır.
+    """
+    urun_sayisi = len(sepet_verisi.sozluk)
+    if sepet_verisi.matris is not None and urun_sayisi <= YOGUN_URUN_SINIRI:
+        return _yogun_eslesme(sepet_verisi.matris, urun_sayisi)
+
+    X = sparse.csr_matrix(
+        (np.ones(len(sepet_verisi.indices), dtype=np.int32),
+         sepet_verisi.indices, sepet_verisi.indptr),
+        shape=(sepet_verisi.sepet_sayisi, urun_sayisi)
+    )
+    eslesme = (X.T @ X).astype(np.int64)
+    # Matrissiz (uzun format, artımlı) ama küçük kataloglarda yoğun dizi döndürülür
+    return eslesme.toarray() if urun_sayisi <= YOGUN_URUN_SINIRI else eslesme.tocsr()
+
+
+def _yogun_eslesme(matris, urun_sayisi):
+    # float32 çarpım her blokta tam sayı sonucu verir (blok < 2^24 sepet)
+    sonuc = np.zeros((urun_sayisi, urun_sayisi), dtype=np.int64)
+    for bas in range(0, matris.shape[0], _BLOK_SEPET):
+        blok = matris[bas:bas + _BLOK_SEPET].astype(np.float32)
+        sonuc += np.rint(blok.T @ blok).astype(np.int64)
+    return sonuc
+
+
+def ust_ucgen_ciftleri(eslesme, min_sayi=1):
+    """Matrisin üst üçgeninden sayısı min_sayi'yi geçen (id1, id2, sayı) dizileri"""
+    if sparse.issparse(eslesme):
+        ust = sparse.triu(eslesme, k=1).tocoo()
+        secim = ust.data >= min_sayi
+        return ust.row[secim], ust.col[secim], ust.data[secim]
+
+    satirlar, sutunlar = np.nonzero(np.triu(eslesme >= min_sayi, k=1))
+    return satirlar, sutunlar, eslesme[satirlar, sutunlar]
+
+
+def eslesme_blogu(eslesme, urun_idleri):
+    """
+    Eşleşme matrisinden verilen ürünlerin yoğun alt matrisi (ısı haritaları için)
+    Satır/sütun sırası urun_idleri sırasıdır; sonuç len(urun_idleri)² boyutunda
+    yoğun dizi olduğundan büyük kataloglarda seçim sınırlı tutulmalıdır
+    """
+    urun_idleri = np.asarray(urun_idleri, dtype=np.int64)
+    if sparse.issparse(eslesme):
+        return eslesme[urun_idleri][:, urun_idleri].toarray()
+    return eslesme[np.ix_(urun_idleri, urun_idleri)]
+
+
+def lift_matrisi(eslesme, toplam_sepet):
+    """
+    Eşleşme matrisinden (veya bir bloğundan) tüm çiftlerin lift'i:
+    lift[i, j] = C[i, j] · N / (C[i, i] · C[j, j])
+    Hiç birlikte görülmeyen çiftlerin lift'i 0, köşegen nötr (1) alınır.
+    """
+    frekanslar = np.diag(eslesme).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lift = eslesme * toplam_sepet / np.outer(frekanslar, frekanslar)
+    lift = np.nan_to_num(lift, nan=0.0, posinf=0.0)
+    np.fill_diagonal(lift, 1.0)
+    return lift
+
+
+def cift_frekanslari(sepet_verisi):
+    """
+    Her (id1, id2) çiftinin kaç sepette birlikte görüldüğünü sayar (id1 < id2)
+    Sayım Xᵀ·X ile yapılır; sonuç güncellenebilir bir Counter olarak döner
+    """
+    satirlar, sutunlar, sayilar = ust_ucgen_ciftleri(eslesme_matrisi(sepet_verisi))
+    return Counter(dict(zip(zip(satirlar.tolist(), sutunlar.tolist()), sayilar.tolist())))
+
+
+def destek_filtrele(sayilar, toplam_sepet, min_support):
+    """
+    Minimum desteği geçen öğe kümelerini {'sepet_sayisi', 'support'} formatına çevirir
+    """
+    min_sepet_sayisi = int(min_support * toplam_sepet)
+
+    onemli = {}
+    for oge_kumesi, sayi in sayilar.items():
+        if sayi >= min_sepet_sayisi:
+            onemli[oge_kumesi] = {
+                'sepet_sayisi': sayi,
+                'support': sayi / toplam_sepet
+            }
+    return onemli
+
+
+def matris_destek_filtrele(eslesme, toplam_sepet, min_support):
+    """
+    Eşleşme matrisinden destek_filtrele ile aynı {'sepet_sayisi', 'support'}
+    sonucunu üretir; eşik karşılaştırması vektörel yapılır
+    """
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+    satirlar, sutunlar, sayilar = ust_ucgen_ciftleri(eslesme, min_sepet_sayisi)
+
+    return {(urun1, urun2): {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+            for urun1, urun2, sayi in zip(satirlar.tolist(), sutunlar.tolist(),
+                                          sayilar.tolist())}
+
+
+def birliktelik_hesapla(sepet_verisi, min_support=0.05):
+    """
+    İki ürün birlikteliklerini ID çiftleri üzerinden hesaplar (Xᵀ·X ile)
+    """
+    return matris_destek_filtrele(eslesme_matrisi(sepet_verisi),
+                                  sepet_verisi.sepet_sayisi, min_support)
+
+
+def kural_olustur(birliktelikler, urun_sayilari, toplam_sepet, min_confidence=0.3):
+    """
+    ID çiftlerinden A→B association rule'ları oluşturur
+    urun_sayilari: urun_frekanslari() dizisi (ID ile indekslenir)
+    """
+    kurallar = []
+
+    for (urun1, urun2), bilgi in birliktelikler.items():
+        birlikte_sayi = bilgi['sepet_sayisi']
+
+        for oncul, sonuc in ((urun1, urun2), (urun2, urun1)):
+            confidence = birlikte_sayi / urun_sayilari[oncul]
+            if confidence >= min_confidence:
+                lift = confidence / (urun_sayilari[sonuc] / toplam_sepet)
+                kurallar.append({
+                    'antecedent': oncul,
+                    'consequent': sonuc,
+                    'support': bilgi['support'],
+                    'confidence': float(confidence),
+                    'lift': float(lift)
+                })
+
+    return sorted(kurallar, key=lambda x: x['confidence'], reverse=True)
+
+
+KURAL_OLCUTLERI = ('confidence', 'lift')
+
+
+def en_iyi_k_kural(sepet_verisi, k=20, olcut='confidence', min_sepet_sayisi=5):
+    """
+    Destek/güven eşiği vermeden confidence veya lift'i en yüksek k kural
+    Tüm çiftlerin iki yönlü kuralları Xᵀ·X matrisinden tek seferde skorlanır
+    ve en iyi k tanesi argpartition ile seçilir; süre eşik değerinden bağımsızdır.
+    min_sepet_sayisi: çiftin en az kaç sepette birlikte görülmesi gerektiği; nadir
+                      ürünlerin birkaç sepetlik tesadüfi %100 güvenli veya çok yüksek
+                      lift'li kuralları ilk k'yı doldurmasın diye (negatif
+                      birlikteliklerdeki alt sınırla aynı)
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    frekanslar = urun_frekanslari(sepet_verisi)
+    satirlar, sutunlar, sayilar = ust_ucgen_ciftleri(eslesme_matrisi(sepet_verisi),
+                                                     max(min_sepet_sayisi, 1))
+
+    # Her çift iki kural verir: A→B ve B→A
+    onculler = np.concatenate([satirlar, sutunlar])
+    sonuclar = np.concatenate([sutunlar, satirlar])
+    sayilar = np.concatenate([sayilar, sayilar])
+    confidence = sayilar / frekanslar[onculler]
+    lift = confidence / (frekanslar[sonuclar] / toplam_sepet)
+
+    skor = confidence if olcut == 'confidence' else lift
+    if len(skor) > k:
+        secim = np.argpartition(-skor, k - 1)[:k]
+    else:
+        secim = np.arange(len(skor))
+    secim = secim[np.lexsort((onculler[secim], -skor[secim]))]
+
+    return [{'antecedent': oncul, 'consequent': sonuc,
+             'support': sayi / toplam_sepet, 'confidence': conf, 'lift': lft}
+            for oncul, sonuc, sayi, conf, lft in zip(
+                onculler[secim].tolist(), sonuclar[secim].tolist(), sayilar[secim].tolist(),
+                confidence[secim].tolist(), lift[secim].tolist())]
+
+
+def negatif_birliktelikler(sepet_verisi, max_lift=0.8, min_sepet_sayisi=5):
+    """
+    Beklenenden belirgin şekilde az birlikte alınan çiftler (lift < max_lift)
+    Tüm çiftlerin beklenen sayısı, lift'i ve anlamlılığı tek bir Xᵀ·X matrisinden
+    vektörel hesaplanır:
+        ki_kare   : 2x2 çapraz tablonun ki-kare istatistiği (1 serbestlik derecesi)
+        p_degeri  : Fisher kesin testi, tek yönlü (beklenenden az birliktelik)
+    Sonuç farka (beklenen - gerçek) göre çoktan aza sıralıdır.
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    frekanslar = urun_frekanslari(sepet_verisi).astype(np.float64)
+    satirlar, sutunlar, sayilar = ust_ucgen_ciftleri(eslesme_matrisi(sepet_verisi),
+                                                     max(min_sepet_sayisi, 1))
+
+    f1, f2 = frekanslar[satirlar], frekanslar[sutunlar]
+    beklenen = f1 * f2 / toplam_sepet
+    lift = sayilar / beklenen
+    secim = lift < max_lift
+    satirlar, sutunlar, sayilar = satirlar[secim], sutunlar[secim], sayilar[secim]
+    f1, f2, beklenen, lift = f1[secim], f2[secim], beklenen[secim], lift[secim]
+
+    # 2x2 tablo için ki-kare: N·(a·N - f1·f2)² / (f1·f2·(N-f1)·(N-f2))
+    payda = f1 * f2 * (toplam_sepet - f1) * (toplam_sepet - f2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ki_kare = np.where(payda > 0,
+                           toplam_sepet * (sayilar * toplam_sepet - f1 * f2) ** 2 / payda, 0.0)
+    # Birlikte alım sayısı hipergeometrik dağılır; P(X <= gerçek sayı)
+    p_degeri = stats.hypergeom.cdf(sayilar, toplam_sepet, f1, f2)
+
+    fark = beklenen - sayilar
+    sira = np.argsort(-fark, kind='stable')
+    return [{'urun1': urun1, 'urun2': urun2, 'gercek_sayi': sayi, 'beklenen_sayi': bek,
+             'lift': lft, 'fark': frk, 'ki_kare': ki, 'p_degeri': p}
+            for urun1, urun2, sayi, bek, lft, frk, ki, p in zip(
+                satirlar[sira].tolist(), sutunlar[sira].tolist(), sayilar[sira].tolist(),
+                beklenen[sira].tolist(), lift[sira].tolist(), fark[sira].tolist(),
+                ki_kare[sira].tolist(), p_degeri[sira].tolist())]
+
+
+def urun_icin_oneriler(kurallar, urun_id):
+    """
+    Öncülü verilen ürün olan kuralları güvene göre sıralı döndürür
+    """
+    uygun_kurallar = [kural for kural in kurallar if kural['antecedent'] == urun_id]
+    return sorted(uygun_kurallar, key=lambda x: x['confidence'], reverse=True)
+
+
+def sepet_icin_oneriler(kurallar, secili_idler, min_confidence=0.0):
+    """
+    Sepetteki birden fazla ürünün kurallarını birleştirip öneri skorlar
+    Skor = Σ(Confidence × Lift)
+    """
+    secili_idler = set(secili_idler)
+    tum_oneriler = {}
+
+    for kural in kurallar:
+        if (kural['antecedent'] not in secili_idler
+                or kural['confidence'] < min_confidence
+                or kural['consequent'] in secili_idler):
+            continue
+
+        urun = kural['consequent']
+        if urun not in tum_oneriler:
+            tum_oneriler[urun] = {
+                'max_confidence': kural['confidence'],
+                'max_lift': kural['lift'],
+                'kaynak_urunler': [kural['antecedent']],
+                'skor': kural['confidence'] * kural['lift']
+            }
+        else:
+            # Birden fazla ürünle ilişkiliyse, en iyi skorları güncelle
+            oneri = tum_oneriler[urun]
+            oneri['max_confidence'] = max(oneri['max_confidence'], kural['confidence'])
+            oneri['max_lift'] = max(oneri['max_lift'], kural['lift'])
+            oneri['kaynak_urunler'].append(kural['antecedent'])
+            oneri['skor'] += kural['confidence'] * kural['lift']
+
+    return tum_oneriler
+
+
+# ============ GÖSTERİM İÇİN İSİM ÇEVİRİLERİ ============
+
+def urun_sayilarini_isimlendir(urun_sayilari, sozluk):
+    """
+    ID dizisini {ürün ismi: sepet sayısı} sözlüğüne çevirir (sadece görülen ürünler)
+    """
+    return {sozluk.isim(urun_id): int(sayi)
+            for urun_id, sayi in enumerate(urun_sayilari) if sayi > 0}
+
+
+def birliktelikleri_isimlendir(birliktelikler, sozluk):
+    """
+    ID anahtarlı öğe kümelerini ürün ismi demetlerine çevirir
+    """
+    return {sozluk.isimlere_cevir(oge_kumesi): bilgi
+            for oge_kumesi, bilgi in birliktelikler.items()}
+
+
+def negatif_birliktelikleri_isimlendir(negatif_ciftler, sozluk):
+    """
+    Negatif birlikteliklerin ürün ID'lerini ürün isimlerine çevirir
+    """
+    return [dict(cift, urun1=sozluk.isim(cift['urun1']), urun2=sozluk.isim(cift['urun2']))
+            for cift in negatif_ciftler]
+
+
+def kurallari_isimlendir(kurallar, sozluk):
+    """
+    Kuralların öncül/sonuç ID'lerini ürün isimlerine çevirir
+    Çok ürünlü öncül/sonuçlar (ID demetleri) isim demetlerine çevrilir
+    """
+    def isimlendir(oge):
+        return sozluk.isimlere_cevir(oge) if isinstance(oge, tuple) else sozluk.isim(oge)
+
+    return [dict(kural,
+                 antecedent=isimlendir(kural['antecedent']),
+                 consequent=isimlendir(kural['consequent']))
+            for kural in kurallar]
@@ -0,0 +1,360 @@
+"""
+BITSET DEPOSU
+Sepet matrisini ürün-ana (item-major) sıkıştırılmış bit dosyası olarak CSV'nin
+yanına yazar ve np.memmap ile açar. Her ürün için bir bit satırı vardır
+(sepet başına 1 bit); bir öğe kümesinin desteği bu satırların bitwise AND'i
+ve popcount ile bulunur.
+
+Dosya yapısı:
+    8 bayt  : BITSET_IMZA
+    4 x u64 : sepet sayısı, ürün sayısı, satır bayt sayısı, başlık JSON uzunluğu
+    JSON    : ürün isimleri, kaynak dosya bilgisi, CSR öğe sayısı, CSV satır indeksi
+    dolgu   : veri 64 bayt sınırından başlar
+    veri    : (ürün sayısı x satır bayt sayısı) uint8, little-endian bit sırası
+    indptr  : (sepet sayısı + 1) int64, CSR satır başlangıçları
+    indices : (öğe sayısı) int32, CSR ürün ID'leri
+    satirlar: (sepet sayısı) int64, her sepetin CSV'deki satır numarası
+Bölümlerin hepsi 64 bayt sınırından başlar ve memmap ile açılır; sıcak
+yüklemede sepetler bit matrisi açılmadan doğrudan CSR dizilerinden kurulur.
+
+Kullanım (derleme adımı):
+    python bitset_deposu.py data/basket_analysis.csv
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from sepet_veri import (
+    SepetVerisi, UrunSozlugu, csr_olustur, onehot_matrise_cevir, onehot_yukle,
+    kaynak_parmak_izi, parmak_izi_uyuyor
+)
+
+
+BITSET_IMZA = b'MBABIT2\n'
+BITSET_UZANTI = '.bits'
+_HIZALAMA = 64
+_BLOK_BAYT = 64 * 1024 * 1024   # Toplu kesişimde bir seferde ayrılan en fazla bellek
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(dizi):
+        """Dizideki 1 bitlerinin toplamı (NumPy >= 2.0)"""
+        return int(np.bitwise_count(dizi).sum())
+
+    def _satir_popcount(dizi):
+        """2 boyutlu dizinin her satırındaki 1 bitlerinin sayısı"""
+        return np.bitwise_count(dizi).sum(axis=1, dtype=np.int64)
+else:
+    _BIT_TABLOSU = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount(dizi):
+        """Dizideki 1 bitlerinin toplamı (bayt tablosu ile)"""
+        return int(_BIT_TABLOSU[dizi.view(np.uint8)].sum(dtype=np.int64))
+
+    def _satir_popcount(dizi):
+        """2 boyutlu dizinin her satırındaki 1 bitlerinin sayısı (bayt tablosu ile)"""
+        return _BIT_TABLOSU[dizi.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def bitset_yolu(csv_yolu):
+    """CSV dosyasının yanındaki bitset dosyasının yolunu döndürür"""
+    return os.path.splitext(csv_yolu)[0] + BITSET_UZANTI
+
+
+def bitleri_paketle(matris):
+    """
+    (sepet x ürün) boolean matrisi ürün-ana bit satırlarına paketler
+    Satırlar 8 baytın katına tamamlanır ki uint64 olarak okunabilsin
+    """
+    bitler = np.packbits(matris.T, axis=1, bitorder='little')
+    satir_bayt = -(-max(bitler.shape[1], 1) // 8) * 8
+    if satir_bayt != bitler.shape[1]:
+        dolgu = np.zeros((bitler.shape[0], satir_bayt - bitler.shape[1]), dtype=np.uint8)
+        bitler = np.hstack([bitler, dolgu])
+    return np.ascontiguousarray(bitler)
+
+
+class BitsetDeposu:
+    """
+    Ürün-ana paketlenmiş bit matrisi üzerinde destek sayımı
+    Dosyadan açıldığında veri memmap olarak kalır ve işletim sisteminin
+    sayfa önbelleği süreçler arasında paylaşılır
+    """
+
+    def __init__(self, bitler, sepet_sayisi, urunler, dosya_yolu=None):
+        self.bitler = bitler              # (ürün x satır_bayt) uint8
+        self.sepet_sayisi = sepet_sayisi
+        self.urunler = list(urunler)
+        self.dosya_yolu = dosya_yolu
+        self.kaynak = None                # Kaynak CSV'nin parmak izi (boyut, mtime, özet)
+        self.indptr = None                # CSR sepetler (dosyada bit matrisinin yanında)
+        self.indices = None
+        self.satirlar = None              # Dolu sepetlerin CSV satır numaraları
+        self.indeks = None                # CSV'nin satır indeksi (işlem ID'leri)
+
+    @classmethod
+    def matristen(cls, matris, urunler):
+        """Bellekteki boolean matristen (dosyasız) depo oluşturur"""
+        return cls(bitleri_paketle(matris), matris.shape[0], urunler)
+
+    @classmethod
+    def csr_den(cls, indptr, indices, urunler):
+        """CSR sepetlerden (yoğun matris kurmadan) depo oluşturur"""
+        sepet_sayisi = len(indptr) - 1
+        satir_bayt = -(-max(sepet_sayisi, 1) // 64) * 8
+        bitler = np.zeros((len(urunler), satir_bayt), dtype=np.uint8)
+
+        sepetler = np.repeat(np.arange(sepet_sayisi, dtype=np.int64), np.diff(indptr))
+        np.bitwise_or.at(bitler, (indices, sepetler >> 3),
+                         np.left_shift(1, sepetler & 7).astype(np.uint8))
+        depo = cls(bitler, sepet_sayisi, urunler)
+        depo.indptr, depo.indices = indptr, indices
+        return depo
+
+    @classmethod
+    def ac(cls, dosya_yolu):
+        """Bitset dosyasını np.memmap ile açar"""
+        with open(dosya_yolu, 'rb') as dosya:
+            if dosya.read(len(BITSET_IMZA)) != BITSET_IMZA:
+                raise ValueError(f"{dosya_yolu} geçerli bir bitset dosyası değil")
+            sepet_sayisi, urun_sayisi, satir_bayt, json_uzunluk = np.frombuffer(
+                dosya.read(32), dtype='<u8'
+            ).tolist()
+            baslik = json.loads(dosya.read(json_uzunluk).decode('utf-8'))
+
+        bolumler = _bolum_baslangiclari(json_uzunluk, sepet_sayisi, urun_sayisi,
+                                        satir_bayt, baslik['oge_sayisi'])
+        bitler = np.memmap(dosya_yolu, dtype=np.uint8, mode='r',
+                           offset=bolumler[0], shape=(urun_sayisi, satir_bayt))
+        depo = cls(bitler, sepet_sayisi, baslik['urunler'], dosya_yolu)
+        depo.kaynak = baslik.get('kaynak')
+        depo.indptr, depo.indices, depo.satirlar = (
+            _bos_olabilir_memmap(dosya_yolu, tur, baslangic, uzunluk)
+            for tur, baslangic, uzunluk in zip(
+                (np.int64, np.int32, np.int64), bolumler[1:],
+                (sepet_sayisi + 1, baslik['oge_sayisi'], sepet_sayisi))
+        )
+        depo.indeks = baslik['indeks']
+        return depo
+
+    def __getstate__(self):
+        # Dosyaya bağlı depo sadece yolunu taşır; açan süreç yeniden memmap'ler
+        if self.dosya_yolu is not None:
+            return {'dosya_yolu': self.dosya_yolu}
+        return self.__dict__
+
+    def __setstate__(self, durum):
+        if set(durum) == {'dosya_yolu'}:
+            durum = BitsetDeposu.ac(durum['dosya_yolu']).__dict__
+        self.__dict__.update(durum)
+
+    def kaydet(self, dosya_yolu, kaynak=None):
+        """Depoyu başlık + bit matrisi + CSR dizileri olarak dosyaya yazar"""
+        self._csr_hazirla()
+        satirlar = (np.arange(self.sepet_sayisi, dtype=np.int64)
+                    if self.satirlar is None else self.satirlar)
+        indeks = self.indeks or _indeks_bilgisi(pd.RangeIndex(self.sepet_sayisi))
+
+        baslik = json.dumps({'urunler': self.urunler, 'kaynak': kaynak,
+                             'oge_sayisi': len(self.indices), 'indeks': indeks},
+                            ensure_ascii=False, default=str).encode('utf-8')
+        sayilar = np.array([self.sepet_sayisi, self.bitler.shape[0],
+                            self.bitler.shape[1], len(baslik)], dtype='<u8')
+        bolumler = _bolum_baslangiclari(len(baslik), self.sepet_sayisi, *self.bitler.shape,
+                                        len(self.indices))
+        diziler = [np.ascontiguousarray(self.bitler),
+                   np.ascontiguousarray(self.indptr, dtype='<i8'),
+                   np.ascontiguousarray(self.indices, dtype='<i4'),
+                   np.ascontiguousarray(satirlar, dtype='<i8')]
+
+        # Yarım kalmış dosya bırakmamak için önce geçici dosyaya yaz
+        gecici_yol = dosya_yolu + '.tmp'
+        with open(gecici_yol, 'wb') as dosya:
+            dosya.write(BITSET_IMZA)
+            dosya.write(sayilar.tobytes())
+            dosya.write(baslik)
+            for baslangic, dizi in zip(bolumler, diziler):
+                dosya.write(b'\0' * (baslangic - dosya.tell()))
+                dosya.write(dizi.tobytes())
+        os.replace(gecici_yol, dosya_yolu)
+
+    def _csr_hazirla(self):
+        # Bellekte kurulan depoda CSR yoksa bit matrisinden çıkarılır
+        if self.indptr is None:
+            self.indptr, self.indices = csr_olustur(self._matris())
+
+    def _matris(self):
+        return np.unpackbits(self.bitler, axis=1, count=self.sepet_sayisi,
+                             bitorder='little').T.astype(bool)
+
+    def urun_bitleri(self, urun_id):
+        """Bir ürünün sepet bit satırını uint64 dizisi olarak döndürür"""
+        return self.bitler[urun_id].view(np.uint64)
+
+    def kesisim(self, urun_idleri):
+        """Verilen ürünlerin hepsini içeren sepetlerin bit dizisi (AND)"""
+        urun_idleri = list(urun_idleri)
+        sonuc = self.urun_bitleri(urun_idleri[0]).copy()
+        for urun_id in urun_idleri[1:]:
+            np.bitwise_and(sonuc, self.urun_bitleri(urun_id), out=sonuc)
+        return sonuc
+
+    def destek_sayisi(self, urun_idleri):
+        """Öğe kümesini içeren sepet sayısı: bitwise AND + popcount"""
+        return _popcount(self.kesisim(urun_idleri))
+
+    def destek_sayilari(self, adaylar):
+        """
+        Aynı boyuttaki birçok öğe kümesinin desteğini toplu (vektörel) hesaplar
+        adaylar: (aday sayısı x k) ürün ID dizisi
+        """
+        adaylar = np.asarray(adaylar, dtype=np.int64)
+        bitler = self.bitler.view(np.uint64)
+        sayilar = np.empty(len(adaylar), dtype=np.int64)
+
+        # Ara kesişim dizisi bellek sınırını aşmasın diye adaylar bloklar halinde işlenir
+        blok = max(_BLOK_BAYT // max(self.bitler.shape[1], 1), 1)
+        for bas in range(0, len(adaylar), blok):
+            parca = adaylar[bas:bas + blok]
+            kesisim = bitler[parca[:, 0]]
+            for sutun in range(1, parca.shape[1]):
+                np.bitwise_and(kesisim, bitler[parca[:, sutun]], out=kesisim)
+            sayilar[bas:bas + blok] = _satir_popcount(kesisim)
+        return sayilar
+
+    def urun_frekanslari(self):
+        """Her ürünün sepet sayısı (tek ürünlük destekler)"""
+        return np.array([_popcount(self.bitler[urun_id])
+                         for urun_id in range(self.bitler.shape[0])], dtype=np.int64)
+
+    def sepet_verisi(self):
+        """
+        Dosyadaki CSR dizilerinden (kopyalamadan) SepetVerisi'ni kurar
+        Yoğun matris kurulmaz; ham veri sadece ilk erişimde ham_veri ile açılır
+        """
+        self._csr_hazirla()
+        return SepetVerisi(None, UrunSozlugu(self.urunler), None, self.indptr, self.indices,
+                           bitset=self, veri_kurucu=self.ham_veri)
+
+    def ham_veri(self):
+        """
+        CSV'deki True/False tablosunu orijinal satır indeksiyle (boş sepetler
+        dahil) yeniden kurar; sadece ham veri görüntülenirken çağrılır
+        """
+        indeks = _indeks_kur(self.indeks)
+        satirlar = (np.arange(self.sepet_sayisi) if self.satirlar is None
+                    else np.asarray(self.satirlar))
+        matris = np.zeros((len(indeks), len(self.urunler)), dtype=bool)
+        matris[np.repeat(satirlar, np.diff(self.indptr)), self.indices] = True
+        return pd.DataFrame(matris, index=indeks, columns=self.urunler)
+
+
+def _hizala(konum):
+    return -(-konum // _HIZALAMA) * _HIZALAMA
+
+
+def _bolum_baslangiclari(json_uzunluk, sepet_sayisi, urun_sayisi, satir_bayt, oge_sayisi):
+    """Bit matrisi, indptr, indices ve satirlar bölümlerinin dosyadaki konumları"""
+    bitler = _hizala(len(BITSET_IMZA) + 32 + json_uzunluk)
+    indptr = _hizala(bitler + urun_sayisi * satir_bayt)
+    indices = _hizala(indptr + 8 * (sepet_sayisi + 1))
+    satirlar = _hizala(indices + 4 * oge_sayisi)
+    return bitler, indptr, indices, satirlar
+
+
+def _bos_olabilir_memmap(dosya_yolu, tur, baslangic, uzunluk):
+    # np.memmap sıfır uzunluklu dizi açamaz
+    if uzunluk == 0:
+        return np.zeros(0, dtype=tur)
+    return np.memmap(dosya_yolu, dtype=tur, mode='r', offset=baslangic, shape=(uzunluk,))
+
+
+def _indeks_bilgisi(indeks):
+    """CSV satır indeksinin başlığa yazılacak hali (0..N-1 aralığı sadece uzunlukla)"""
+    if isinstance(indeks, pd.RangeIndex) and indeks.start == 0 and indeks.step == 1:
+        return {'ad': indeks.name, 'uzunluk': len(indeks)}
+    return {'ad': indeks.name, 'degerler': indeks.tolist()}
+
+
+def _indeks_kur(bilgi):
+    if 'degerler' in bilgi:
+        return pd.Index(bilgi['degerler'], name=bilgi['ad'])
+    return pd.RangeIndex(bilgi['uzunluk'], name=bilgi['ad'])
+
+
+def bitset_hazirla(sepet_verisi):
+    """
+    SepetVerisi'nin bitset deposunu döndürür; yoksa matristen veya CSR'dan
+    bellekte kurar ve nesneye bağlar
+    """
+    if sepet_verisi.bitset is None:
+        if sepet_verisi.matris is not None:
+            sepet_verisi.bitset = BitsetDeposu.matristen(sepet_verisi.matris,
+                                                         sepet_verisi.urunler)
+        else:
+            sepet_verisi.bitset = BitsetDeposu.csr_den(sepet_verisi.indptr,
+                                                       sepet_verisi.indices,
+                                                       sepet_verisi.urunler)
+    return sepet_verisi.bitset
+
+
+def guncel_bitset_ac(csv_yolu, dosya_yolu=None):
+    """
+    Bitset dosyası var ve kaynak CSV değişmemişse (boyut, mtime, içerik özeti)
+    açar, aksi halde None döndürür
+    """
+    dosya_yolu = dosya_yolu or bitset_yolu(csv_yolu)
+    if not os.path.exists(dosya_yolu):
+        return None
+    try:
+        depo = BitsetDeposu.ac(dosya_yolu)
+    except (ValueError, OSError):
+        return None
+    return depo if parmak_izi_uyuyor(depo.kaynak, csv_yolu) else None
+
+
+def bitset_olustur(csv_yolu, dosya_yolu=None):
+    """
+    Derleme adımı: CSV'yi okur ve yanına bitset dosyasını yazar
+    """
+    dosya_yolu = dosya_yolu or bitset_yolu(csv_yolu)
+    parmak_izi = kaynak_parmak_izi(csv_yolu)
+    sepet_verisi = onehot_yukle(csv_yolu)
+    depo = BitsetDeposu.matristen(sepet_verisi.matris, sepet_verisi.urunler)
+    depo.indptr, depo.indices = sepet_verisi.indptr, sepet_verisi.indices
+    depo.satirlar = np.flatnonzero(onehot_matrise_cevir(sepet_verisi.veri).any(axis=1))
+    depo.indeks = _indeks_bilgisi(sepet_verisi.veri.index)
+    depo.kaydet(dosya_yolu, kaynak=parmak_izi)
+    return sepet_verisi
+
+
+def sepet_verisi_yukle(csv_yolu):
+    """
+    Güncel bitset dosyası varsa memmap ile açar, yoksa CSV'den kurup dosyayı yazar
+    Sıcak yüklemede ham veri (ve yoğun matris) kurulmaz; veri ilk erişimde
+    orijinal satır indeksi ve boş sepetlerle birlikte CSV'deki haliyle açılır
+    """
+    dosya_yolu = bitset_yolu(csv_yolu)
+    depo = guncel_bitset_ac(csv_yolu, dosya_yolu)
+    if depo is not None:
+        return depo.sepet_verisi()
+
+    try:
+        sepet_verisi = bitset_olustur(csv_yolu, dosya_yolu)
+        sepet_verisi.bitset = BitsetDeposu.ac(dosya_yolu)
+    except (ValueError, OSError):
+        # Veri klasörü yazılamıyor ya da dosya okunamıyorsa bitset sadece bellekte tutulur
+        sepet_verisi = onehot_yukle(csv_yolu)
+        sepet_verisi.bitset = BitsetDeposu.matristen(sepet_verisi.matris,
+                                                     sepet_verisi.urunler)
+    return sepet_verisi
+
+
+if __name__ == "__main__":
+    for csv_yolu in sys.argv[1:] or ['data/basket_analysis.csv']:
+        sepet_verisi = bitset_olustur(csv_yolu)
+        print(f"✅ {bitset_yolu(csv_yolu)}: {sepet_verisi.sepet_sayisi} sepet, "
+              f"{len(sepet_verisi.sozluk)} ürün")
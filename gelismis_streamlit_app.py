@@ -9,11 +9,25 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from itertools import combinations
 import plotly.express as px
 import plotly.graph_objects as go
 from collections import defaultdict
-import networkx as nx
+
+from bitset_deposu import sepet_verisi_yukle
+from sepet_veri import sepetleri_sec
+from oge_madenciligi import (
+    uclu_kombinasyon_hesapla, en_sik_k_kume, kume_kurallari, MADENCILER, KUME_MODLARI
+)
+from onizleme import ornek_madencilik
+from urun_agi import agi_kur, yerlesim_hesapla, kumeleme
+from merkezilik import merkezilik_olcutleri
+from sonuc_onbellegi import onbellekli, ortak_onbellek
+from birliktelik_motoru import (
+    urun_frekanslari, eslesme_matrisi, eslesme_blogu, lift_matrisi, birliktelik_hesapla, kural_olustur, sepet_icin_oneriler,
+    en_iyi_k_kural, negatif_birliktelikler, KURAL_OLCUTLERI,
+    urun_sayilarini_isimlendir, birliktelikleri_isimlendir, kurallari_isimlendir,
+    negatif_birliktelikleri_isimlendir
+)
 
 # Sayfa ayarları
 st.set_page_config(
@@ -68,198 +82,108 @@ sayfa = st.sidebar.selectbox(
 st.sidebar.markdown("---")
 st.sidebar.info("💡 **İpucu:** Her modül farklı analiz perspektifi sunar!")
 
+# Isı haritalarında yoğun (P x P) çizilecek en fazla ürün sayısı
+MATRIS_GORUNUM_SINIRI = 200
+
 @st.cache_data
 def veri_yukle():
     """Veriyi yükler ve işler"""
     try:
-        veri = pd.read_csv('data/basket_analysis.csv', index_col=0)
+        # Ham veri tablosu burada kurulmaz; sadece görüntüleme sayfasında açılır
+        sepet_verisi = sepet_verisi_yukle('data/basket_analysis.csv')
         
-        # Sepetleri oluştur
-        sepetler = []
-        for i, satir in veri.iterrows():
-            sepet = []
-            for urun in veri.columns:
-                if satir[urun] == True or satir[urun] == 'True':
-                    sepet.append(urun)
-            if sepet:
-                sepetler.append(sepet)
+        # Sonuç önbelleği anahtarı bir kez hesaplanıp önbelleğe alınan kopyada saklanır
+        sepet_verisi.parmak_izi()
         
-        return veri, sepetler
+        return sepet_verisi
     except FileNotFoundError:
         st.error("❌ data/basket_analysis.csv dosyası bulunamadı!")
-        return None, None
+        return None
 
-def urun_sayilarini_hesapla(sepetler):
-    """Her ürünün kaç sepette olduğunu hesaplar"""
-    urun_sayilari = {}
-    for sepet in sepetler:
-        for urun in sepet:
-            urun_sayilari[urun] = urun_sayilari.get(urun, 0) + 1
-    return urun_sayilari
+# Büyük matris her çalıştırmada kopyalanmaz (cache_resource); sayfalar sadece okur
+@st.cache_resource
+def eslesme_yukle(veri_parmak_izi, _sepet_verisi):
+    """
+    Ürün x ürün birlikte görülme matrisi (Xᵀ·X); veri başına bir kez hesaplanır,
+    ısı haritaları ve diğer sayfalar bu matristen dilim alır
+    """
+    return onbellekli(veri_parmak_izi, eslesme_matrisi, _sepet_verisi)
 
-def birliktelik_hesapla(sepetler, min_support=0.05):
-    """İki ürün birlikteliklerini hesaplar"""
-    toplam_sepet = len(sepetler)
-    min_sepet_sayisi = int(min_support * toplam_sepet)
-    
-    birliktelik_sayilari = {}
-    
-    for sepet in sepetler:
-        if len(sepet) >= 2:
-            for urun1, urun2 in combinations(sepet, 2):
-                if urun1 > urun2:
-                    urun1, urun2 = urun2, urun1
-                
-                cift = (urun1, urun2)
-                birliktelik_sayilari[cift] = birliktelik_sayilari.get(cift, 0) + 1
-    
-    # Minimum desteği geçenleri filtrele
-    onemli_birliktelikler = {}
-    for cift, sayi in birliktelik_sayilari.items():
-        if sayi >= min_sepet_sayisi:
-            support = sayi / toplam_sepet
-            onemli_birliktelikler[cift] = {
-                'sepet_sayisi': sayi,
-                'support': support
-            }
-    
-    return onemli_birliktelikler
-
-def uclu_kombinasyon_hesapla(sepetler, min_support=0.03):
-    """3'lü ürün kombinasyonlarını hesaplar - İLERİ SEVİYE"""
-    toplam_sepet = len(sepetler)
-    min_sepet_sayisi = int(min_support * toplam_sepet)
-    
-    uclu_sayilari = {}
-    
-    for sepet in sepetler:
-        if len(sepet) >= 3:
-            for urun1, urun2, urun3 in combinations(sepet, 3):
-                # Alfabetik sıraya koy
-                uclu = tuple(sorted([urun1, urun2, urun3]))
-                uclu_sayilari[uclu] = uclu_sayilari.get(uclu, 0) + 1
-    
-    # Minimum desteği geçenleri filtrele
-    onemli_uclular = {}
-    for uclu, sayi in uclu_sayilari.items():
-        if sayi >= min_sepet_sayisi:
-            support = sayi / toplam_sepet
-            onemli_uclular[uclu] = {
-                'sepet_sayisi': sayi,
-                'support': support
-            }
-    
-    return onemli_uclular
+def populer_urun_idleri(urun_id_sayilari, varsayilan, anahtar, en_fazla=None):
+    """
+    Matris görünümleri için en popüler N ürünün ID'leri (istenirse tüm katalog)
+    en_fazla: yoğun çizilen görünümlerde ürün sayısı üst sınırı; katalog bunu
+              aşarsa "tüm katalog" seçeneği sunulmaz (P x P yoğun blok belleğe sığmaz)
+    """
+    urun_sayisi = int(np.count_nonzero(urun_id_sayilari))
+    ust_sinir = urun_sayisi if en_fazla is None else min(urun_sayisi, en_fazla)
+    if ust_sinir <= 2:
+        gosterilecek = ust_sinir   # Slider için en az 3 ürün gerekir
+    elif ust_sinir == urun_sayisi and st.checkbox(f"Tüm kataloğu göster ({urun_sayisi} ürün)",
+                                                  key=f"{anahtar}_tum"):
+        gosterilecek = urun_sayisi
+    else:
+        gosterilecek = st.slider("Gösterilecek ürün sayısı:", 2, ust_sinir,
+                                 min(varsayilan, ust_sinir), key=f"{anahtar}_sayi")
+    if ust_sinir < urun_sayisi:
+        st.caption(f"Matris görünümü en popüler {en_fazla} ürünle sınırlıdır "
+                   f"(katalogda {urun_sayisi} ürün var)")
+    return np.argsort(-urun_id_sayilari, kind='stable')[:gosterilecek]
 
-def kural_olustur(birliktelikler, urun_sayilari, toplam_sepet, min_confidence=0.3):
-    """Association rules oluşturur"""
-    kurallar = []
-    
-    for (urun1, urun2), bilgi in birliktelikler.items():
-        birlikte_sayi = bilgi['sepet_sayisi']
-        
-        # Kural 1: urun1 → urun2
-        confidence1 = birlikte_sayi / urun_sayilari[urun1]
-        if confidence1 >= min_confidence:
-            lift1 = confidence1 / (urun_sayilari[urun2] / toplam_sepet)
-            kurallar.append({
-                'antecedent': urun1,
-                'consequent': urun2,
-                'support': bilgi['support'],
-                'confidence': confidence1,
-                'lift': lift1
-            })
-        
-        # Kural 2: urun2 → urun1
-        confidence2 = birlikte_sayi / urun_sayilari[urun2]
-        if confidence2 >= min_confidence:
-            lift2 = confidence2 / (urun_sayilari[urun1] / toplam_sepet)
-            kurallar.append({
-                'antecedent': urun2,
-                'consequent': urun1,
-                'support': bilgi['support'],
-                'confidence': confidence2,
-                'lift': lift2
-            })
-    
-    return sorted(kurallar, key=lambda x: x['confidence'], reverse=True)
+@st.cache_resource
+def urun_kumeleri_yukle(veri_parmak_izi, _sepet_verisi):
+    """
+    Tüm katalog için ürün kümeleri (ürün ID'si -> küme no, görülmeyenler -1) ve
+    kümelemenin yapıldığı ağdaki modülerliği
+    Ağ, segment ve öneri sayfaları aynı kümelemeyi kullanır
+    """
+    return onbellekli(veri_parmak_izi, kumeleme,
+                      eslesme_yukle(veri_parmak_izi, _sepet_verisi), _sepet_verisi.sepet_sayisi)
 
-def negatif_birliktelik_hesapla(sepetler, urun_sayilari):
-    """Negatif birliktelikleri bulur - birlikte alınMAyan ürünler"""
-    toplam_sepet = len(sepetler)
-    tum_urunler = list(urun_sayilari.keys())
-    
-    # Beklenen vs gerçek birliktelikleri karşılaştır
-    negatif_ciftler = []
-    
-    for urun1, urun2 in combinations(tum_urunler, 2):
-        if urun1 > urun2:
-            urun1, urun2 = urun2, urun1
-        
-        # Gerçek birlikte alım sayısı
-        birlikte_sayi = 0
-        for sepet in sepetler:
-            if urun1 in sepet and urun2 in sepet:
-                birlikte_sayi += 1
-        
-        # Beklenen birlikte alım (bağımsızlık varsayımı)
-        beklenen = (urun_sayilari[urun1] / toplam_sepet) * (urun_sayilari[urun2] / toplam_sepet) * toplam_sepet
-        
-        # Lift hesapla
-        if birlikte_sayi > 0:
-            gercek_support = birlikte_sayi / toplam_sepet
-            urun1_support = urun_sayilari[urun1] / toplam_sepet
-            urun2_support = urun_sayilari[urun2] / toplam_sepet
-            lift = gercek_support / (urun1_support * urun2_support)
-            
-            # Negatif birliktelik: Lift < 0.8 (beklenenin %80'inden az)
-            if lift < 0.8 and birlikte_sayi >= 5:  # En az 5 sepette görülmüş olsun
-                negatif_ciftler.append({
-                    'urun1': urun1,
-                    'urun2': urun2,
-                    'gercek_sayi': birlikte_sayi,
-                    'beklenen_sayi': beklenen,
-                    'lift': lift,
-                    'fark': beklenen - birlikte_sayi
-                })
-    
-    # Farka göre sırala (en büyük fark = en güçlü negatif ilişki)
-    return sorted(negatif_ciftler, key=lambda x: x['fark'], reverse=True)
+def kume_ozeti(kumeler, urun_id_sayilari, sozluk, en_fazla=10):
+    """En büyük kümelerin ürün sayıları ve en popüler ürünleri"""
+    satirlar = []
+    for kume in range(min(kumeler.max() + 1, en_fazla)):
+        uyeler = np.flatnonzero(kumeler == kume)
+        uyeler = uyeler[np.argsort(-urun_id_sayilari[uyeler], kind='stable')]
+        satirlar.append({
+            'Küme': f"Küme {kume + 1}",
+            'Ürün Sayısı': len(uyeler),
+            'Öne Çıkan Ürünler': ", ".join(sozluk.isimlere_cevir(uyeler[:5]))
+        })
+    return pd.DataFrame(satirlar)
 
-def sepet_segmentleri_analiz_et(sepetler):
-    """Sepetleri büyüklüklerine göre segmentlere ayırır"""
-    sepet_boyutlari = [len(sepet) for sepet in sepetler]
+def sepet_segmentleri_analiz_et(sepet_verisi):
+    """Sepetleri büyüklüklerine göre segmentlere ayırır (her segment bir SepetVerisi)"""
+    sepet_boyutlari = sepet_verisi.sepet_boyutlari()
     
     # Kuartillere göre segmentler
     q1 = np.percentile(sepet_boyutlari, 25)
     q2 = np.percentile(sepet_boyutlari, 50)
     q3 = np.percentile(sepet_boyutlari, 75)
     
-    segmentler = {
-        'Küçük Sepetler': [],
-        'Orta Sepetler': [],
-        'Büyük Sepetler': [],
-        'Mega Sepetler': []
+    maskeler = {
+        'Küçük Sepetler': sepet_boyutlari <= q1,
+        'Orta Sepetler': (sepet_boyutlari > q1) & (sepet_boyutlari <= q2),
+        'Büyük Sepetler': (sepet_boyutlari > q2) & (sepet_boyutlari <= q3),
+        'Mega Sepetler': sepet_boyutlari > q3
     }
-    
-    for sepet in sepetler:
-        boyut = len(sepet)
-        if boyut <= q1:
-            segmentler['Küçük Sepetler'].append(sepet)
-        elif boyut <= q2:
-            segmentler['Orta Sepetler'].append(sepet)
-        elif boyut <= q3:
-            segmentler['Büyük Sepetler'].append(sepet)
-        else:
-            segmentler['Mega Sepetler'].append(sepet)
+    segmentler = {ad: sepetleri_sec(sepet_verisi, np.flatnonzero(maske))
+                  for ad, maske in maskeler.items()}
     
     return segmentler, (q1, q2, q3)
 
 # Veriyi yükle
-veri, sepetler = veri_yukle()
+sepet_verisi = veri_yukle()
 
-if veri is not None and sepetler is not None:
-    urun_sayilari = urun_sayilarini_hesapla(sepetler)
+if sepet_verisi is not None:
+    # Hesaplar ürün ID'leriyle yapılır, isimler sadece gösterim için
+    sozluk = sepet_verisi.sozluk
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    sepet_boyutlari = sepet_verisi.sepet_boyutlari()
+    urun_id_sayilari = urun_frekanslari(sepet_verisi)
+    urun_sayilari = urun_sayilarini_isimlendir(urun_id_sayilari, sozluk)
+    veri_parmak_izi = sepet_verisi.parmak_izi()
     
     # ============ ANA SAYFA ============
     if sayfa == "🏠 Ana Sayfa & İstatistikler":
@@ -269,17 +193,17 @@ if veri is not None and sepetler is not None:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("🛒 Toplam Sepet", len(sepetler))
+            st.metric("🛒 Toplam Sepet", toplam_sepet)
         
         with col2:
             st.metric("📦 Ürün Çeşidi", len(urun_sayilari))
         
         with col3:
-            ortalama_urun = np.mean([len(sepet) for sepet in sepetler])
+            ortalama_urun = sepet_boyutlari.mean()
             st.metric("📊 Ort. Ürün/Sepet", f"{ortalama_urun:.2f}")
         
         with col4:
-            toplam_islem = sum([len(sepet) for sepet in sepetler])
+            toplam_islem = int(sepet_boyutlari.sum())
             st.metric("💰 Toplam İşlem", f"{toplam_islem:,}")
         
         st.markdown("---")
@@ -289,7 +213,6 @@ if veri is not None and sepetler is not None:
         
         with col1:
             st.subheader("📈 Sepet Büyüklüğü Dağılımı")
-            sepet_boyutlari = [len(sepet) for sepet in sepetler]
             
             fig = px.histogram(
                 x=sepet_boyutlari,
@@ -304,11 +227,11 @@ if veri is not None and sepetler is not None:
             # İstatistikler
             st.markdown(f"""
             **Dağılım İstatistikleri:**
-            - Minimum: {min(sepet_boyutlari)} ürün
+            - Minimum: {sepet_boyutlari.min()} ürün
             - Q1 (25%): {np.percentile(sepet_boyutlari, 25):.0f} ürün
             - Medyan: {np.median(sepet_boyutlari):.0f} ürün
             - Q3 (75%): {np.percentile(sepet_boyutlari, 75):.0f} ürün
-            - Maximum: {max(sepet_boyutlari)} ürün
+            - Maximum: {sepet_boyutlari.max()} ürün
             - Std. Sapma: {np.std(sepet_boyutlari):.2f}
             """)
         
@@ -318,7 +241,7 @@ if veri is not None and sepetler is not None:
             sorted_urunler = sorted(urun_sayilari.items(), key=lambda x: x[1], reverse=True)[:10]
             urun_isimleri = [item[0] for item in sorted_urunler]
             urun_sayilari_list = [item[1] for item in sorted_urunler]
-            yuzdeler = [(sayi/len(sepetler))*100 for sayi in urun_sayilari_list]
+            yuzdeler = [(sayi/toplam_sepet)*100 for sayi in urun_sayilari_list]
             
             fig = go.Figure(data=[
                 go.Bar(
@@ -403,6 +326,7 @@ if veri is not None and sepetler is not None:
         st.header("📊 Detaylı Veri Keşfi")
         
         tab1, tab2, tab3 = st.tabs(["📋 Ham Veri", "🎨 Isı Haritası", "📊 Korelasyon Matrisi"])
+        eslesme = eslesme_yukle(veri_parmak_izi, sepet_verisi)
         
         with tab1:
             st.subheader("Ham Veri Görünümü")
@@ -413,33 +337,29 @@ if veri is not None and sepetler is not None:
             with col2:
                 rastgele = st.checkbox("Rastgele örnekle", value=False)
             
+            veri = sepet_verisi.veri
             if rastgele:
                 st.dataframe(veri.sample(gosterilecek_satir), use_container_width=True)
             else:
                 st.dataframe(veri.head(gosterilecek_satir), use_container_width=True)
             
             st.subheader("Örnek Sepetler")
-            for i in range(min(5, len(sepetler))):
-                with st.expander(f"Sepet {i+1} ({len(sepetler[i])} ürün)"):
-                    st.write(", ".join(sepetler[i]))
+            # Sadece gösterilen sepetler ürün isimlerine çevrilir
+            indptr, indices = sepet_verisi.indptr, sepet_verisi.indices
+            for i in range(min(5, toplam_sepet)):
+                sepet = sozluk.isimlere_cevir(indices[indptr[i]:indptr[i + 1]])
+                with st.expander(f"Sepet {i+1} ({len(sepet)} ürün)"):
+                    st.write(", ".join(sepet))
         
         with tab2:
             st.subheader("🎨 Ürün Birliktelik Isı Haritası")
             st.info("Bu harita hangi ürünlerin birlikte ne sıklıkla alındığını gösterir")
             
-            # Top 15 ürünü al
-            sorted_urunler = sorted(urun_sayilari.items(), key=lambda x: x[1], reverse=True)[:15]
-            top_urunler = [item[0] for item in sorted_urunler]
-            
-            # Co-occurrence matrix oluştur
-            cooc_matrix = pd.DataFrame(0, index=top_urunler, columns=top_urunler)
-            
-            for sepet in sepetler:
-                for urun1 in top_urunler:
-                    if urun1 in sepet:
-                        for urun2 in top_urunler:
-                            if urun2 in sepet:
-                                cooc_matrix.loc[urun1, urun2] += 1
+            # En popüler N ürün (veya tüm katalog) eşleşme matrisinden dilimlenir
+            top_idler = populer_urun_idleri(urun_id_sayilari, 15, "isi", MATRIS_GORUNUM_SINIRI)
+            top_urunler = list(sozluk.isimlere_cevir(top_idler))
+            cooc_matrix = pd.DataFrame(eslesme_blogu(eslesme, top_idler),
+                                       index=top_urunler, columns=top_urunler)
             
             fig = px.imshow(
                 cooc_matrix,
@@ -449,41 +369,29 @@ if veri is not None and sepetler is not None:
                 color_continuous_scale='YlOrRd',
                 aspect="auto"
             )
-            fig.update_layout(height=600)
+            fig.update_layout(height=max(600, 25 * len(top_urunler)))
             st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
             st.subheader("📊 Lift Tabanlı Korelasyon Matrisi")
             st.info("Lift değerleri kullanılarak ürün ilişki gücü gösterimi")
             
-            # Lift matrix oluştur
-            top_urunler_15 = [item[0] for item in sorted(urun_sayilari.items(), key=lambda x: x[1], reverse=True)[:12]]
-            lift_matrix = pd.DataFrame(1.0, index=top_urunler_15, columns=top_urunler_15)
-            
-            for urun1 in top_urunler_15:
-                for urun2 in top_urunler_15:
-                    if urun1 != urun2:
-                        # Birlikte alım sayısı
-                        birlikte = sum(1 for sepet in sepetler if urun1 in sepet and urun2 in sepet)
-                        
-                        if birlikte > 0:
-                            support_xy = birlikte / len(sepetler)
-                            support_x = urun_sayilari[urun1] / len(sepetler)
-                            support_y = urun_sayilari[urun2] / len(sepetler)
-                            
-                            lift = support_xy / (support_x * support_y)
-                            lift_matrix.loc[urun1, urun2] = lift
+            # Lift, aynı eşleşme matrisinin seçili bloğundan vektörel hesaplanır
+            top_idler = populer_urun_idleri(urun_id_sayilari, 12, "lift", MATRIS_GORUNUM_SINIRI)
+            top_urunler = list(sozluk.isimlere_cevir(top_idler))
+            lift_matrix = pd.DataFrame(lift_matrisi(eslesme_blogu(eslesme, top_idler), toplam_sepet),
+                                       index=top_urunler, columns=top_urunler)
             
             fig = px.imshow(
                 lift_matrix,
                 labels=dict(x="Ürün", y="Ürün", color="Lift Değeri"),
-                x=top_urunler_15,
-                y=top_urunler_15,
+                x=top_urunler,
+                y=top_urunler,
                 color_continuous_scale='RdYlGn',
                 color_continuous_midpoint=1.0,
                 aspect="auto"
             )
-            fig.update_layout(height=600)
+            fig.update_layout(height=max(600, 25 * len(top_urunler)))
             st.plotly_chart(fig, use_container_width=True)
             
             st.markdown("""
@@ -501,11 +409,22 @@ if veri is not None and sepetler is not None:
         
         with col1:
             st.subheader("Parametreler")
-            min_support = st.slider(
-                "Minimum Support:", 
-                0.01, 0.20, 0.05, 0.01,
-                help="Ürün çiftinin minimum destek oranı"
+            esik_yontemi = st.radio(
+                "Eşik Yöntemi:", ["Minimum Support", "En Sık k Çift"],
+                help="En Sık k Çift: support tahmin etmeden en çok birlikte alınan k çift"
             )
+            if esik_yontemi == "Minimum Support":
+                min_support = st.slider(
+                    "Minimum Support:", 
+                    0.01, 0.20, 0.05, 0.01,
+                    help="Ürün çiftinin minimum destek oranı"
+                )
+                birliktelik_parametreleri = {'min_support': min_support}
+                esik_basligi = f"Support ≥ {min_support*100}%"
+            else:
+                k_cift = st.slider("Çift Sayısı (k):", 5, 100, 20, 5)
+                birliktelik_parametreleri = {'k': k_cift}
+                esik_basligi = f"En sık {k_cift} çift"
             
             analiz_turu = st.radio(
                 "Analiz Türü:",
@@ -520,14 +439,19 @@ if veri is not None and sepetler is not None:
         
         with col2:
             if st.button("🔍 Analiz Yap", type="primary"):
-                birliktelikler = birliktelik_hesapla(sepetler, min_support)
+                if esik_yontemi == "Minimum Support":
+                    birliktelikler = onbellekli(veri_parmak_izi, birliktelik_hesapla,
+                                                sepet_verisi, min_support=min_support)
+                else:
+                    birliktelikler = onbellekli(veri_parmak_izi, en_sik_k_kume, sepet_verisi,
+                                                k=k_cift, min_uzunluk=2, max_uzunluk=2)
                 
                 if birliktelikler:
                     st.success(f"✅ {len(birliktelikler)} ürün çifti bulundu!")
                     
                     # Dataframe oluştur
                     birliktelik_listesi = []
-                    for (urun1, urun2), bilgi in birliktelikler.items():
+                    for (urun1, urun2), bilgi in birliktelikleri_isimlendir(birliktelikler, sozluk).items():
                         if analiz_turu == "Tüm Çiftler" or urun1 == secilen_urun or urun2 == secilen_urun:
                             birliktelik_listesi.append({
                                 'Ürün 1': urun1,
@@ -550,7 +474,7 @@ if veri is not None and sepetler is not None:
                         x='Sepet Sayısı',
                         y='Ürün Çifti',
                         orientation='h',
-                        title=f'En Güçlü 15 Birliktelik (Support ≥ {min_support*100}%)',
+                        title=f'En Güçlü 15 Birliktelik ({esik_basligi})',
                         color='Support',
                         color_continuous_scale='Blues',
                         hover_data=['Support %']
@@ -568,6 +492,7 @@ if veri is not None and sepetler is not None:
                     
                     # Session state'e kaydet
                     st.session_state['birliktelikler'] = birliktelikler
+                    st.session_state['birliktelik_parametreleri'] = birliktelik_parametreleri
                     
                 else:
                     st.warning("❌ Hiç birliktelik bulunamadı. Support değerini düşürün.")
@@ -586,6 +511,32 @@ if veri is not None and sepetler is not None:
                 0.01, 0.15, 0.03, 0.01,
                 help="3'lü kombinasyonlar için minimum destek oranı"
             )
+            algoritma_3 = st.selectbox(
+                "Algoritma:", list(MADENCILER),
+                help="FP-Growth aday üretmez; düşük support değerlerinde daha hızlıdır"
+            )
+            mod_3 = st.selectbox(
+                "Gösterim:", list(KUME_MODLARI),
+                help="Kapalı: aynı sepetlerde geçen daha büyük bir paketi olmayan üçlüler. "
+                     "Maksimal: hiçbir sık üst kümesi olmayan üçlüler."
+            )
+            paralel_3 = st.checkbox(
+                "Paralel (tüm çekirdekler)",
+                help="Sepetler bölünüp süreç havuzunda madenlenir (SON); büyük verilerde hızlıdır"
+            )
+            onizleme_3 = st.checkbox(
+                "⚡ Hızlı ön izleme (örneklem)",
+                help="Rastgele sepet örnekleminde düşürülmüş eşikle madencilik; "
+                     "destekler güven aralığıyla gösterilir"
+            )
+            dogrula_3 = onizleme_3 and st.checkbox(
+                "Tam veriyle doğrula",
+                help="Sonuç tam veride tek geçişle sayılır ve kesinleşir"
+            )
+            min_confidence_3 = st.slider(
+                "Kural Min Confidence:", 0.1, 0.9, 0.4, 0.05,
+                help="{A, B} → C kuralları için minimum güven oranı"
+            )
             
             st.markdown("---")
             st.markdown("""
@@ -600,7 +551,31 @@ if veri is not None and sepetler is not None:
         with col2:
             if st.button("🎯 3'lü Analiz Başlat", type="primary"):
                 with st.spinner("3'lü kombinasyonlar hesaplanıyor..."):
-                    uclu_kombinasyonlar = uclu_kombinasyon_hesapla(sepetler, min_support_3)
+                    if onizleme_3:
+                        uclu_kombinasyonlar, onizleme_ozeti = onbellekli(
+                            veri_parmak_izi, ornek_madencilik, sepet_verisi,
+                            min_support=min_support_3, max_uzunluk=3, algoritma=algoritma_3,
+                            dogrula=dogrula_3
+                        )
+                        uclu_kombinasyonlar = {kume: bilgi for kume, bilgi in uclu_kombinasyonlar.items()
+                                               if len(kume) == 3}
+                    else:
+                        uclu_kombinasyonlar = onbellekli(veri_parmak_izi, uclu_kombinasyon_hesapla,
+                                                         sepet_verisi, min_support=min_support_3,
+                                                         algoritma=algoritma_3, mod=mod_3,
+                                                         paralel=paralel_3)
+                    uclu_kombinasyonlar = birliktelikleri_isimlendir(uclu_kombinasyonlar, sozluk)
+                
+                if onizleme_3:
+                    if onizleme_ozeti['dogrulandi'] is None:
+                        st.caption(f"⚡ Ön izleme: {onizleme_ozeti['ornek_boyutu']} sepetlik örneklem, "
+                                   f"örneklem eşiği %{onizleme_ozeti['dusuk_esik']*100:.2f}. "
+                                   "Destekler tahmindir (%95 güven aralığı).")
+                    elif onizleme_ozeti['dogrulandi']:
+                        st.caption("✅ Ön izleme tam veride doğrulandı; destekler kesindir.")
+                    else:
+                        st.caption(f"⚠️ Örneklem {onizleme_ozeti['sinir_ihlali']} sık kümeyi kaçırdı; "
+                                   "sonuç tam veride yeniden hesaplandı.")
                 
                 if uclu_kombinasyonlar:
                     st.success(f"✅ {len(uclu_kombinasyonlar)} adet 3'lü kombinasyon bulundu!")
@@ -622,6 +597,9 @@ if veri is not None and sepetler is not None:
                             'Support': bilgi['support'],
                             'Support %': f"{bilgi['support']*100:.2f}%"
                         })
+                        if 'guven_araligi' in bilgi:
+                            alt, ust = bilgi['guven_araligi']
+                            uclu_data[-1]['Güven Aralığı'] = f"%{alt*100:.2f} - %{ust*100:.2f}"
                     
                     df_uclu = pd.DataFrame(uclu_data)
                     
@@ -655,7 +633,7 @@ if veri is not None and sepetler is not None:
                     with col_b:
                         st.metric("Support Oranı", f"{bilgi['support']*100:.2f}%")
                     with col_c:
-                        toplam_musteri_etkisi = (bilgi['support'] * len(sepetler))
+                        toplam_musteri_etkisi = (bilgi['support'] * toplam_sepet)
                         st.metric("Müşteri Etkisi", f"~{int(toplam_musteri_etkisi)}")
                     
                     st.markdown(f"""
@@ -671,6 +649,26 @@ if veri is not None and sepetler is not None:
                     </div>
                     """, unsafe_allow_html=True)
                     
+                    # İki öncüllü kurallar: {A, B} → C
+                    st.subheader("📋 3'lü Kurallar: {A, B} → C")
+                    uclu_kurallar = onbellekli(veri_parmak_izi, kume_kurallari, sepet_verisi,
+                                               min_support=min_support_3,
+                                               min_confidence=min_confidence_3,
+                                               max_uzunluk=3, algoritma=algoritma_3)
+                    uclu_kurallar = [kural for kural in kurallari_isimlendir(uclu_kurallar, sozluk)
+                                     if len(kural['antecedent']) == 2]
+                    if uclu_kurallar:
+                        df_uclu_kural = pd.DataFrame([{
+                            'Öncül': ' + '.join(kural['antecedent']),
+                            'Sonuç': kural['consequent'][0],
+                            'Support %': f"{kural['support']*100:.2f}%",
+                            'Confidence': f"{kural['confidence']*100:.1f}%",
+                            'Lift': round(kural['lift'], 2)
+                        } for kural in uclu_kurallar])
+                        st.dataframe(df_uclu_kural.head(30), use_container_width=True)
+                    else:
+                        st.info("Bu güven eşiğinde iki öncüllü kural yok. Confidence değerini düşürün.")
+                    
                     # Session'a kaydet
                     st.session_state['uclu_kombinasyonlar'] = uclu_kombinasyonlar
                     
@@ -689,105 +687,76 @@ if veri is not None and sepetler is not None:
         with col2:
             min_lift = st.slider("Min Lift:", 1.0, 3.0, 1.2, 0.1)
         with col3:
-            max_nodes = st.slider("Max Ürün Sayısı:", 5, 20, 12, 1)
+            secili_idler = populer_urun_idleri(urun_id_sayilari, 12, "ag")
         
+        # Grafik bir kez istendikten sonra eşik değişimlerinde yeniden çizilir
         if st.button("🔗 Network Grafiği Oluştur", type="primary"):
+            st.session_state['ag_goster'] = True
+        
+        if st.session_state.get('ag_goster'):
             with st.spinner("Network grafiği hazırlanıyor..."):
-                # En popüler ürünleri al
-                sorted_urunler = sorted(urun_sayilari.items(), key=lambda x: x[1], reverse=True)[:max_nodes]
-                secili_urunler = [item[0] for item in sorted_urunler]
-                
-                # Graph oluştur
-                G = nx.Graph()
-                
-                # Node'ları ekle
-                for urun in secili_urunler:
-                    G.add_node(urun, size=urun_sayilari[urun])
-                
-                # Edge'leri ekle (birlikteliklere göre)
-                for sepet in sepetler:
-                    sepetteki_secili = [u for u in sepet if u in secili_urunler]
-                    if len(sepetteki_secili) >= 2:
-                        for u1, u2 in combinations(sepetteki_secili, 2):
-                            if G.has_edge(u1, u2):
-                                G[u1][u2]['weight'] += 1
-                            else:
-                                G.add_edge(u1, u2, weight=1)
+                # Ağ, önbellekteki eşleşme matrisinden dizi maskeleriyle kurulur
+                toplam_sepet = sepet_verisi.sepet_sayisi
+                ag = agi_kur(eslesme_yukle(veri_parmak_izi, sepet_verisi), toplam_sepet,
+                             min_support_net, min_lift, secili_idler)
                 
-                # Lift hesapla ve zayıf bağlantıları kaldır
-                edges_to_remove = []
-                for u1, u2, data in G.edges(data=True):
-                    birlikte_sayi = data['weight']
-                    support_xy = birlikte_sayi / len(sepetler)
-                    support_x = urun_sayilari[u1] / len(sepetler)
-                    support_y = urun_sayilari[u2] / len(sepetler)
-                    lift = support_xy / (support_x * support_y)
-                    
-                    if support_xy < min_support_net or lift < min_lift:
-                        edges_to_remove.append((u1, u2))
-                    else:
-                        G[u1][u2]['lift'] = lift
-                        G[u1][u2]['support'] = support_xy
-                
-                for edge in edges_to_remove:
-                    G.remove_edge(*edge)
+                # Yerleşimler eşik başına saklanır; yeni eşikler son yerleşimden başlar
+                yerlesimler = st.session_state.setdefault('ag_yerlesimleri', {})
+                son_yerlesim = st.session_state.get('ag_son_yerlesimi', {})
+                anahtar = (veri_parmak_izi, min_support_net, min_lift, ag.dugum_sayisi)
+                if anahtar not in yerlesimler:
+                    if len(yerlesimler) >= 20:
+                        yerlesimler.pop(next(iter(yerlesimler)))
+                    yerlesimler[anahtar] = yerlesim_hesapla(ag, son_yerlesim)
+                pos = yerlesimler[anahtar]
+                st.session_state['ag_son_yerlesimi'] = {**son_yerlesim, **pos}
                 
-                # Plotly ile görselleştir
-                pos = nx.spring_layout(G, k=2, iterations=50)
+                isimler = sozluk.isimlere_cevir(ag.urunler)
+                kumeler, kume_modulerligi = urun_kumeleri_yukle(veri_parmak_izi, sepet_verisi)
+                dugum_kumeleri = kumeler[ag.urunler]
+                renkler = px.colors.qualitative.Plotly
+                xy = np.array([pos[urun] for urun in ag.urunler.tolist()]).reshape(-1, 2)
                 
-                # Edge traces
+                # Edge traces: her kenar için ayrı iz yerine lift aralığı başına bir iz
                 edge_traces = []
-                for edge in G.edges(data=True):
-                    u1, u2, data = edge
-                    x0, y0 = pos[u1]
-                    x1, y1 = pos[u2]
-                    
-                    # Lift'e göre renk ve kalınlık
-                    lift = data.get('lift', 1.0)
-                    width = min(10, lift * 2)
-                    
-                    edge_trace = go.Scatter(
-                        x=[x0, x1, None],
-                        y=[y0, y1, None],
+                lift_gruplari = np.minimum(np.floor(ag.lift * 2) / 2, 5.0)
+                for grup in np.unique(lift_gruplari):
+                    secim = np.flatnonzero(lift_gruplari == grup)
+                    bosluk = np.full(len(secim), np.nan)
+                    kenar_metinleri = [f"{isimler[ag.kaynak[i]]} ↔ {isimler[ag.hedef[i]]}<br>"
+                                       f"Lift: {ag.lift[i]:.2f}<br>Support: {ag.support[i]*100:.1f}%"
+                                       for i in secim.tolist()]
+                    edge_traces.append(go.Scatter(
+                        x=np.column_stack([xy[ag.kaynak[secim], 0], xy[ag.hedef[secim], 0], bosluk]).ravel(),
+                        y=np.column_stack([xy[ag.kaynak[secim], 1], xy[ag.hedef[secim], 1], bosluk]).ravel(),
                         mode='lines',
-                        line=dict(width=width, color=f'rgba(100,100,250,{min(1, lift/3)})'),
+                        line=dict(width=min(10, grup * 2), color=f'rgba(100,100,250,{min(1, grup/3)})'),
                         hoverinfo='text',
-                        text=f"{u1} ↔ {u2}<br>Lift: {lift:.2f}<br>Support: {data['support']*100:.1f}%",
+                        text=[metin for kenar_metni in kenar_metinleri
+                              for metin in (kenar_metni, kenar_metni, None)],
                         showlegend=False
-                    )
-                    edge_traces.append(edge_trace)
+                    ))
                 
-                # Node trace
-                node_x = []
-                node_y = []
-                node_text = []
-                node_size = []
-                
-                for node in G.nodes():
-                    x, y = pos[node]
-                    node_x.append(x)
-                    node_y.append(y)
-                    
-                    # Node büyüklüğü support oranına göre
-                    size = (urun_sayilari[node] / len(sepetler)) * 1000
-                    node_size.append(size)
-                    
-                    # Hover text
-                    connections = len(list(G.neighbors(node)))
-                    node_text.append(f"{node}<br>Sepet: {urun_sayilari[node]}<br>Bağlantı: {connections}")
+                # Node trace: büyüklük support oranına göre (kalabalık ağlarda küçültülür)
+                dereceler = ag.dereceler()
+                boyut_olcegi = min(1.0, 50 / max(ag.dugum_sayisi, 1))
+                node_text = [f"{isim}<br>Sepet: {int(sayi)}<br>Bağlantı: {derece}<br>Küme: {kume + 1}"
+                             for isim, sayi, derece, kume in zip(isimler, ag.frekanslar.tolist(),
+                                                                 dereceler.tolist(),
+                                                                 dugum_kumeleri.tolist())]
                 
                 node_trace = go.Scatter(
-                    x=node_x,
-                    y=node_y,
-                    mode='markers+text',
-                    text=[node for node in G.nodes()],
+                    x=xy[:, 0],
+                    y=xy[:, 1],
+                    mode='markers+text' if ag.dugum_sayisi <= 50 else 'markers',
+                    text=list(isimler),
                     textposition="top center",
                     hovertext=node_text,
                     hoverinfo='text',
                     marker=dict(
-                        size=node_size,
-                        color='#FF6B6B',
-                        line=dict(width=2, color='white')
+                        size=ag.frekanslar / toplam_sepet * 1000 * boyut_olcegi,
+                        color=[renkler[kume % len(renkler)] for kume in dugum_kumeleri.tolist()],
+                        line=dict(width=2 * boyut_olcegi, color='white')
                     ),
                     showlegend=False
                 )
@@ -811,23 +780,56 @@ if veri is not None and sepetler is not None:
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    st.metric("Toplam Node", G.number_of_nodes())
+                    st.metric("Toplam Node", ag.dugum_sayisi)
                 with col2:
-                    st.metric("Toplam Bağlantı", G.number_of_edges())
+                    st.metric("Toplam Bağlantı", ag.kenar_sayisi)
                 with col3:
-                    avg_degree = sum(dict(G.degree()).values()) / G.number_of_nodes()
+                    avg_degree = dereceler.mean() if ag.dugum_sayisi else 0.0
                     st.metric("Ort. Bağlantı", f"{avg_degree:.1f}")
                 with col4:
-                    density = nx.density(G)
-                    st.metric("Ağ Yoğunluğu", f"{density:.2%}")
+                    st.metric("Ağ Yoğunluğu", f"{ag.yogunluk():.2%}")
                 
-                # En merkezi ürünler
+                # En merkezi ürünler: ölçütler seyrek komşuluk matrisinden hesaplanır
                 st.subheader("🎯 En Merkezi Ürünler (Hub Products)")
-                degree_cent = nx.degree_centrality(G)
-                sorted_central = sorted(degree_cent.items(), key=lambda x: x[1], reverse=True)[:5]
+                olcut_isimleri = {
+                    'Derece': 'derece',
+                    'Ağırlıklı Derece (birlikte alım)': 'agirlikli_derece',
+                    'PageRank (lift ağırlıklı)': 'pagerank',
+                    'Arasındalık (yaklaşık)': 'arasindalik'
+                }
+                secili_olcut = st.selectbox("Merkezilik Ölçütü:", list(olcut_isimleri),
+                                            help="Arasındalık rastgele pivot ürünlerden örneklenir")
+                olcutler = merkezilik_olcutleri(ag)
+                merkezilik = olcutler[olcut_isimleri[secili_olcut]]
+                
+                # Ağırlıklı derece sepet sayısıdır, diğer ölçütler oran
+                bicim = "{:,.0f}" if olcut_isimleri[secili_olcut] == 'agirlikli_derece' else "{:.2%}"
+                hub_siralama = np.argsort(-merkezilik, kind='stable')[:10]
+                for i, sira in enumerate(hub_siralama[:5].tolist(), 1):
+                    st.write(f"{i}. **{isimler[sira]}** - {secili_olcut}: {bicim.format(merkezilik[sira])} "
+                             f"(Diğer {dereceler[sira]} ürünle bağlantılı)")
                 
-                for i, (urun, cent) in enumerate(sorted_central, 1):
-                    st.write(f"{i}. **{urun}** - Merkezilik: {cent:.2%} (Diğer {len(list(G.neighbors(urun)))} ürünle bağlantılı)")
+                st.dataframe(pd.DataFrame({
+                    'Ürün': [isimler[sira] for sira in hub_siralama.tolist()],
+                    'Bağlantı': dereceler[hub_siralama],
+                    'Ağırlıklı Derece': olcutler['agirlikli_derece'][hub_siralama].round(0),
+                    'PageRank': olcutler['pagerank'][hub_siralama].round(4),
+                    'Arasındalık': olcutler['arasindalik'][hub_siralama].round(4)
+                }), use_container_width=True, hide_index=True)
+                
+                # Ürün kümeleri: tüm katalogun lift ağırlıklı ağında etiket yayılımı
+                st.subheader("🧩 Ürün Kümeleri (Doğal Reyonlar)")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Küme Sayısı", int(kumeler.max()) + 1)
+                with col2:
+                    st.metric("Modülerlik", f"{kume_modulerligi:.2f}")
+                if kume_modulerligi < 0.1:
+                    st.caption("Modülerlik düşük: ürünler belirgin gruplara ayrılmıyor, "
+                               "birliktelikler katalog geneline yayılmış.")
+                
+                st.dataframe(kume_ozeti(kumeler, urun_id_sayilari, sozluk),
+                             use_container_width=True, hide_index=True)
     
     # ============ GELİŞMİŞ KURAL ANALİZİ ============
     elif sayfa == "📋 Gelişmiş Kural Analizi":
@@ -836,18 +838,44 @@ if veri is not None and sepetler is not None:
         if 'birliktelikler' not in st.session_state:
             st.warning("⚠️ Önce 'Tek & Çift Ürün Analizi' yapmalısınız!")
         else:
+            kural_secimi = st.radio(
+                "Kural Seçimi:", ["Eşik Değerleri", "En İyi k Kural"], horizontal=True,
+                help="En İyi k Kural: tüm çiftler içinden seçilen ölçütte en yüksek k kural"
+            )
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                min_confidence = st.slider("Min Confidence:", 0.1, 0.9, 0.3, 0.05)
+                if kural_secimi == "Eşik Değerleri":
+                    min_confidence = st.slider("Min Confidence:", 0.1, 0.9, 0.3, 0.05)
+                else:
+                    k_kural = st.slider("Kural Sayısı (k):", 5, 100, 20, 5)
+                    min_birlikte = st.number_input(
+                        "En Az Birlikte Alım (sepet):", min_value=1, value=5, step=1,
+                        help="Birkaç sepette görülen nadir çiftlerin tesadüfi kurallarını eler"
+                    )
             with col2:
-                min_lift = st.slider("Min Lift:", 0.5, 3.0, 1.0, 0.1)
+                if kural_secimi == "Eşik Değerleri":
+                    min_lift = st.slider("Min Lift:", 0.5, 3.0, 1.0, 0.1)
+                else:
+                    min_lift = 0.0
+                    kural_olcutu = st.selectbox("Seçim Ölçütü:", KURAL_OLCUTLERI)
             with col3:
                 siralama = st.selectbox("Sıralama:", ["Confidence", "Lift", "Support"])
             
             if st.button("📋 Kural Analizi Yap", type="primary"):
-                birliktelikler = st.session_state['birliktelikler']
-                kurallar = kural_olustur(birliktelikler, urun_sayilari, len(sepetler), min_confidence)
+                if kural_secimi == "Eşik Değerleri":
+                    birliktelikler = st.session_state['birliktelikler']
+                    # Kurallar (veri, birliktelik eşiği, min confidence) için disk önbelleğinden gelir
+                    kurallar = ortak_onbellek.hesapla(
+                        veri_parmak_izi, 'kural_olustur',
+                        dict(st.session_state.get('birliktelik_parametreleri', {}),
+                             min_confidence=min_confidence),
+                        lambda: kural_olustur(birliktelikler, urun_id_sayilari, toplam_sepet, min_confidence)
+                    )
+                else:
+                    kurallar = onbellekli(veri_parmak_izi, en_iyi_k_kural, sepet_verisi,
+                                          k=k_kural, olcut=kural_olcutu,
+                                          min_sepet_sayisi=int(min_birlikte))
                 
                 # Lift filtrele
                 kurallar = [k for k in kurallar if k['lift'] >= min_lift]
@@ -857,7 +885,11 @@ if veri is not None and sepetler is not None:
                     kurallar = sorted(kurallar, key=lambda x: x['lift'], reverse=True)
                 elif siralama == "Support":
                     kurallar = sorted(kurallar, key=lambda x: x['support'], reverse=True)
-                # Confidence zaten sıralı
+                elif siralama == "Confidence":
+                    kurallar = sorted(kurallar, key=lambda x: x['confidence'], reverse=True)
+                
+                # Gösterim için ID'leri ürün isimlerine çevir
+                kurallar_isimli = kurallari_isimlendir(kurallar, sozluk)
                 
                 if kurallar:
                     st.success(f"✅ {len(kurallar)} kural bulundu!")
@@ -899,7 +931,7 @@ if veri is not None and sepetler is not None:
                             'Support': k['support'],
                             'Support %': k['support'] * 100
                         }
-                        for k in kurallar[:50]  # İlk 50 kural
+                        for k in kurallar_isimli[:50]  # İlk 50 kural
                     ])
                     
                     fig = px.scatter(
@@ -921,7 +953,7 @@ if veri is not None and sepetler is not None:
                     st.subheader("🏆 En Güçlü Kurallar")
                     
                     kural_listesi = []
-                    for i, kural in enumerate(kurallar[:30], 1):
+                    for i, kural in enumerate(kurallar_isimli[:30], 1):
                         kural_listesi.append({
                             '#': i,
                             'Öncül': kural['antecedent'],
@@ -938,7 +970,7 @@ if veri is not None and sepetler is not None:
                     
                     # En güçlü 3 kural açıklaması
                     st.subheader("💡 Top 3 Kural Yorumu")
-                    for i, kural in enumerate(kurallar[:3], 1):
+                    for i, kural in enumerate(kurallar_isimli[:3], 1):
                         with st.expander(f"🏆 Kural {i}: {kural['antecedent']} → {kural['consequent']}"):
                             col_a, col_b, col_c = st.columns(3)
                             with col_a:
@@ -971,7 +1003,7 @@ if veri is not None and sepetler is not None:
         st.info("🔍 Farklı sepet büyüklüklerindeki müşteri davranışlarını analiz edin")
         
         # Segmentleri hesapla
-        segmentler, kuartiller = sepet_segmentleri_analiz_et(sepetler)
+        segmentler, kuartiller = sepet_segmentleri_analiz_et(sepet_verisi)
         q1, q2, q3 = kuartiller
         
         # Genel bakış
@@ -982,28 +1014,28 @@ if veri is not None and sepetler is not None:
         with col1:
             st.metric(
                 "🛍️ Küçük Sepetler",
-                len(segmentler['Küçük Sepetler']),
+                segmentler['Küçük Sepetler'].sepet_sayisi,
                 f"≤{int(q1)} ürün"
             )
         
         with col2:
             st.metric(
                 "📦 Orta Sepetler",
-                len(segmentler['Orta Sepetler']),
+                segmentler['Orta Sepetler'].sepet_sayisi,
                 f"{int(q1)+1}-{int(q2)} ürün"
             )
         
         with col3:
             st.metric(
                 "🛒 Büyük Sepetler",
-                len(segmentler['Büyük Sepetler']),
+                segmentler['Büyük Sepetler'].sepet_sayisi,
                 f"{int(q2)+1}-{int(q3)} ürün"
             )
         
         with col4:
             st.metric(
                 "🎁 Mega Sepetler",
-                len(segmentler['Mega Sepetler']),
+                segmentler['Mega Sepetler'].sepet_sayisi,
                 f">{int(q3)} ürün"
             )
         
@@ -1016,12 +1048,14 @@ if veri is not None and sepetler is not None:
         
         if st.button("🔍 Segment Analizi Yap", type="primary"):
             segment_sepetleri = segmentler[secili_segment]
+            segment_sepet_sayisi = segment_sepetleri.sepet_sayisi
             
-            if segment_sepetleri:
-                st.subheader(f"📊 {secili_segment} Analizi ({len(segment_sepetleri)} sepet)")
+            if segment_sepet_sayisi:
+                st.subheader(f"📊 {secili_segment} Analizi ({segment_sepet_sayisi} sepet)")
                 
-                # Bu segmentteki ürün popülaritesi
-                segment_urun_sayilari = urun_sayilarini_hesapla(segment_sepetleri)
+                # Bu segmentteki ürün popülaritesi (ID'lerle sayılır, isimler gösterim için)
+                segment_id_sayilari = urun_frekanslari(segment_sepetleri)
+                segment_urun_sayilari = urun_sayilarini_isimlendir(segment_id_sayilari, sozluk)
                 sorted_segment_urunler = sorted(segment_urun_sayilari.items(), 
                                                key=lambda x: x[1], reverse=True)[:15]
                 
@@ -1051,8 +1085,8 @@ if veri is not None and sepetler is not None:
                     karsilastirma_data = []
                     for urun, segment_sayi in sorted_segment_urunler[:10]:
                         genel_sayi = urun_sayilari.get(urun, 0)
-                        segment_oran = (segment_sayi / len(segment_sepetleri)) * 100
-                        genel_oran = (genel_sayi / len(sepetler)) * 100
+                        segment_oran = (segment_sayi / segment_sepet_sayisi) * 100
+                        genel_oran = (genel_sayi / toplam_sepet) * 100
                         fark = segment_oran - genel_oran
                         
                         karsilastirma_data.append({
@@ -1102,6 +1136,29 @@ if veri is not None and sepetler is not None:
                     for i, row in df_sorted.tail(5).iterrows():
                         st.write(f"• **{row['Ürün']}**: {row['Fark']:.1f}% fark")
                 
+                # Segmentteki alımların ürün kümelerine dağılımı
+                st.subheader("🧩 Ürün Kümesi Dağılımı")
+                kumeler, _ = urun_kumeleri_yukle(veri_parmak_izi, sepet_verisi)
+                kume_sayisi = int(kumeler.max()) + 1
+                gorulen = kumeler >= 0
+                segment_kume_sayilari = np.bincount(kumeler[gorulen],
+                                                    weights=segment_id_sayilari[gorulen],
+                                                    minlength=kume_sayisi)
+                genel_kume_sayilari = np.bincount(kumeler[gorulen], weights=urun_id_sayilari[gorulen],
+                                                  minlength=kume_sayisi)
+                
+                gosterilecek_kumeler = min(kume_sayisi, 10)
+                df_kume = pd.DataFrame({
+                    'Küme': [f"Küme {kume + 1}" for kume in range(gosterilecek_kumeler)],
+                    'Bu Segment %': segment_kume_sayilari[:gosterilecek_kumeler] / segment_kume_sayilari.sum() * 100,
+                    'Genel %': genel_kume_sayilari[:gosterilecek_kumeler] / genel_kume_sayilari.sum() * 100
+                })
+                fig = px.bar(df_kume, x='Küme', y=['Bu Segment %', 'Genel %'], barmode='group',
+                             title="Alımların Kümelere Dağılımı",
+                             labels={'value': 'Alım Payı (%)', 'variable': ''})
+                fig.update_layout(height=400)
+                st.plotly_chart(fig, use_container_width=True)
+                
                 # İş önerileri
                 st.markdown("---")
                 st.subheader("💡 Segment-Spesifik İş Önerileri")
@@ -1164,10 +1221,17 @@ if veri is not None and sepetler is not None:
         
         if st.button("⚖️ Negatif Birliktelikleri Bul", type="primary"):
             with st.spinner("Negatif birliktelikler hesaplanıyor..."):
-                negatif_ciftler = negatif_birliktelik_hesapla(sepetler, urun_sayilari)
+                # Tüm çiftler tek bir eşleşme matrisinden vektörel değerlendirilir
+                negatif_ciftler = negatif_birliktelikleri_isimlendir(
+                    onbellekli(veri_parmak_izi, negatif_birliktelikler, sepet_verisi),
+                    sepet_verisi.sozluk
+                )
             
             if negatif_ciftler:
                 st.success(f"✅ {len(negatif_ciftler)} negatif birliktelik bulundu!")
+                anlamli = sum(1 for item in negatif_ciftler if item['p_degeri'] < 0.05)
+                st.caption(f"Fisher kesin testine göre {anlamli} tanesi istatistiksel olarak "
+                           f"anlamlı (p < 0.05); diğerleri tesadüfi olabilir.")
                 
                 # Top 20
                 top_negatif = negatif_ciftler[:20]
@@ -1181,7 +1245,9 @@ if veri is not None and sepetler is not None:
                         'Gerçek Sayı': item['gercek_sayi'],
                         'Beklenen Sayı': f"{item['beklenen_sayi']:.1f}",
                         'Lift': f"{item['lift']:.3f}",
-                        'Fark': f"{item['fark']:.1f}"
+                        'Fark': f"{item['fark']:.1f}",
+                        'Ki-Kare': f"{item['ki_kare']:.2f}",
+                        'p (Fisher)': f"{item['p_degeri']:.2g}"
                     }
                     for item in top_negatif
                 ])
@@ -1276,36 +1342,17 @@ if veri is not None and sepetler is not None:
                 min_confidence_oneri = st.slider("Min Confidence:", 0.1, 0.9, 0.2, 0.05)
             
             if secili_urunler and st.button("🎯 Öneri Getir", type="primary"):
-                # Tüm seçili ürünler için kuralları topla
-                tum_oneriler = {}
+                # Tüm seçili ürünler için kuralları ID'ler üzerinden topla
+                secili_idler = [sozluk.id_al(urun) for urun in secili_urunler]
+                id_oneriler = sepet_icin_oneriler(kurallar, secili_idler, min_confidence_oneri)
                 
-                for secili_urun in secili_urunler:
-                    uygun_kurallar = [k for k in kurallar 
-                                     if k['antecedent'] == secili_urun 
-                                     and k['confidence'] >= min_confidence_oneri
-                                     and k['consequent'] not in secili_urunler]
-                    
-                    for kural in uygun_kurallar:
-                        urun = kural['consequent']
-                        if urun not in tum_oneriler:
-                            tum_oneriler[urun] = {
-                                'max_confidence': kural['confidence'],
-                                'max_lift': kural['lift'],
-                                'kaynak_urunler': [secili_urun],
-                                'skor': kural['confidence'] * kural['lift']
-                            }
-                        else:
-                            # Birden fazla ürünle ilişkiliyse, en iyi skorları güncelle
-                            tum_oneriler[urun]['max_confidence'] = max(
-                                tum_oneriler[urun]['max_confidence'], 
-                                kural['confidence']
-                            )
-                            tum_oneriler[urun]['max_lift'] = max(
-                                tum_oneriler[urun]['max_lift'], 
-                                kural['lift']
-                            )
-                            tum_oneriler[urun]['kaynak_urunler'].append(secili_urun)
-                            tum_oneriler[urun]['skor'] += kural['confidence'] * kural['lift']
+                # Gösterim için ID'leri ürün isimlerine çevir
+                tum_oneriler = {
+                    sozluk.isim(urun_id): dict(bilgi, kaynak_urunler=list(sozluk.isimlere_cevir(bilgi['kaynak_urunler'])))
+                    for urun_id, bilgi in id_oneriler.items()
+                }
+                
+                kumeler, _ = urun_kumeleri_yukle(veri_parmak_izi, sepet_verisi)
                 
                 if tum_oneriler:
                     # Skora göre sırala
@@ -1330,6 +1377,7 @@ if veri is not None and sepetler is not None:
                                     <p><strong>Max Confidence:</strong> {bilgi['max_confidence']*100:.1f}%</p>
                                     <p><strong>Max Lift:</strong> {bilgi['max_lift']:.2f}</p>
                                     <p><strong>İlgili ürünler:</strong> {', '.join(bilgi['kaynak_urunler'][:3])}</p>
+                                    <p><strong>Ürün Kümesi:</strong> Küme {kumeler[sozluk.id_al(urun)] + 1}</p>
                                 </div>
                                 """, unsafe_allow_html=True)
                     
@@ -1373,6 +1421,15 @@ if veri is not None and sepetler is not None:
                         fig2.update_layout(height=400)
                         st.plotly_chart(fig2, use_container_width=True)
                     
+                    # Sepetteki ürünlerin kümelerinden henüz önerilmemiş popüler ürünler
+                    sepet_kumeleri = set(kumeler[secili_idler].tolist())
+                    onerilenler = set(secili_idler) | {sozluk.id_al(urun) for urun, _ in sorted_oneriler}
+                    ayni_kumeden = [urun_id for urun_id in np.argsort(-urun_id_sayilari, kind='stable').tolist()
+                                    if kumeler[urun_id] in sepet_kumeleri and urun_id not in onerilenler]
+                    if ayni_kumeden:
+                        st.subheader("🧩 Aynı Kümeden Diğer Ürünler")
+                        st.write(", ".join(sozluk.isimlere_cevir(ayni_kumeden[:oneri_sayisi])))
+                    
                     # İş stratejisi
                     st.markdown("---")
                     st.subheader("💼 Uygulanabilir İş Stratejileri")
@@ -0,0 +1,116 @@
+"""
+MERKEZİLİK
+Ürün ağındaki "hub" ürünleri bulmak için katalog ölçeğinde çalışan ölçütler.
+Hepsi seyrek komşuluk matrisi (ör. UrunAgi.komsuluk()) üzerinde çalışır:
+
+    agirlikli_derece : komşuluk ağırlıklarının toplamı (ör. birlikte alım sayısı)
+    pagerank         : seyrek kuvvet iterasyonu, iterasyon başına O(kenar)
+    arasindalik      : rastgele pivotlardan Brandes algoritması (yaklaşık);
+                       BFS seviyeleri pivot blokları için matris çarpımıyla ilerler
+
+Tam arasındalık (betweenness) O(n·kenar) sürer; pivot sayısı k ile maliyet
+O(k·kenar·çap) olur ve tahmin n/k ile ölçeklenir.
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+_PIVOT_BLOGU = 32        # Arasındalıkta aynı anda işlenen kaynak sayısı
+
+
+def agirlikli_derece(komsuluk):
+    """Her düğümün kenar ağırlıkları toplamı"""
+    return np.asarray(sparse.csr_matrix(komsuluk).sum(axis=1)).ravel()
+
+
+def pagerank(komsuluk, sonum=0.85, tolerans=1e-10, max_iterasyon=100):
+    """
+    Ağırlıklı PageRank (kenar ağırlığıyla orantılı rastgele yürüyüş)
+    Komşusu olmayan düğümlerin olasılığı tüm düğümlere eşit dağıtılır.
+    """
+    komsuluk = sparse.csr_matrix(komsuluk)
+    n = komsuluk.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    cikis = agirlikli_derece(komsuluk)
+    bos = cikis == 0
+    gecis = komsuluk.T.tocsr()
+
+    skor = np.full(n, 1.0 / n)
+    for _ in range(max_iterasyon):
+        dagitilan = np.divide(skor, cikis, out=np.zeros(n), where=~bos)
+        yeni = sonum * (gecis @ dagitilan + skor[bos].sum() / n) + (1 - sonum) / n
+        fark = np.abs(yeni - skor).sum()
+        skor = yeni
+        if fark < n * tolerans:
+            break
+    return skor / skor.sum()
+
+
+def arasindalik(komsuluk, pivot_sayisi=64, tohum=0):
+    """
+    Yaklaşık arasındalık merkeziliği (normalize, yönsüz, kenar sayısı ile en kısa yol)
+    pivot_sayisi kaynak rastgele seçilir; pivot_sayisi >= n ise sonuç kesindir.
+    Her pivot bloğu için BFS ileri adımda yol sayılarını (sigma), geri adımda
+    bağımlılıkları (delta) seviye seviye seyrek x yoğun çarpımla hesaplar.
+    """
+    komsuluk = sparse.csr_matrix(komsuluk)
+    n = komsuluk.shape[0]
+    if n < 3:
+        return np.zeros(n)
+    A = komsuluk.astype(bool).astype(np.float64)
+    rng = np.random.default_rng(tohum)
+    pivotlar = (np.arange(n) if pivot_sayisi >= n
+                else rng.choice(n, pivot_sayisi, replace=False))
+
+    skor = np.zeros(n)
+    for bas in range(0, len(pivotlar), _PIVOT_BLOGU):
+        kaynaklar = pivotlar[bas:bas + _PIVOT_BLOGU]
+        sutunlar = np.arange(len(kaynaklar))
+        seviye = np.full((n, len(kaynaklar)), -1, dtype=np.int64)
+        sigma = np.zeros((n, len(kaynaklar)))
+        seviye[kaynaklar, sutunlar] = 0
+        sigma[kaynaklar, sutunlar] = 1.0
+
+        # İleri adım: d. seviyedeki düğümlerin yol sayıları komşulara taşınır
+        sinir = sigma.copy()
+        derinlik = 0
+        while True:
+            yeni = A @ sinir
+            yeni[seviye >= 0] = 0.0
+            kesif = yeni > 0
+            if not kesif.any():
+                break
+            derinlik += 1
+            seviye[kesif] = derinlik
+            sigma[kesif] = yeni[kesif]
+            sinir = np.where(kesif, yeni, 0.0)
+
+        # Geri adım: delta_v = Σ_(w çocuk) sigma_v / sigma_w · (1 + delta_w)
+        delta = np.zeros_like(sigma)
+        for d in range(derinlik, 0, -1):
+            cocuk = np.where(seviye == d, (1 + delta) / np.maximum(sigma, 1.0), 0.0)
+            delta += np.where(seviye == d - 1, sigma * (A @ cocuk), 0.0)
+        delta[kaynaklar, sutunlar] = 0.0
+        skor += delta.sum(axis=1)
+
+    # Örneklem ölçeği ve yönsüz normalizasyon (networkx ile aynı ölçek)
+    return skor * (n / len(pivotlar)) / ((n - 1) * (n - 2))
+
+
+def merkezilik_olcutleri(ag, pivot_sayisi=64, tohum=0):
+    """
+    Ürün ağının tüm merkezilik ölçütleri; düğüm sırasıyla hizalı diziler
+        derece          : bağlantı sayısı / (n - 1)
+        agirlikli_derece: birlikte alım sayılarının toplamı
+        pagerank        : lift ağırlıklı PageRank
+        arasindalik     : yaklaşık arasındalık
+    """
+    n = ag.dugum_sayisi
+    return {
+        'derece': ag.dereceler() / max(n - 1, 1),
+        'agirlikli_derece': agirlikli_derece(ag.komsuluk('sayilar')),
+        'pagerank': pagerank(ag.komsuluk('lift')),
+        'arasindalik': arasindalik(ag.komsuluk(), pivot_sayisi, tohum),
+    }
@@ -0,0 +1,701 @@
+"""
+ÖĞE KÜMESİ MADENCİLİĞİ
+İkiden büyük sık öğe kümelerinin (3'lü kombinasyonlar ve üstü) ürün ID'leri
+üzerinde bulunması.
+
+    apriori   : adaylar alt kümelerin sık olma şartıyla (downward closure)
+                budanır, destekler bitset kesişimleriyle toplu sayılır
+    fpgrowth  : sepetler bir kez FP-ağacına sıkıştırılır, kümeler aday
+                üretmeden koşullu ağaçlardan çıkarılır (düşük destekler için)
+    eclat     : dikey gösterim; her ürünün sepet numarası listesi (tid-list)
+                kesiştirilerek derinlik öncelikli ilerlenir, kümeler yoğunlaşınca
+                fark listelerine (diffset) geçilir
+
+Tüm madenciler {(id1, id2, ...): {'sepet_sayisi', 'support'}} döndürür.
+
+Çıktı büyüdüğünde özet modlar (tid-list tabanlı, arama sırasında budanır):
+    kapali_kumeler   : kapalı kümeler (CHARM) - kayıpsız özet, her kümenin
+                       desteği kapalı üst kümelerinden geri çıkarılabilir
+    maksimal_kumeler : maksimal kümeler (GenMax benzeri) - sık üst kümesi
+                       olmayan kümeler, en kompakt özet
+
+Eşik tahmini yerine sonuç sayısı verilecekse:
+    en_sik_k_kume    : en sık k küme; iç destek eşiği arama sırasında yükselir
+
+Kurallar: kumelerden_kural_olustur sık kümelerden çok öncüllü X→Y kuralları üretir.
+
+Büyük verilerde son_madencilik (SON) sepetleri bölümlere ayırıp madencileri süreç
+havuzunda paralel çalıştırır; sonuç tek süreçteki ile aynıdır.
+"""
+
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, repeat
+
+import numpy as np
+
+from sepet_veri import SepetVerisi, UrunSozlugu
+from bitset_deposu import BitsetDeposu, bitset_hazirla
+from birliktelik_motoru import urun_frekanslari, eslesme_matrisi, matris_destek_filtrele
+
+
+def aday_uret(sik_kumeler):
+    """
+    k-1 boyutlu sık kümelerden k boyutlu adayları üretir (Apriori birleştirme + budama)
+    Aynı önekli iki küme birleştirilir; (k-1) alt kümelerinden biri bile sık
+    değilse aday atılır. Kümeler sıralı ID demetleri olmalıdır.
+    """
+    sik_kumeler = sorted(sik_kumeler)
+    sik_kume_seti = set(sik_kumeler)
+
+    # Son elemanı hariç aynı öneke sahip kümeleri grupla
+    gruplar = {}
+    for kume in sik_kumeler:
+        gruplar.setdefault(kume[:-1], []).append(kume[-1])
+
+    adaylar = []
+    for onek, sonlar in gruplar.items():
+        for i, son1 in enumerate(sonlar):
+            for son2 in sonlar[i + 1:]:
+                aday = onek + (son1, son2)
+                # Budama: son iki eleman dışındaki her elemanı çıkarınca kalan küme sık mı?
+                if all(aday[:j] + aday[j + 1:] in sik_kume_seti
+                       for j in range(len(aday) - 2)):
+                    adaylar.append(aday)
+    return adaylar
+
+
+def adaylari_say(bitset, adaylar, toplam_sepet, min_sepet_sayisi):
+    """
+    Adayların desteğini bitset kesişimleriyle sayar, eşiği geçenleri
+    {'sepet_sayisi', 'support'} formatında döndürür
+    """
+    if not adaylar:
+        return {}
+
+    sayilar = bitset.destek_sayilari(adaylar).tolist()
+    return {aday: {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+            for aday, sayi in zip(adaylar, sayilar) if sayi >= min_sepet_sayisi}
+
+
+def apriori(sepet_verisi, min_support=0.05, max_uzunluk=None):
+    """
+    Seviye seviye Apriori: her uzunluktaki sık öğe kümelerini bulur
+    Tekler ve çiftler doğrudan sayılır (bincount, Xᵀ·X); 3 ve üstü için her
+    seviyede adaylar bir önceki seviyeden üretilip bitset kesişimleriyle sayılır.
+    Sonuç: {(id1, id2, ...): {'sepet_sayisi', 'support'}} (tüm uzunluklar)
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+    max_uzunluk = max_uzunluk or len(sepet_verisi.sozluk)
+
+    sik_kumeler = {(urun_id,): {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+                   for urun_id, sayi in enumerate(urun_frekanslari(sepet_verisi).tolist())
+                   if sayi >= min_sepet_sayisi}
+    if max_uzunluk < 2:
+        return sik_kumeler
+
+    seviye = matris_destek_filtrele(eslesme_matrisi(sepet_verisi), toplam_sepet, min_support)
+    bitset = bitset_hazirla(sepet_verisi) if seviye and max_uzunluk > 2 else None
+
+    uzunluk = 2
+    while seviye:
+        sik_kumeler.update(seviye)
+        if uzunluk == max_uzunluk:
+            break
+        uzunluk += 1
+        seviye = adaylari_say(bitset, aday_uret(seviye), toplam_sepet, min_sepet_sayisi)
+
+    return sik_kumeler
+
+
+def uclu_kombinasyon_hesapla(sepet_verisi, min_support=0.03, algoritma='Apriori', mod='Tümü',
+                             paralel=False):
+    """
+    3'lü ürün kombinasyonlarını hesaplar
+    Her sepetin tüm üçlüleri gezilmez: Apriori'de sadece üç alt çifti de sık
+    olan üçlüler aday olur, FP-Growth'ta aday üretilmez.
+    mod 'Kapalı' veya 'Maksimal' ise sadece o özetteki üçlüler döner.
+    paralel: madenci tüm çekirdeklerde SON ile çalıştırılır ('Tümü' modunda)
+    """
+    if KUME_MODLARI[mod] is not None:
+        kumeler = KUME_MODLARI[mod](sepet_verisi, min_support)
+    elif paralel:
+        kumeler = son_madencilik(sepet_verisi, min_support, 3, algoritma)
+    else:
+        kumeler = MADENCILER[algoritma](sepet_verisi, min_support, 3)
+    return {kume: bilgi for kume, bilgi in kumeler.items() if len(kume) == 3}
+
+
+# ============ FP-GROWTH ============
+
+class _FPAgaci:
+    """
+    Ağırlıklı sepetlerden kurulan FP-ağacı
+    Düğümler paralel listelerde tutulur (0 numaralı düğüm köktür)
+    """
+
+    def __init__(self, sepetler, min_sepet_sayisi):
+        # Sık ürünler: sayıya göre azalan sırada (eşitlikte ID sırası)
+        sayilar = Counter()
+        for sepet, agirlik in sepetler:
+            for urun in sepet:
+                sayilar[urun] += agirlik
+        self.sayilar = {urun: sayi for urun, sayi in sayilar.items()
+                        if sayi >= min_sepet_sayisi}
+        sira = {urun: i for i, urun in enumerate(
+            sorted(self.sayilar, key=lambda u: (-self.sayilar[u], u)))}
+        self.sira = sira
+
+        self.ebeveyn = [-1]
+        self.urun = [-1]
+        self.sayi = [0]
+        self.cocuklar = [{}]
+        self.baslik = {urun: [] for urun in sira}   # Ürün -> düğüm listesi
+
+        for sepet, agirlik in sepetler:
+            dugum = 0
+            for urun in sorted((u for u in sepet if u in sira), key=sira.__getitem__):
+                cocuk = self.cocuklar[dugum].get(urun)
+                if cocuk is None:
+                    cocuk = len(self.urun)
+                    self.ebeveyn.append(dugum)
+                    self.urun.append(urun)
+                    self.sayi.append(0)
+                    self.cocuklar.append({})
+                    self.cocuklar[dugum][urun] = cocuk
+                    self.baslik[urun].append(cocuk)
+                self.sayi[cocuk] += agirlik
+                dugum = cocuk
+
+    def tek_yol(self):
+        """Ağaç tek bir yoldan oluşuyorsa [(ürün, sayı), ...], değilse None"""
+        yol = []
+        dugum = 0
+        while self.cocuklar[dugum]:
+            if len(self.cocuklar[dugum]) > 1:
+                return None
+            dugum = next(iter(self.cocuklar[dugum].values()))
+            yol.append((self.urun[dugum], self.sayi[dugum]))
+        return yol
+
+    def kosullu_taban(self, urun):
+        """Ürünün düğümlerinden köke giden önek yolları (koşullu örüntü tabanı)"""
+        taban = []
+        for dugum in self.baslik[urun]:
+            yol = []
+            ust = self.ebeveyn[dugum]
+            while ust > 0:
+                yol.append(self.urun[ust])
+                ust = self.ebeveyn[ust]
+            if yol:
+                taban.append((yol, self.sayi[dugum]))
+        return taban
+
+    def onceki_sayilari(self, urun):
+        """Ürünün düğümlerinin atalarındaki ürünlerin ağırlıklı sayıları"""
+        sayilar = Counter()
+        ebeveyn, urunler = self.ebeveyn, self.urun
+        for dugum in self.baslik[urun]:
+            agirlik = self.sayi[dugum]
+            ust = ebeveyn[dugum]
+            while ust > 0:
+                sayilar[urunler[ust]] += agirlik
+                ust = ebeveyn[ust]
+        return sayilar
+
+
+def _fp_madencilik(agac, sonek, min_sepet_sayisi, max_uzunluk, sonuc):
+    if len(sonek) >= max_uzunluk:
+        return
+
+    # Tek yollu ağaçta kümeler yolun kombinasyonlarıdır (özyinelemeye gerek yok)
+    yol = agac.tek_yol()
+    if yol is not None:
+        for uzunluk in range(1, min(len(yol), max_uzunluk - len(sonek)) + 1):
+            for secim in combinations(yol, uzunluk):
+                # Yol kökten aşağı indikçe sayılar azalır; en alttaki düğüm desteği verir
+                sonuc[tuple(sorted(sonek + tuple(u for u, _ in secim)))] = secim[-1][1]
+        return
+
+    # Ürünler en seyrekten başlayarak işlenir
+    for urun in sorted(agac.sira, key=agac.sira.__getitem__, reverse=True):
+        yeni_sonek = sonek + (urun,)
+        sonuc[tuple(sorted(yeni_sonek))] = agac.sayilar[urun]
+
+        if len(yeni_sonek) >= max_uzunluk:
+            continue
+
+        if len(yeni_sonek) + 1 == max_uzunluk:
+            # Son seviyede koşullu ağaç kurulmaz; öncül ürünleri saymak yeterli
+            for onceki, sayi in agac.onceki_sayilari(urun).items():
+                if sayi >= min_sepet_sayisi:
+                    sonuc[tuple(sorted(yeni_sonek + (onceki,)))] = sayi
+            continue
+
+        taban = agac.kosullu_taban(urun)
+        if not taban:
+            continue
+        kosullu = _FPAgaci(taban, min_sepet_sayisi)
+        if kosullu.sira:
+            _fp_madencilik(kosullu, yeni_sonek, min_sepet_sayisi, max_uzunluk, sonuc)
+
+
+def fpgrowth(sepet_verisi, min_support=0.05, max_uzunluk=None):
+    """
+    FP-Growth: sepetler tek geçişte FP-ağacına sıkıştırılır, sık kümeler aday
+    üretmeden koşullu ağaçlardan özyinelemeli olarak çıkarılır.
+    Düşük desteklerde (%0.5-1) Apriori'nin aday patlamasını yaşamaz.
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+    max_uzunluk = max_uzunluk or len(sepet_verisi.sozluk)
+
+    # Aynı sepetler tek kayıt olarak ağırlıkla eklenir
+    sepetler = Counter(tuple(sepet) for sepet in sepet_verisi.sepet_idleri() if sepet)
+    agac = _FPAgaci(sepetler.items(), min_sepet_sayisi)
+
+    sayilar = {}
+    _fp_madencilik(agac, (), min_sepet_sayisi, max_uzunluk, sayilar)
+    return {kume: {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+            for kume, sayi in sayilar.items()}
+
+
+# ============ ECLAT / dECLAT ============
+
+def tid_listeleri(sepet_verisi):
+    """Her ürün için onu içeren sepet numaralarının sıralı dizisi (dikey gösterim)"""
+    sira = np.argsort(sepet_verisi.indices, kind='stable')
+    sepetler = np.repeat(np.arange(sepet_verisi.sepet_sayisi, dtype=np.int32),
+                         sepet_verisi.sepet_boyutlari())[sira]
+    sinirlar = np.cumsum(np.bincount(sepet_verisi.indices,
+                                     minlength=len(sepet_verisi.sozluk)))[:-1]
+    return np.split(sepetler, sinirlar)
+
+
+def _eclat_madencilik(sinif, onek, diffset_modu, min_sepet_sayisi, max_uzunluk, sonuc):
+    # sinif: aynı öneki paylaşan [(ürün, tid-list veya diffset, destek), ...]
+    # Diffset modunda küme, önekin sepetlerinden bu ürünü içermeyenlerdir
+    for i, (urun, kume, destek) in enumerate(sinif):
+        yeni_onek = onek + (urun,)
+        sonuc[tuple(sorted(yeni_onek))] = destek
+        if len(yeni_onek) >= max_uzunluk:
+            continue
+
+        alt_sinif = []
+        for diger, diger_kume, _ in sinif[i + 1:]:
+            if diffset_modu:
+                fark = np.setdiff1d(diger_kume, kume, assume_unique=True)
+                alt_sinif.append((diger, fark, destek - len(fark)))
+            else:
+                kesisim = np.intersect1d(kume, diger_kume, assume_unique=True)
+                alt_sinif.append((diger, kesisim, len(kesisim)))
+        alt_sinif = [uye for uye in alt_sinif if uye[2] >= min_sepet_sayisi]
+        if not alt_sinif:
+            continue
+
+        # Kesişimler önekin yarısından büyükse fark listeleri daha küçüktür: diffset'e geç
+        alt_mod = diffset_modu
+        if not diffset_modu and sum(alt_destek for *_, alt_destek in alt_sinif) \
+                > len(alt_sinif) * destek / 2:
+            alt_sinif = [(diger, np.setdiff1d(kume, kesisim, assume_unique=True), alt_destek)
+                         for diger, kesisim, alt_destek in alt_sinif]
+            alt_mod = True
+
+        _eclat_madencilik(alt_sinif, yeni_onek, alt_mod, min_sepet_sayisi, max_uzunluk, sonuc)
+
+
+def eclat(sepet_verisi, min_support=0.05, max_uzunluk=None):
+    """
+    Eclat (dEclat): ürün başına tid-list tutan dikey madencilik
+    Kümeler derinlik öncelikli, tid-list kesişimleriyle büyütülür; yoğun
+    sınıflarda daha küçük olan fark listeleriyle (diffset) devam edilir.
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+    max_uzunluk = max_uzunluk or len(sepet_verisi.sozluk)
+
+    # Sık ürünler artan destek sırasıyla (küçük sınıflar önce daralır)
+    sinif = [(urun_id, tidler, len(tidler))
+             for urun_id, tidler in enumerate(tid_listeleri(sepet_verisi))
+             if len(tidler) >= min_sepet_sayisi]
+    sinif.sort(key=lambda uye: (uye[2], uye[0]))
+
+    sayilar = {}
+    _eclat_madencilik(sinif, (), False, min_sepet_sayisi, max_uzunluk, sayilar)
+    return {kume: {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+            for kume, sayi in sayilar.items()}
+
+
+# Arayüzlerde seçilebilen madenciler
+MADENCILER = {
+    'Apriori': apriori,
+    'FP-Growth': fpgrowth,
+    'Eclat': eclat,
+}
+
+
+# ============ KAPALI VE MAKSİMAL KÜMELER ============
+
+def _sik_tid_listeleri(sepet_verisi, min_sepet_sayisi):
+    """Sık ürünlerin (ID, tid-list) çiftleri, artan destek sırasıyla"""
+    uyeler = [(urun_id, tidler)
+              for urun_id, tidler in enumerate(tid_listeleri(sepet_verisi))
+              if len(tidler) >= min_sepet_sayisi]
+    uyeler.sort(key=lambda uye: (len(uye[1]), uye[0]))
+    return uyeler
+
+
+def _kume_sonucu(kumeler, toplam_sepet):
+    return {tuple(sorted(kume)): {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+            for kume, sayi in kumeler}
+
+
+def _charm(sinif, min_sepet_sayisi, kapalilar, indeks):
+    # sinif: [(öğe kümesi, tid-list), ...]; eşit/alt küme tid-list'li üyeler birleştirilir
+    sinif = list(sinif)
+    for i in range(len(sinif)):
+        if sinif[i] is None:
+            continue
+        kume, tidler = sinif[i]
+        alt_sinif = []
+        for j in range(i + 1, len(sinif)):
+            if sinif[j] is None:
+                continue
+            diger, diger_tidler = sinif[j]
+            kesisim = np.intersect1d(tidler, diger_tidler, assume_unique=True)
+            if len(kesisim) < min_sepet_sayisi:
+                continue
+
+            if len(kesisim) == len(tidler):
+                # t(X) ⊆ t(Y): Y, X'in geçtiği her sepette var, X'e katılır
+                kume = kume | diger
+                if len(kesisim) == len(diger_tidler):
+                    sinif[j] = None          # t(X) = t(Y): Y ayrıca aranmaz
+            elif len(kesisim) == len(diger_tidler):
+                # t(Y) ⊂ t(X): Y'nin dalı X ∪ Y altında aranır
+                sinif[j] = None
+                alt_sinif.append((diger, kesisim))
+            else:
+                alt_sinif.append((diger, kesisim))
+
+        # Alt sınıf üyeleri, döngüde büyüyen X ile birleştirilir
+        if alt_sinif:
+            _charm([(kume | diger, kesisim) for diger, kesisim in alt_sinif],
+                   min_sepet_sayisi, kapalilar, indeks)
+
+        # Aynı desteğe ve aynı sepetlere sahip bir üst küme zaten bulunduysa X kapalı değil
+        anahtar = (len(tidler), int(tidler.sum()))
+        adaylar = indeks.setdefault(anahtar, [])
+        if not any(kume <= kapali for kapali in adaylar):
+            adaylar.append(kume)
+            kapalilar.append((kume, len(tidler)))
+
+
+def kapali_kumeler(sepet_verisi, min_support=0.05):
+    """
+    Kapalı sık kümeler (CHARM): aynı desteğe sahip hiçbir üst kümesi olmayan kümeler
+    Her sık kümenin desteği, onu içeren kapalı kümelerin en büyük desteğidir (kayıpsız).
+    Aynı sepetlerde geçen ürünler arama sırasında tek düğümde birleştirilir.
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+
+    sinif = [(frozenset([urun_id]), tidler)
+             for urun_id, tidler in _sik_tid_listeleri(sepet_verisi, min_sepet_sayisi)]
+    kapalilar = []
+    _charm(sinif, min_sepet_sayisi, kapalilar, {})
+    return _kume_sonucu(kapalilar, toplam_sepet)
+
+
+class _MaksimalKayit:
+    """
+    Bulunan maksimal kümeler (bit maskesi olarak) ve kapsama testi
+    Her ürün için o ürünü içeren maksimal kümeler ayrıca indekslenir
+    """
+
+    def __init__(self):
+        self.kumeler = []
+        self._indeks = {}
+
+    def ekle(self, maske, sayi):
+        self.kumeler.append((maske, sayi))
+        kalan = maske
+        while kalan:
+            bit = kalan & -kalan
+            self._indeks.setdefault(bit, []).append(maske)
+            kalan ^= bit
+
+    def kapsaniyor(self, maske):
+        """maske bulunmuş bir maksimal kümenin alt kümesi mi? (a & m == a)"""
+        if not maske:
+            return bool(self.kumeler)
+        # Sadece maskenin en seyrek ürününü içeren kümelere bakmak yeterli
+        adaylar = min((self._indeks.get(1 << urun_id, ())
+                       for urun_id in range(maske.bit_length()) if maske >> urun_id & 1),
+                      key=len)
+        return any(maske & m == maske for m in adaylar)
+
+
+def _maksimal_ara(onek, onek_destek, sinif, min_sepet_sayisi, maksimaller):
+    # onek ve sinif üyeleri ürün bit maskesi (int) olarak tutulur
+    kapsaniyor = maksimaller.kapsaniyor
+
+    # Önek + sınıfın tamamı zaten bulunan bir maksimal kümenin alt kümesiyse dal budanır
+    tum_maske = onek
+    for bit, _ in sinif:
+        tum_maske |= bit
+    if kapsaniyor(tum_maske):
+        return
+
+    # HUT: önek + sınıfın tamamı sıksa tek maksimal aday odur, alt dallar aranmaz
+    if len(sinif) > 1:
+        ortak = sinif[0][1]
+        for _, tidler in sinif[1:]:
+            ortak = np.intersect1d(ortak, tidler, assume_unique=True)
+            if len(ortak) < min_sepet_sayisi:
+                break
+        else:
+            maksimaller.ekle(tum_maske, len(ortak))
+            return
+
+    if not sinif:
+        if onek and not kapsaniyor(onek):
+            maksimaller.ekle(onek, onek_destek)
+        return
+
+    for i, (bit, tidler) in enumerate(sinif):
+        yeni_onek = onek | bit
+        alt_sinif = []
+        for diger_bit, diger_tidler in sinif[i + 1:]:
+            kesisim = np.intersect1d(tidler, diger_tidler, assume_unique=True)
+            if len(kesisim) == len(tidler):
+                # Önek eşdeğerliği: ürün öneki içeren her sepette var, doğrudan öneke eklenir
+                yeni_onek |= diger_bit
+            elif len(kesisim) >= min_sepet_sayisi:
+                alt_sinif.append((diger_bit, kesisim))
+        _maksimal_ara(yeni_onek, len(tidler), alt_sinif, min_sepet_sayisi, maksimaller)
+
+
+def maksimal_kumeler(sepet_verisi, min_support=0.05):
+    """
+    Maksimal sık kümeler: hiçbir sık üst kümesi olmayan kümeler (en kompakt özet)
+    Derinlik öncelikli arama; önek eşdeğerliği, HUT (önek + kalan ürünlerin
+    tamamı sık mı?) ve bulunmuş maksimal kümelerle kapsama testi dalları budar.
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+
+    sinif = [(1 << urun_id, tidler)
+             for urun_id, tidler in _sik_tid_listeleri(sepet_verisi, min_sepet_sayisi)]
+    maksimaller = _MaksimalKayit()
+    _maksimal_ara(0, toplam_sepet, sinif, min_sepet_sayisi, maksimaller)
+
+    kumeler = [([urun_id for urun_id in range(maske.bit_length()) if maske >> urun_id & 1],
+                sayi) for maske, sayi in maksimaller.kumeler]
+    return _kume_sonucu(kumeler, toplam_sepet)
+
+
+# Özet modları: tümü, kapalı veya maksimal kümeler
+KUME_MODLARI = {
+    'Tümü': None,
+    'Kapalı': kapali_kumeler,
+    'Maksimal': maksimal_kumeler,
+}
+
+
+# ============ EN SIK K KÜME (TOP-K) ============
+
+def en_sik_k_kume(sepet_verisi, k=20, min_uzunluk=2, max_uzunluk=None):
+    """
+    Destek eşiği vermeden en sık k öğe kümesi (uzunluğu min_uzunluk..max_uzunluk)
+    En iyi önce arama: kümeler destek sırasıyla kuyruktan çıkar ve sadece kendinden
+    sonra gelen (daha seyrek) ürünlerle genişletilir. Üretilen adaylar arasındaki
+    k'inci en büyük destek iç eşiktir; eşik iyi kümeler bulundukça yükselir ve
+    altındaki dallar hiç açılmaz, yani süre min_support yerine k'ye bağlıdır.
+    Sonuç destek sırasıyla {(id1, id2, ...): {'sepet_sayisi', 'support'}}
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    max_uzunluk = max_uzunluk or len(sepet_verisi.sozluk)
+
+    # Ürünler azalan destek sırasıyla; genişletme sadece sonraki ürünlerle yapılır
+    tidler = tid_listeleri(sepet_verisi)
+    sira = sorted(range(len(tidler)), key=lambda urun_id: (-len(tidler[urun_id]), urun_id))
+    sira = [urun_id for urun_id in sira if len(tidler[urun_id])]
+
+    en_iyiler = []   # Uzunluğu yeterli adayların en büyük k desteği (min-heap)
+    esik = 1
+
+    def aday_ekle(uzunluk, sayi):
+        nonlocal esik
+        if uzunluk < min_uzunluk:
+            return
+        heapq.heappush(en_iyiler, sayi)
+        if len(en_iyiler) > k:
+            heapq.heappop(en_iyiler)
+        if len(en_iyiler) == k:
+            esik = en_iyiler[0]
+
+    # Kuyruk: (-destek, uzunluk, sıra indeksleri, tid-list); eşit destekte kısa küme önce
+    kuyruk = []
+    for konum, urun_id in enumerate(sira):
+        sayi = len(tidler[urun_id])
+        kuyruk.append((-sayi, 1, (konum,), tidler[urun_id]))
+        aday_ekle(1, sayi)
+    heapq.heapify(kuyruk)
+
+    sonuc = {}
+    while kuyruk and len(sonuc) < k:
+        eksi_sayi, uzunluk, konumlar, kume_tidleri = heapq.heappop(kuyruk)
+        sayi = -eksi_sayi
+        if sayi < esik:
+            break   # Kalan her küme ve alt dalları eşiğin altında
+
+        if uzunluk >= min_uzunluk:
+            kume = tuple(sorted(sira[konum] for konum in konumlar))
+            sonuc[kume] = {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+        if uzunluk == max_uzunluk:
+            continue
+
+        for konum in range(konumlar[-1] + 1, len(sira)):
+            diger_tidler = tidler[sira[konum]]
+            if len(diger_tidler) < esik:
+                break   # Sonraki ürünler daha seyrek; hiçbiri eşiği geçemez
+            kesisim = np.intersect1d(kume_tidleri, diger_tidler, assume_unique=True)
+            if len(kesisim) >= esik:
+                aday_ekle(uzunluk + 1, len(kesisim))
+                heapq.heappush(kuyruk, (-len(kesisim), uzunluk + 1,
+                                        konumlar + (konum,), kesisim))
+
+    return sonuc
+
+
+# ============ KÜMELERDEN KURALLAR (X→Y, |X| ≥ 1) ============
+
+def kumelerden_kural_olustur(sik_kumeler, toplam_sepet, min_confidence=0.3):
+    """
+    Her uzunluktaki sık kümelerden X→Y kuralları üretir ({Milk, Bread} → Butter gibi)
+    sik_kumeler alt kümeleriyle birlikte olmalıdır (apriori/fpgrowth/eclat çıktısı);
+    öncül ve sonuç destekleri yeniden sayılmaz, bu sözlükten okunur.
+    Aynı küme için sonuç büyüdükçe güven düşer: güveni geçemeyen bir sonucun
+    üst kümeleri aday yapılmaz (sonuçlar aday_uret ile seviye seviye büyür).
+    Öncül ve sonuç ID demetleridir; güvene göre sıralı liste döner.
+    """
+    destekler = {kume: bilgi['sepet_sayisi'] for kume, bilgi in sik_kumeler.items()}
+    kurallar = []
+
+    for kume, bilgi in sik_kumeler.items():
+        if len(kume) < 2:
+            continue
+        sayi = bilgi['sepet_sayisi']
+
+        sonuclar = [(urun_id,) for urun_id in kume]
+        while sonuclar:
+            gecenler = []
+            for sonuc in sonuclar:
+                oncul = tuple(urun_id for urun_id in kume if urun_id not in sonuc)
+                confidence = sayi / destekler[oncul]
+                if confidence < min_confidence:
+                    continue
+                gecenler.append(sonuc)
+                kurallar.append({
+                    'antecedent': oncul,
+                    'consequent': sonuc,
+                    'support': bilgi['support'],
+                    'confidence': confidence,
+                    'lift': confidence / (destekler[sonuc] / toplam_sepet)
+                })
+
+            # Öncülde en az bir ürün kalmalı
+            if not gecenler or len(gecenler[0]) + 1 >= len(kume):
+                break
+            sonuclar = aday_uret(gecenler)
+
+    return sorted(kurallar, key=lambda x: x['confidence'], reverse=True)
+
+
+def kume_kurallari(sepet_verisi, min_support=0.05, min_confidence=0.3, max_uzunluk=None,
+                   algoritma='Apriori'):
+    """
+    Sık kümeleri seçilen algoritmayla bulup kumelerden_kural_olustur ile kurala çevirir
+    """
+    sik_kumeler = MADENCILER[algoritma](sepet_verisi, min_support, max_uzunluk)
+    return kumelerden_kural_olustur(sik_kumeler, sepet_verisi.sepet_sayisi, min_confidence)
+
+
+# ============ PARALEL (SON) MADENCİLİK ============
+
+MIN_BOLUM_SEPET = 20_000   # Bundan küçük bölümlerde süreç başlatma maliyeti kazancı aşar
+
+
+def sepet_bolumleri(sepet_verisi, bolum_sayisi):
+    """Sepetleri ardışık bölümlere ayırır: her bölüm için (indptr, indices) CSR dilimi"""
+    indptr, indices = sepet_verisi.indptr, sepet_verisi.indices
+    sinirlar = np.linspace(0, sepet_verisi.sepet_sayisi, bolum_sayisi + 1).astype(np.int64)
+    return [(indptr[bas:son + 1] - indptr[bas], indices[indptr[bas]:indptr[son]])
+            for bas, son in zip(sinirlar[:-1], sinirlar[1:])]
+
+
+def _yerel_sik_kumeler(bolum, urunler, min_support, max_uzunluk, algoritma):
+    # 1. geçiş (işçi süreç): bölümün kendi içindeki sık kümeleri aynı oranla bulunur
+    indptr, indices = bolum
+    yerel = SepetVerisi(None, UrunSozlugu(urunler), None, indptr, indices)
+    return list(MADENCILER[algoritma](yerel, min_support, max_uzunluk))
+
+
+def _yerel_destekler(bolum, urunler, adaylar):
+    # 2. geçiş (işçi süreç): tüm adayların bu bölümdeki sepet sayıları
+    indptr, indices = bolum
+    bitset = BitsetDeposu.csr_den(indptr, indices, urunler)
+    return {uzunluk: bitset.destek_sayilari(dizi) for uzunluk, dizi in adaylar.items()}
+
+
+def son_madencilik(sepet_verisi, min_support=0.05, max_uzunluk=None, algoritma='Apriori',
+                   is_sayisi=None, bolum_sayisi=None):
+    """
+    SON algoritması: sepetler bölümlere ayrılıp süreç havuzunda paralel madenlenir
+    Genel olarak sık olan her küme en az bir bölümde aynı oranla sıktır; bu yüzden
+    bölümlerin yerel sık kümelerinin birleşimi eksiksiz bir aday kümesidir. İkinci
+    geçişte adaylar yine paralel olarak her bölümde bitset ile sayılıp toplanır;
+    sonuç seçilen madencinin tek süreçteki sonucuyla aynıdır.
+    is_sayisi: işçi süreç sayısı (varsayılan tüm çekirdekler)
+    bolum_sayisi: varsayılan işçi sayısı, ama bölüm başına en az MIN_BOLUM_SEPET sepet
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+    is_sayisi = is_sayisi or os.cpu_count() or 1
+    if bolum_sayisi is None:
+        bolum_sayisi = min(is_sayisi, max(toplam_sepet // MIN_BOLUM_SEPET, 1))
+    if bolum_sayisi <= 1:
+        return MADENCILER[algoritma](sepet_verisi, min_support, max_uzunluk)
+
+    bolumler = sepet_bolumleri(sepet_verisi, bolum_sayisi)
+    urunler = sepet_verisi.urunler
+    with ProcessPoolExecutor(max_workers=min(is_sayisi, bolum_sayisi)) as havuz:
+        adaylar = set()
+        for yerel_kumeler in havuz.map(_yerel_sik_kumeler, bolumler, repeat(urunler),
+                                       repeat(min_support), repeat(max_uzunluk),
+                                       repeat(algoritma)):
+            adaylar.update(yerel_kumeler)
+
+        # Adaylar uzunluklarına göre dizilere toplanır (bitset toplu sayımı için)
+        gruplar = {}
+        for aday in sorted(adaylar):
+            gruplar.setdefault(len(aday), []).append(aday)
+        gruplar = {uzunluk: np.array(liste, dtype=np.int64) for uzunluk, liste in gruplar.items()}
+
+        toplamlar = {uzunluk: np.zeros(len(dizi), dtype=np.int64)
+                     for uzunluk, dizi in gruplar.items()}
+        for yerel_sayilar in havuz.map(_yerel_destekler, bolumler, repeat(urunler),
+                                       repeat(gruplar)):
+            for uzunluk, sayilar in yerel_sayilar.items():
+                toplamlar[uzunluk] += sayilar
+
+    sik_kumeler = {}
+    for uzunluk in sorted(gruplar):
+        for aday, sayi in zip(gruplar[uzunluk].tolist(), toplamlar[uzunluk].tolist()):
+            if sayi >= min_sepet_sayisi:
+                sik_kumeler[tuple(aday)] = {'sepet_sayisi': sayi, 'support': sayi / toplam_sepet}
+    return sik_kumeler
@@ -0,0 +1,139 @@
+"""
+ÖRNEKLEMLİ ÖN İZLEME
+Sık kümelerin rastgele bir sepet örnekleminde, düşürülmüş eşikle (Toivonen)
+bulunması. Tam veride dakikalar süren madencilik örneklemde saniyenin altında
+biter; her destek bir güven aralığıyla raporlanır.
+
+İsteğe bağlı doğrulama tam veride tek geçiştir: örneklemde sık çıkan kümeler ve
+negatif sınırları (kendisi sık olmayan ama tüm alt kümeleri sık olan kümeler)
+bitset ile sayılır. Sınırdaki hiçbir küme tam veride sık değilse sonuç kesindir.
+"""
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from sepet_veri import sepetleri_sec
+from bitset_deposu import bitset_hazirla
+from birliktelik_motoru import urun_frekanslari
+from oge_madenciligi import MADENCILER, aday_uret
+
+
+ORNEK_BOYUTU = 20_000   # Varsayılan örneklem (sepet sayısı)
+
+
+def esik_payi(ornek_boyutu, hata_olasiligi=0.05):
+    """
+    Hoeffding sınırı: örneklem desteğinin gerçek destekten bu kadar aşağı düşme
+    olasılığı en fazla hata_olasiligi'dır; eşik bu pay kadar düşürülür
+    """
+    return math.sqrt(math.log(1 / hata_olasiligi) / (2 * ornek_boyutu))
+
+
+def guven_araligi(ornek_sayilari, ornek_boyutu, toplam_sepet, guven=0.95):
+    """
+    Örneklem oranları için normal yaklaşımlı güven aralıkları (alt, üst dizileri)
+    Sonlu evren düzeltmesi kullanılır: örneklem tüm veri ise aralık sıfır genişliktedir
+    """
+    oran = np.asarray(ornek_sayilari) / ornek_boyutu
+    z = NormalDist().inv_cdf(0.5 + guven / 2)
+    duzeltme = (toplam_sepet - ornek_boyutu) / max(toplam_sepet - 1, 1)
+    pay = z * np.sqrt(oran * (1 - oran) / ornek_boyutu * duzeltme)
+    return np.clip(oran - pay, 0, 1), np.clip(oran + pay, 0, 1)
+
+
+def negatif_sinir(sik_kumeler, urun_sayisi, max_uzunluk=None):
+    """
+    Kendisi sık olmayan ama bütün alt kümeleri sık olan kümeler
+    Sınır tam veride de sık değilse, örneklemin kaçırdığı sık küme yoktur
+    """
+    seviyeler = {}
+    for kume in sik_kumeler:
+        seviyeler.setdefault(len(kume), []).append(kume)
+
+    sinir = [(urun_id,) for urun_id in range(urun_sayisi) if (urun_id,) not in sik_kumeler]
+    uzunluk = 2
+    while seviyeler.get(uzunluk - 1) and (max_uzunluk is None or uzunluk <= max_uzunluk):
+        sinir.extend(aday for aday in aday_uret(seviyeler[uzunluk - 1])
+                     if aday not in sik_kumeler)
+        uzunluk += 1
+    return sinir
+
+
+def _tam_destekler(sepet_verisi, kumeler):
+    """Kümelerin tam verideki sepet sayıları (tekler bincount, diğerleri bitset)"""
+    sayilar = {}
+    frekanslar = urun_frekanslari(sepet_verisi)
+    gruplar = {}
+    for kume in kumeler:
+        if len(kume) == 1:
+            sayilar[kume] = int(frekanslar[kume[0]])
+        else:
+            gruplar.setdefault(len(kume), []).append(kume)
+
+    if gruplar:
+        bitset = bitset_hazirla(sepet_verisi)
+        for grup in gruplar.values():
+            sayilar.update(zip(grup, bitset.destek_sayilari(grup).tolist()))
+    return sayilar
+
+
+def ornek_madencilik(sepet_verisi, min_support=0.05, max_uzunluk=None, algoritma='Apriori',
+                     ornek_boyutu=ORNEK_BOYUTU, guven=0.95, dogrula=False, tohum=0):
+    """
+    Rastgele sepet örnekleminde sık kümeleri bulur (hızlı ön izleme)
+    Örneklemde eşik esik_payi kadar düşürülür ki gerçekte sık olan kümeler
+    yüksek olasılıkla kaçmasın; örneklem desteği min_support'u geçenler döner.
+    Her kümede 'support' tahmini, 'sepet_sayisi' tüm veriye ölçeklenmiş tahmin
+    ve 'guven_araligi' (alt, üst) bulunur.
+    dogrula=True: tam veride tek geçişle sayılır; negatif sınır temizse sonuç
+    kesindir, değilse seçilen madenci tam veride çalıştırılır.
+    Dönüş: (sik_kumeler, ozet) - ozet örneklem boyutu, eşik ve doğrulama bilgisidir
+    """
+    toplam_sepet = sepet_verisi.sepet_sayisi
+    ornek_boyutu = min(ornek_boyutu, toplam_sepet)
+    ozet = {'ornek_boyutu': ornek_boyutu, 'dusuk_esik': min_support,
+            'dogrulandi': None, 'sinir_ihlali': 0}
+
+    # Örneklem tüm veriyse eşik düşürülmez, sonuç zaten kesindir
+    if ornek_boyutu < toplam_sepet:
+        secim = np.sort(np.random.default_rng(tohum).choice(toplam_sepet, ornek_boyutu,
+                                                              replace=False))
+        ornek = sepetleri_sec(sepet_verisi, secim)
+        ozet['dusuk_esik'] = max(min_support - esik_payi(ornek_boyutu, 1 - guven),
+                                 min_support / 2)
+    else:
+        ornek = sepet_verisi
+    adaylar = MADENCILER[algoritma](ornek, ozet['dusuk_esik'], max_uzunluk)
+
+    if dogrula:
+        min_sepet_sayisi = max(int(min_support * toplam_sepet), 1)
+        sinir = negatif_sinir(adaylar, len(sepet_verisi.sozluk), max_uzunluk)
+        sayilar = _tam_destekler(sepet_verisi, list(adaylar) + sinir)
+        ozet['sinir_ihlali'] = sum(sayilar[kume] >= min_sepet_sayisi for kume in sinir)
+        ozet['dogrulandi'] = ozet['sinir_ihlali'] == 0
+
+        if ozet['dogrulandi']:
+            sik_kumeler = {kume: {'sepet_sayisi': sayilar[kume],
+                                  'support': sayilar[kume] / toplam_sepet}
+                           for kume in adaylar if sayilar[kume] >= min_sepet_sayisi}
+        else:
+            # Örneklem bazı sık kümeleri kaçırdı: tam veride kesin sonuç üretilir
+            sik_kumeler = MADENCILER[algoritma](sepet_verisi, min_support, max_uzunluk)
+        for bilgi in sik_kumeler.values():
+            bilgi['guven_araligi'] = (bilgi['support'], bilgi['support'])
+        return sik_kumeler, ozet
+
+    ornek_min_sayi = max(int(min_support * ornek_boyutu), 1)
+    kumeler = [kume for kume, bilgi in adaylar.items() if bilgi['sepet_sayisi'] >= ornek_min_sayi]
+    ornek_sayilari = np.array([adaylar[kume]['sepet_sayisi'] for kume in kumeler])
+    alt, ust = guven_araligi(ornek_sayilari, ornek_boyutu, toplam_sepet, guven)
+
+    sik_kumeler = {}
+    for kume, sayi, alt_sinir, ust_sinir in zip(kumeler, ornek_sayilari.tolist(),
+                                                alt.tolist(), ust.tolist()):
+        oran = sayi / ornek_boyutu
+        sik_kumeler[kume] = {'sepet_sayisi': round(oran * toplam_sepet), 'support': oran,
+                             'guven_araligi': (alt_sinir, ust_sinir)}
+    return sik_kumeler, ozet
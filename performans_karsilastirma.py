@@ -0,0 +1,110 @@
+"""
+PERFORMANS KARŞILAŞTIRMASI
+Çift/üçlü fonksiyonları ile Apriori, FP-Growth ve Eclat madencilerinin sürelerini
+farklı destek değerlerinde karşılaştırır. SON sütunu Apriori'nin tüm çekirdeklere
+bölünmüş halidir. mlxtend kuruluysa onun fpgrowth'u da ölçülür.
+
+Kullanım:
+    python performans_karsilastirma.py [data/basket_analysis.csv]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from sepet_veri import SepetVerisi, UrunSozlugu, csr_olustur
+from bitset_deposu import sepet_verisi_yukle
+from birliktelik_motoru import birliktelik_hesapla
+from oge_madenciligi import uclu_kombinasyon_hesapla, apriori, fpgrowth, eclat, son_madencilik
+
+try:
+    import pandas as pd
+    from mlxtend.frequent_patterns import fpgrowth as mlxtend_fpgrowth
+except ImportError:
+    mlxtend_fpgrowth = None
+
+
+DESTEKLER = [0.05, 0.02, 0.01, 0.005]
+
+
+def sure_olc(fonksiyon, tekrar=3):
+    """Fonksiyonu birkaç kez çalıştırıp en iyi süreyi (saniye) ve sonucu döndürür"""
+    en_iyi, sonuc = float('inf'), None
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        sonuc = fonksiyon()
+        en_iyi = min(en_iyi, time.perf_counter() - baslangic)
+    return en_iyi, sonuc
+
+
+def sentetik_veri(sepet_sayisi=10_000, urun_sayisi=100, tohum=0):
+    """
+    Ürün popülerliği çarpık (az sayıda çok satan, çok sayıda az satan ürün)
+    rastgele sepet verisi; perakende sepetlerine benzer
+    """
+    rng = np.random.default_rng(tohum)
+    olasiliklar = 0.6 / np.arange(1, urun_sayisi + 1) ** 0.7
+    matris = rng.random((sepet_sayisi, urun_sayisi)) < olasiliklar
+    matris = matris[matris.any(axis=1)]
+    indptr, indices = csr_olustur(matris)
+    urunler = [f"Ürün {i}" for i in range(urun_sayisi)]
+    return SepetVerisi(None, UrunSozlugu(urunler), matris, indptr, indices)
+
+
+def karsilastir(isim, sepet_verisi, destekler=DESTEKLER, max_uzunluk=None):
+    print(f"\n📊 {isim}: {sepet_verisi.sepet_sayisi} sepet, {len(sepet_verisi.sozluk)} ürün, "
+          f"ortalama {sepet_verisi.sepet_boyutlari().mean():.1f} ürün/sepet")
+    print("-" * 110)
+    print(f"{'Support':<9} {'Çiftler':>9} {'3lü Apr.':>9} {'3lü FP':>9} {'Apriori':>9} "
+          f"{'FP-Growth':>10} {'Eclat':>9} {'SON':>9} {'mlxtend':>9} {'Küme sayısı':>12}")
+    print("-" * 110)
+
+    if mlxtend_fpgrowth is not None:
+        onehot = pd.DataFrame(sepet_verisi.matris if sepet_verisi.matris is not None
+                              else _matris(sepet_verisi), columns=sepet_verisi.urunler)
+
+    for destek in destekler:
+        cift_suresi, _ = sure_olc(lambda: birliktelik_hesapla(sepet_verisi, destek))
+        uclu_apr, _ = sure_olc(lambda: uclu_kombinasyon_hesapla(sepet_verisi, destek))
+        uclu_fp, _ = sure_olc(lambda: uclu_kombinasyon_hesapla(sepet_verisi, destek,
+                                                               'FP-Growth'))
+        apr_suresi, kumeler = sure_olc(lambda: apriori(sepet_verisi, destek, max_uzunluk), 1)
+        fp_suresi, fp_kumeler = sure_olc(lambda: fpgrowth(sepet_verisi, destek, max_uzunluk), 1)
+        eclat_suresi, eclat_kumeler = sure_olc(lambda: eclat(sepet_verisi, destek,
+                                                            max_uzunluk), 1)
+        son_suresi, son_kumeler = sure_olc(lambda: son_madencilik(
+            sepet_verisi, destek, max_uzunluk, bolum_sayisi=os.cpu_count()), 1)
+        assert kumeler == fp_kumeler == eclat_kumeler == son_kumeler, \
+            "Madenciler farklı sonuç verdi!"
+
+        mlxtend_suresi = '-'
+        if mlxtend_fpgrowth is not None:
+            sure, _ = sure_olc(lambda: mlxtend_fpgrowth(onehot, min_support=destek,
+                                                        max_len=max_uzunluk), 1)
+            mlxtend_suresi = f"{sure:.3f}"
+
+        print(f"{destek:<9.3f} {cift_suresi:>9.3f} {uclu_apr:>9.3f} {uclu_fp:>9.3f} "
+              f"{apr_suresi:>9.3f} {fp_suresi:>10.3f} {eclat_suresi:>9.3f} {son_suresi:>9.3f} "
+              f"{mlxtend_suresi:>9} {len(kumeler):>12}")
+
+
+def _matris(sepet_verisi):
+    matris = np.zeros((sepet_verisi.sepet_sayisi, len(sepet_verisi.sozluk)), dtype=bool)
+    satirlar = np.repeat(np.arange(sepet_verisi.sepet_sayisi), sepet_verisi.sepet_boyutlari())
+    matris[satirlar, sepet_verisi.indices] = True
+    return matris
+
+
+def main():
+    print("⏱️  PERFORMANS KARŞILAŞTIRMASI (süreler saniye)")
+    print("=" * 110)
+
+    csv_yolu = sys.argv[1] if len(sys.argv) > 1 else 'data/basket_analysis.csv'
+    karsilastir(csv_yolu, sepet_verisi_yukle(csv_yolu))
+    karsilastir("Sentetik perakende verisi", sentetik_veri())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+SEPET VERİSİ
+One-hot ve uzun formatlı (işlem, ürün) sepet dosyalarını hızlıca yüklemek için
+ortak yardımcılar. basit_market_analizi.py ve iki Streamlit uygulaması bu
+modülü kullanır.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+def dosya_ozeti(dosya_yolu, blok_boyutu=1 << 20):
+    """Dosya içeriğinin BLAKE2b özeti (önbellek geçerliliği için)"""
+    ozet = hashlib.blake2b(digest_size=16)
+    with open(dosya_yolu, 'rb') as dosya:
+        for blok in iter(lambda: dosya.read(blok_boyutu), b''):
+            ozet.update(blok)
+    return ozet.hexdigest()
+
+
+def kaynak_parmak_izi(dosya_yolu):
+    """Kaynak dosyanın boyut, mtime ve içerik özetinden oluşan parmak izi"""
+    durum = os.stat(dosya_yolu)
+    return {'boyut': durum.st_size, 'mtime_ns': durum.st_mtime_ns,
+            'ozet': dosya_ozeti(dosya_yolu)}
+
+
+def parmak_izi_uyuyor(kayitli, dosya_yolu):
+    """
+    Önbelleğe yazılmış parmak izi kaynak dosyayla hâlâ uyuşuyor mu?
+    Boyut farklıysa geçersizdir; mtime aynıysa özet hesaplanmaz. Sadece mtime
+    değiştiyse (dosyaya dokunulmuş) içerik özeti karşılaştırılır.
+    """
+    if not kayitli:
+        return False
+    durum = os.stat(dosya_yolu)
+    if kayitli.get('boyut') != durum.st_size:
+        return False
+    if kayitli.get('mtime_ns') == durum.st_mtime_ns:
+        return True
+    return kayitli.get('ozet') == dosya_ozeti(dosya_yolu)
+
+
+def onehot_matrise_cevir(veri):
+    """
+    DataFrame'deki True/False hücrelerini tek seferde boolean matrise çevirir
+    """
+    degerler = veri.to_numpy()
+    if degerler.dtype == bool:
+        return degerler
+
+    # Karışık tipli sütunlar: hem True hem de 'True' kabul edilir
+    return (degerler == True) | (degerler == 'True')
+
+
+def csr_olustur(matris):
+    """
+    Boolean matristen CSR (indptr, indices) sepet gösterimi üretir
+    indptr[i]:indptr[i+1] aralığı i. sepetin ürün indekslerini verir
+    """
+    satirlar, sutunlar = np.nonzero(matris)
+    sepet_boyutlari = np.bincount(satirlar, minlength=matris.shape[0])
+
+    indptr = np.zeros(matris.shape[0] + 1, dtype=np.int64)
+    np.cumsum(sepet_boyutlari, out=indptr[1:])
+    return indptr, sutunlar.astype(np.int32)
+
+
+class UrunSozlugu:
+    """
+    Ürün isimlerini yoğun int32 ID'lere eşler (0, 1, 2, ...)
+    Analizler ID'lerle çalışır, isimlere sadece gösterimde dönülür
+    """
+
+    def __init__(self, isimler=()):
+        self.isimler = []
+        self._idler = {}
+        for isim in isimler:
+            self.ekle(isim)
+
+    def __len__(self):
+        return len(self.isimler)
+
+    def __contains__(self, isim):
+        return isim in self._idler
+
+    def ekle(self, isim):
+        """Ürünü sözlüğe ekler (varsa mevcut ID'sini) döndürür"""
+        urun_id = self._idler.get(isim)
+        if urun_id is None:
+            urun_id = len(self.isimler)
+            self._idler[isim] = urun_id
+            self.isimler.append(isim)
+        return urun_id
+
+    def id_al(self, isim):
+        """Ürün isminin ID'sini döndürür, bilinmeyen ürün için KeyError"""
+        return self._idler[isim]
+
+    def isim(self, urun_id):
+        return self.isimler[urun_id]
+
+    def isimlere_cevir(self, urun_idleri):
+        return tuple(self.isimler[urun_id] for urun_id in urun_idleri)
+
+
+class SepetVerisi:
+    """
+    Bir sepet veri setinin matris ve CSR gösterimini birlikte tutar
+    indices dizisi ürün ID'lerini her sepet içinde artan sırada saklar
+    """
+
+    def __init__(self, veri, sozluk, matris, indptr, indices, bitset=None, veri_kurucu=None):
+        self._veri = veri           # Ham DataFrame (görüntüleme için)
+        self._veri_kurucu = veri_kurucu  # veri yoksa ilk erişimde ham veriyi kuran fonksiyon
+        self.sozluk = sozluk        # Ürün ismi <-> ID eşlemesi
+        self.matris = matris        # (sepet x ürün) boolean matris, seyrek veride None
+        self.indptr = indptr        # CSR satır başlangıçları
+        self.indices = indices      # CSR ürün ID'leri (int32)
+        self.bitset = bitset        # İsteğe bağlı BitsetDeposu (destek sayımı için)
+        self._parmak_izi = None
+
+    @property
+    def veri(self):
+        """Ham veri; kurucu fonksiyon verildiyse sadece ilk erişimde kurulur"""
+        if self._veri is None and self._veri_kurucu is not None:
+            self._veri = self._veri_kurucu()
+            self._veri_kurucu = None
+        return self._veri
+
+    @property
+    def urunler(self):
+        return self.sozluk.isimler
+
+    @property
+    def sepet_sayisi(self):
+        return len(self.indptr) - 1
+
+    def parmak_izi(self):
+        """
+        Sepet içeriğinin özeti (sonuç önbelleği anahtarı için)
+        Aynı sepetler ve ürün isimleri, hangi dosyadan yüklenirse yüklensin aynı özeti verir
+        """
+        if self._parmak_izi is None:
+            ozet = hashlib.blake2b(digest_size=16)
+            ozet.update(json.dumps(self.urunler, ensure_ascii=False).encode('utf-8'))
+            ozet.update(np.ascontiguousarray(self.indptr, dtype=np.int64).tobytes())
+            ozet.update(np.ascontiguousarray(self.indices, dtype=np.int32).tobytes())
+            self._parmak_izi = ozet.hexdigest()
+        return self._parmak_izi
+
+    def sepet_boyutlari(self):
+        """Her sepetteki ürün sayısını dizi olarak döndürür"""
+        return np.diff(self.indptr)
+
+    def sepet_idleri(self):
+        """Her sepeti ürün ID listesi olarak sırayla üretir"""
+        idler = self.indices.tolist()
+        sinirlar = self.indptr.tolist()
+        for bas, son in zip(sinirlar[:-1], sinirlar[1:]):
+            yield idler[bas:son]
+
+    def sepet_listesi(self):
+        """
+        CSR gösterimini eski kodun beklediği ürün ismi listelerine çevirir
+        """
+        isimler = np.asarray(self.urunler, dtype=object)[self.indices].tolist()
+        sinirlar = self.indptr.tolist()
+        return [isimler[bas:son] for bas, son in zip(sinirlar[:-1], sinirlar[1:])]
+
+
+def onehot_yukle(dosya_yolu):
+    """
+    One-hot CSV dosyasını okur ve tek vektörel geçişte SepetVerisi oluşturur
+    """
+    veri = pd.read_csv(dosya_yolu, index_col=0)
+    matris = onehot_matrise_cevir(veri)
+
+    # Boş sepetleri ekleme
+    matris = matris[matris.any(axis=1)]
+
+    indptr, indices = csr_olustur(matris)
+    return SepetVerisi(veri, UrunSozlugu(veri.columns), matris, indptr, indices)
+
+
+def onehot_parcalari(dosya_yolu, parca_boyutu=100_000):
+    """
+    One-hot CSV dosyasını sabit boyutlu parçalar halinde okur
+    Her parça için ham veri tutmayan bir SepetVerisi üretir; ürün sözlüğü ortaktır
+    """
+    sozluk = None
+    for parca in pd.read_csv(dosya_yolu, index_col=0, chunksize=parca_boyutu):
+        if sozluk is None:
+            sozluk = UrunSozlugu(parca.columns)
+
+        matris = onehot_matrise_cevir(parca)
+        matris = matris[matris.any(axis=1)]
+        indptr, indices = csr_olustur(matris)
+        yield SepetVerisi(None, sozluk, matris, indptr, indices)
+
+
+def kodlardan_csr(islem_kodlari, urun_kodlari, sepet_sayisi, urun_sayisi):
+    """
+    (sepet kodu, ürün ID) satırlarından CSR üretir
+    Aynı sepette tekrarlanan ürünler teke indirilir, ID'ler sepet içinde sıralanır
+    """
+    kodlar = np.unique(np.asarray(islem_kodlari, dtype=np.int64) * urun_sayisi
+                       + np.asarray(urun_kodlari, dtype=np.int64))
+    sepet_kodlari = kodlar // urun_sayisi
+    indices = (kodlar % urun_sayisi).astype(np.int32)
+
+    indptr = np.zeros(sepet_sayisi + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sepet_kodlari, minlength=sepet_sayisi), out=indptr[1:])
+    return indptr, indices
+
+
+def uzun_format_yukle(dosya_yolu, islem_sutunu='transaction_id', urun_sutunu='product'):
+    """
+    Uzun formatlı satış kayıtlarını (her satır bir işlem-ürün çifti) okur
+    Binlerce ürünlük kataloglarda geniş True/False tablosu kurulmaz; satırlar
+    doğrudan seyrek CSR sepetlere gruplanır. CSV ve Parquet desteklenir.
+    """
+    sutunlar = [islem_sutunu, urun_sutunu]
+    if str(dosya_yolu).endswith(('.parquet', '.pq')):
+        veri = pd.read_parquet(dosya_yolu, columns=sutunlar)
+    else:
+        veri = pd.read_csv(dosya_yolu, usecols=sutunlar)
+    veri = veri.dropna()
+
+    # İşlemler ilk görülme sırasıyla, ürünler alfabetik sırayla ID alır
+    islem_kodlari, islemler = pd.factorize(veri[islem_sutunu])
+    urun_kodlari, urunler = pd.factorize(veri[urun_sutunu], sort=True)
+
+    indptr, indices = kodlardan_csr(islem_kodlari, urun_kodlari,
+                                    len(islemler), len(urunler))
+    return SepetVerisi(veri, UrunSozlugu(urunler.astype(str)), None, indptr, indices)
+
+
+def listelerden_sepet_verisi(sepetler, sozluk):
+    """
+    Ürün ismi listelerinden (ör. günlük yeni sepetler) SepetVerisi kurar
+    Yeni ürünler verilen sözlüğe eklenir, böylece ID'ler mevcut veriyle uyumlu kalır
+    """
+    sepetler = [sepet for sepet in sepetler if sepet]  # Boş sepetleri ekleme
+    islem_kodlari = np.repeat(np.arange(len(sepetler)), [len(sepet) for sepet in sepetler])
+    urun_kodlari = np.array([sozluk.ekle(urun) for sepet in sepetler for urun in sepet],
+                            dtype=np.int64)
+
+    indptr, indices = kodlardan_csr(islem_kodlari, urun_kodlari,
+                                    len(sepetler), max(len(sozluk), 1))
+    return SepetVerisi(None, sozluk, None, indptr, indices)
+
+
+def sozluge_esle(sepet_verisi, sozluk):
+    """
+    Başka bir sözlükle kurulmuş SepetVerisi'nin ürün ID'lerini verilen sözlüğe çevirir
+    """
+    if sepet_verisi.sozluk is sozluk:
+        return sepet_verisi
+
+    eslem = np.array([sozluk.ekle(urun) for urun in sepet_verisi.urunler], dtype=np.int64)
+    islem_kodlari = np.repeat(np.arange(sepet_verisi.sepet_sayisi),
+                              sepet_verisi.sepet_boyutlari())
+    indptr, indices = kodlardan_csr(islem_kodlari, eslem[sepet_verisi.indices],
+                                    sepet_verisi.sepet_sayisi, max(len(sozluk), 1))
+    return SepetVerisi(None, sozluk, None, indptr, indices)
+
+
+def sepetleri_sec(sepet_verisi, sepet_numaralari):
+    """
+    Verilen sıra numaralı sepetlerden (ör. rastgele örneklem) yeni bir SepetVerisi kurar
+    Sözlük paylaşılır; ürün ID'leri değişmez
+    """
+    sepet_numaralari = np.asarray(sepet_numaralari, dtype=np.int64)
+    boyutlar = sepet_verisi.sepet_boyutlari()[sepet_numaralari]
+    indptr = np.zeros(len(sepet_numaralari) + 1, dtype=np.int64)
+    np.cumsum(boyutlar, out=indptr[1:])
+
+    # Her seçilen sepetin ürünleri orijinal indices dizisindeki yerinden okunur
+    kaynak = (np.repeat(sepet_verisi.indptr[sepet_numaralari] - indptr[:-1], boyutlar)
+              + np.arange(indptr[-1]))
+    matris = sepet_verisi.matris[sepet_numaralari] if sepet_verisi.matris is not None else None
+    return SepetVerisi(None, sepet_verisi.sozluk, matris, indptr, sepet_verisi.indices[kaynak])
@@ -0,0 +1,126 @@
+"""
+SONUÇ ÖNBELLEĞİ
+Birliktelik, kural ve kombinasyon hesaplarının sonuçlarını diske yazar; böylece
+aynı veri ve aynı parametrelerle tekrar hesap yapılmaz. Önbellek süreçler ve
+yeniden başlatmalar arasında ortaktır (konsol uygulaması ve iki Streamlit
+uygulaması aynı klasörü kullanır).
+
+Anahtar: (veri parmak izi, fonksiyon adı, parametreler)
+Her sonuç ayrı bir pickle dosyasıdır. Okunan dosyanın mtime'ı yenilenir; toplam
+boyut sınırı aşılınca en uzun süredir kullanılmayanlar silinir (LRU).
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+
+ONBELLEK_DIZINI = os.path.join('data', '.sonuc_onbellegi')
+MAX_BOYUT = 256 * 1024 * 1024   # 256 MB
+_SURUM = 1                      # Sonuç formatı değişirse eski dosyalar kullanılmaz
+_UZANTI = '.pkl'
+
+
+class SonucOnbellegi:
+    """
+    Diskte tutulan, boyut sınırlı (LRU) sonuç önbelleği
+    """
+
+    def __init__(self, dizin=ONBELLEK_DIZINI, max_boyut=MAX_BOYUT):
+        self.dizin = dizin
+        self.max_boyut = max_boyut
+
+    def anahtar(self, veri_parmak_izi, fonksiyon_adi, parametreler):
+        """Anahtar bileşenlerinden dosya adı olarak kullanılacak özeti üretir"""
+        metin = json.dumps([_SURUM, veri_parmak_izi, fonksiyon_adi, parametreler],
+                           sort_keys=True, default=str)
+        return hashlib.blake2b(metin.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _yol(self, anahtar):
+        return os.path.join(self.dizin, anahtar + _UZANTI)
+
+    def getir(self, anahtar):
+        """
+        (bulundu, değer) döndürür; bozuk veya eksik dosya bulunamadı sayılır
+        """
+        yol = self._yol(anahtar)
+        try:
+            with open(yol, 'rb') as dosya:
+                deger = pickle.load(dosya)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+        # LRU için son kullanım zamanını güncelle
+        try:
+            os.utime(yol)
+        except OSError:
+            pass
+        return True, deger
+
+    def kaydet(self, anahtar, deger):
+        """Sonucu diske yazar, sonra boyut sınırını uygular"""
+        try:
+            os.makedirs(self.dizin, exist_ok=True)
+            # Yarım kalmış dosya bırakmamak için önce geçici dosyaya yaz
+            gecici_yol = f"{self._yol(anahtar)}.{os.getpid()}.tmp"
+            with open(gecici_yol, 'wb') as dosya:
+                pickle.dump(deger, dosya, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici_yol, self._yol(anahtar))
+        except OSError:
+            return  # Klasör yazılamıyorsa önbelleksiz devam edilir
+        self.temizle()
+
+    def temizle(self):
+        """Toplam boyut sınırı aşıldıysa en eski kullanılan dosyaları siler"""
+        dosyalar = []
+        for isim in os.listdir(self.dizin):
+            if not isim.endswith(_UZANTI):
+                continue
+            try:
+                durum = os.stat(os.path.join(self.dizin, isim))
+            except FileNotFoundError:
+                continue  # Başka bir süreç silmiş olabilir
+            dosyalar.append((durum.st_mtime_ns, durum.st_size, isim))
+
+        toplam = sum(boyut for _, boyut, _ in dosyalar)
+        for _, boyut, isim in sorted(dosyalar):
+            if toplam <= self.max_boyut:
+                break
+            try:
+                os.remove(os.path.join(self.dizin, isim))
+            except FileNotFoundError:
+                pass
+            toplam -= boyut
+
+    def hesapla(self, veri_parmak_izi, fonksiyon_adi, parametreler, hesaplayici):
+        """
+        Sonuç önbellekte varsa döndürür, yoksa hesaplayici() ile hesaplayıp yazar
+        parametreler: sonucu belirleyen JSON'a çevrilebilir değerler (dict)
+        """
+        anahtar = self.anahtar(veri_parmak_izi, fonksiyon_adi, parametreler)
+        bulundu, deger = self.getir(anahtar)
+        if not bulundu:
+            deger = hesaplayici()
+            self.kaydet(anahtar, deger)
+        return deger
+
+
+# Konsol uygulaması ve Streamlit uygulamalarının paylaştığı önbellek
+ortak_onbellek = SonucOnbellegi()
+
+
+def onbellekli(veri_parmak_izi, fonksiyon, *args, **parametreler):
+    """
+    fonksiyon(*args, **parametreler) sonucunu ortak disk önbelleğinden getirir
+    args veriyi taşır (anahtara girmez, veri_parmak_izi ile temsil edilir);
+    anahtar isimli parametrelerden oluşur.
+
+    Örnek:
+        onbellekli(sepet_verisi.parmak_izi(), birliktelik_hesapla,
+                   sepet_verisi, min_support=0.05)
+    """
+    return ortak_onbellek.hesapla(
+        veri_parmak_izi, f"{fonksiyon.__module__}.{fonksiyon.__qualname__}", parametreler,
+        lambda: fonksiyon(*args, **parametreler)
+    )
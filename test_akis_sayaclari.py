@@ -0,0 +1,121 @@
+"""
+Akış sayaçlarının hata sınırlarını kaba kuvvet çift sayımıyla kontrol eder:
+Count-Min asla eksik, Misra-Gries asla fazla saymaz; tam sayım modu ve yeterli
+kapasiteli özet tam sayımla birebir aynıdır.
+
+    python -m pytest -q
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import akis_sayaclari
+from akis_sayaclari import (
+    AkisCiftSayaci, CountMinSketch, MisraGries, cift_anahtarlari, anahtardan_cift
+)
+from basit_market_analizi import BasitMarketAnalizi
+from sepet_veri import sepetleri_sec
+from test_oge_madenciligi import TOHUMLAR, MIN_SUPPORT, rastgele_sepetler
+
+
+def cift_sayilari(sepet_verisi):
+    """Her sepetin tüm çiftleri tek tek sayılır"""
+    return Counter(cift for sepet in sepet_verisi.sepet_idleri()
+                   for cift in combinations(sorted(sepet), 2))
+
+
+def parcalar(sepet_verisi, parca_boyutu):
+    for bas in range(0, sepet_verisi.sepet_sayisi, parca_boyutu):
+        yield sepetleri_sec(sepet_verisi,
+                            np.arange(bas, min(bas + parca_boyutu, sepet_verisi.sepet_sayisi)))
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_cift_anahtarlari(tohum, monkeypatch):
+    # Küçük blok sınırı sepetlerin bloklara bölünmesini de sınar
+    monkeypatch.setattr(akis_sayaclari, '_BLOK_CIFT', 25)
+    sepet_verisi = rastgele_sepetler(tohum)
+    anahtarlar = np.concatenate(list(cift_anahtarlari(sepet_verisi)))
+    assert Counter(map(anahtardan_cift, anahtarlar)) == cift_sayilari(sepet_verisi)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_count_min_asla_eksik_saymaz(tohum):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200, urun_sayisi=12)
+    gercek = cift_sayilari(sepet_verisi)
+    sketch = CountMinSketch(8, 2, tohum)   # Bilerek dar: çakışmalar olur
+    for anahtarlar in cift_anahtarlari(sepet_verisi):
+        tekil, sayilar = np.unique(anahtarlar, return_counts=True)
+        sketch.ekle(tekil, sayilar)
+
+    anahtarlar = [(urun1 << akis_sayaclari._ANAHTAR_KAYDIRMA) | urun2 for urun1, urun2 in gercek]
+    tahmin = sketch.tahmin(anahtarlar)
+    assert sketch.toplam == sum(gercek.values())
+    assert all(tahmin >= np.array(list(gercek.values())))
+    assert all(tahmin <= sketch.toplam)
+
+
+@pytest.mark.parametrize('kapasite', [3, 10, 30])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_misra_gries_sinirlari(tohum, kapasite):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200, urun_sayisi=12)
+    gercek = cift_sayilari(sepet_verisi)
+    ozet = MisraGries(kapasite)
+    for parca in parcalar(sepet_verisi, 17):
+        for anahtarlar in cift_anahtarlari(parca):
+            tekil, sayilar = np.unique(anahtarlar, return_counts=True)
+            ozet.ekle(tekil, sayilar)
+
+    tablo = dict(zip(map(anahtardan_cift, ozet.anahtarlar), ozet.sayilar.tolist()))
+    assert len(tablo) <= kapasite
+    assert ozet.azaltma <= sum(gercek.values()) / (kapasite + 1)
+    for cift, sayi in gercek.items():
+        assert tablo.get(cift, 0) <= sayi <= tablo.get(cift, 0) + ozet.azaltma
+
+
+@pytest.mark.parametrize('kapasite', [5, 20, 1000])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_akis_sayaci_araliklari(tohum, kapasite):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200, urun_sayisi=12)
+    gercek = cift_sayilari(sepet_verisi)
+    sayac = AkisCiftSayaci(epsilon=0.05, kapasite=kapasite, tohum=tohum)
+    for parca in parcalar(sepet_verisi, 17):
+        sayac.guncelle(parca)
+    assert sayac.toplam_sepet == sepet_verisi.sepet_sayisi
+
+    for (urun1, urun2), sayi in gercek.items():
+        alt, ust = sayac.tahmin(urun1, urun2)
+        assert alt <= sayi <= ust
+
+    kesin, olasi = sayac.destekli_ciftler(MIN_SUPPORT)
+    min_sepet_sayisi = max(int(MIN_SUPPORT * sepet_verisi.sepet_sayisi), 1)
+    sik = {cift for cift, sayi in gercek.items() if sayi >= min_sepet_sayisi}
+    assert set(kesin) <= sik
+    if sayac.eksiksiz_mi(MIN_SUPPORT):
+        assert sik <= set(kesin) | set(olasi)
+
+    # Tablo bütün çiftleri tutabiliyorsa özet tam sayımdır
+    if kapasite >= len(gercek):
+        assert sayac.sik_ciftler.azaltma == 0
+        assert {cift: bilgi['sepet_sayisi'] for cift, bilgi in kesin.items()} == \
+            {cift: gercek[cift] for cift in sik}
+        assert not olasi
+
+
+def test_tam_akis_modu_tam_sayimla_ayni(tmp_path):
+    sepet_verisi = rastgele_sepetler(0, sepet_sayisi=200, urun_sayisi=12)
+    matris = np.zeros((sepet_verisi.sepet_sayisi, len(sepet_verisi.sozluk)), dtype=bool)
+    for satir, sepet in enumerate(sepet_verisi.sepet_idleri()):
+        matris[satir, list(sepet)] = True
+    csv_yolu = tmp_path / 'sepetler.csv'
+    pd.DataFrame(matris, columns=sepet_verisi.urunler).to_csv(csv_yolu)
+
+    analiz = BasitMarketAnalizi()
+    analiz.akisla_yukle(csv_yolu, parca_boyutu=17)
+    assert analiz.toplam_sepet == sepet_verisi.sepet_sayisi
+    assert dict(analiz.cift_sayilari) == dict(cift_sayilari(sepet_verisi))
+    assert analiz.urun_sayilari.tolist() == matris.sum(axis=0).tolist()
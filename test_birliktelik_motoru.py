@@ -0,0 +1,66 @@
+"""
+Negatif birlikteliklerin vektörel istatistiklerini kaba kuvvet sayımı ve
+scipy.stats'in 2x2 tablo testleriyle karşılaştırır.
+
+    python -m pytest -q
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from sepet_veri import UrunSozlugu, listelerden_sepet_verisi
+from birliktelik_motoru import negatif_birliktelikler
+from test_oge_madenciligi import TOHUMLAR
+
+
+def zit_sepetler(tohum, sepet_sayisi=300, urun_sayisi=8):
+    """Bazı ürünlerin birbirinin yerine alındığı (birlikte az görülen) sepetler"""
+    rng = np.random.default_rng(tohum)
+    olasiliklar = rng.uniform(0.2, 0.6, urun_sayisi)
+    sepetler = []
+    for _ in range(sepet_sayisi):
+        secim = rng.random(urun_sayisi) < olasiliklar
+        # Çift numaralı ürün alındıysa yanındaki tek numaralı ürün çoğunlukla alınmaz
+        secim[1::2] &= ~(secim[0::2] & (rng.random(urun_sayisi // 2) < 0.8))
+        sepetler.append([f"u{urun}" for urun in np.flatnonzero(secim)])
+    return listelerden_sepet_verisi(sepetler, UrunSozlugu())
+
+
+@pytest.mark.parametrize('max_lift', [0.8, 1.0])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_negatif_birliktelikler_scipy_ile_ayni(tohum, max_lift):
+    sepet_verisi = zit_sepetler(tohum)
+    toplam = sepet_verisi.sepet_sayisi
+    sepetler = [set(sepet) for sepet in sepet_verisi.sepet_idleri()]
+    urun_sayisi = len(sepet_verisi.sozluk)
+
+    beklenen = {}
+    for urun1, urun2 in combinations(range(urun_sayisi), 2):
+        a = sum(urun1 in sepet and urun2 in sepet for sepet in sepetler)
+        f1 = sum(urun1 in sepet for sepet in sepetler)
+        f2 = sum(urun2 in sepet for sepet in sepetler)
+        if a < 5 or a / (f1 * f2 / toplam) >= max_lift:
+            continue
+        tablo = [[a, f1 - a], [f2 - a, toplam - f1 - f2 + a]]
+        beklenen[(urun1, urun2)] = (
+            a, f1 * f2 / toplam,
+            stats.chi2_contingency(tablo, correction=False)[0],
+            stats.fisher_exact(tablo, alternative='less')[1]
+        )
+
+    sonuc = negatif_birliktelikler(sepet_verisi, max_lift=max_lift, min_sepet_sayisi=5)
+    assert {(cift['urun1'], cift['urun2']) for cift in sonuc} == set(beklenen)
+    assert beklenen
+    for cift in sonuc:
+        a, bek, ki_kare, p_degeri = beklenen[(cift['urun1'], cift['urun2'])]
+        assert cift['gercek_sayi'] == a
+        assert cift['beklenen_sayi'] == pytest.approx(bek)
+        assert cift['lift'] == pytest.approx(a / bek)
+        assert cift['ki_kare'] == pytest.approx(ki_kare)
+        assert cift['p_degeri'] == pytest.approx(p_degeri, rel=1e-6)
+
+    farklar = [cift['fark'] for cift in sonuc]
+    assert farklar == sorted(farklar, reverse=True)
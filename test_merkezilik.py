@@ -0,0 +1,99 @@
+"""
+Merkezilik ölçütlerini networkx ve elle hesaplanabilen küçük graflarla
+karşılaştırır.
+
+    python -m pytest -q
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy import sparse
+
+from birliktelik_motoru import eslesme_matrisi
+from merkezilik import agirlikli_derece, pagerank, arasindalik, merkezilik_olcutleri
+from urun_agi import agi_kur
+from test_oge_madenciligi import TOHUMLAR, rastgele_sepetler
+
+
+def rastgele_graf(tohum, n=45, olasilik=0.08):
+    """Ağırlıklı, birden çok bileşenli ve yalnız düğümlü seyrek graf"""
+    rng = np.random.default_rng(tohum)
+    kenar = np.triu(rng.random((n, n)) < olasilik, k=1)
+    kenar[:, -3:] = kenar[-3:, :] = False   # Son üç düğüm yalnız
+    agirlik = np.where(kenar, rng.uniform(0.5, 3, (n, n)), 0.0)
+    return sparse.csr_matrix(agirlik + agirlik.T)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_pagerank_networkx_ile_ayni(tohum):
+    komsuluk = rastgele_graf(tohum)
+    G = nx.from_scipy_sparse_array(komsuluk)
+    beklenen = nx.pagerank(G, alpha=0.85, weight='weight', tol=1e-12, max_iter=1000)
+    skor = pagerank(komsuluk, sonum=0.85, tolerans=1e-12, max_iterasyon=1000)
+    assert skor == pytest.approx([beklenen[i] for i in range(komsuluk.shape[0])], abs=1e-8)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_kesin_arasindalik_networkx_ile_ayni(tohum):
+    # 45 düğüm birden fazla pivot bloğuna bölünür
+    komsuluk = rastgele_graf(tohum)
+    G = nx.from_scipy_sparse_array(komsuluk)
+    beklenen = nx.betweenness_centrality(G, normalized=True)
+    skor = arasindalik(komsuluk, pivot_sayisi=komsuluk.shape[0])
+    assert skor == pytest.approx([beklenen[i] for i in range(komsuluk.shape[0])], abs=1e-12)
+
+
+def test_elle_hesaplanan_graflar():
+    # Yıldız: merkez tüm yaprak çiftlerinin arasında, yapraklar hiçbir yolun üstünde değil
+    yildiz = nx.to_scipy_sparse_array(nx.star_graph(4))
+    assert arasindalik(yildiz, pivot_sayisi=10).tolist() == [1.0, 0.0, 0.0, 0.0, 0.0]
+    skor = pagerank(yildiz)
+    assert skor.sum() == pytest.approx(1.0)
+    assert skor[1:] == pytest.approx([skor[1]] * 4)
+    assert skor[0] > skor[1]
+
+    # Yol 0-1-2-3: 1, (0,2) ve (0,3) yollarında; normalize ölçek (n-1)(n-2)/2 = 3 çift
+    yol = nx.to_scipy_sparse_array(nx.path_graph(4))
+    assert arasindalik(yol, pivot_sayisi=4) == pytest.approx([0.0, 2 / 3, 2 / 3, 0.0])
+
+    # Kare 0-1-2-3-0: karşılıklı köşeler arasında iki en kısa yol, her ara düğüme yarım
+    kare = nx.to_scipy_sparse_array(nx.cycle_graph(4))
+    assert arasindalik(kare, pivot_sayisi=4) == pytest.approx([1 / 6] * 4)
+    assert pagerank(kare) == pytest.approx([0.25] * 4)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_merkezilik_olcutleri(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    ag = agi_kur(eslesme_matrisi(sepet_verisi), sepet_verisi.sepet_sayisi,
+                 min_support=0.05, min_lift=1.0)
+    G = nx.Graph()
+    G.add_nodes_from(range(ag.dugum_sayisi))
+    G.add_weighted_edges_from(zip(ag.kaynak.tolist(), ag.hedef.tolist(), ag.sayilar.tolist()))
+
+    olcutler = merkezilik_olcutleri(ag, pivot_sayisi=ag.dugum_sayisi)
+    sira = range(ag.dugum_sayisi)
+    derece = nx.degree_centrality(G)
+    agirlikli = dict(G.degree(weight='weight'))
+    arasi = nx.betweenness_centrality(G)
+    assert olcutler['derece'] == pytest.approx([derece[i] for i in sira])
+    assert olcutler['agirlikli_derece'] == pytest.approx([agirlikli[i] for i in sira])
+    assert olcutler['arasindalik'] == pytest.approx([arasi[i] for i in sira], abs=1e-12)
+    assert olcutler['pagerank'].sum() == pytest.approx(1.0)
+    assert agirlikli_derece(ag.komsuluk('sayilar')) == pytest.approx(olcutler['agirlikli_derece'])
+
+
+@pytest.mark.parametrize('pivot_sayisi', [5, 20, 40])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_yaklasik_arasindalik_secilen_pivotlarla_ayni(tohum, pivot_sayisi):
+    # Tahmin, seçilen pivotlardan çıkan yolların kesin katkısının n/k ile ölçeklenmiş halidir
+    komsuluk = rastgele_graf(tohum)
+    n = komsuluk.shape[0]
+    pivotlar = np.random.default_rng(tohum).choice(n, pivot_sayisi, replace=False)
+    G = nx.from_scipy_sparse_array(komsuluk)
+    katki = nx.betweenness_centrality_subset(G, pivotlar.tolist(), list(G), normalized=False)
+
+    # networkx yönsüz grafta alt küme katkısını ikiye böler
+    beklenen = [2 * katki[i] * (n / pivot_sayisi) / ((n - 1) * (n - 2)) for i in range(n)]
+    assert arasindalik(komsuluk, pivot_sayisi, tohum) == pytest.approx(beklenen, abs=1e-12)
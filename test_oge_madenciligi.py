@@ -0,0 +1,100 @@
+"""
+Öğe kümesi madencilerinin küçük rastgele verilerde kaba kuvvet sayımıyla
+birebir aynı sonucu verdiğini kontrol eder.
+
+    python -m pytest -q
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from sepet_veri import UrunSozlugu, listelerden_sepet_verisi
+from oge_madenciligi import (
+    MADENCILER, kapali_kumeler, maksimal_kumeler, en_sik_k_kume, son_madencilik
+)
+
+
+TOHUMLAR = range(8)
+MIN_SUPPORT = 0.1
+
+
+def rastgele_sepetler(tohum, sepet_sayisi=60, urun_sayisi=7):
+    """Ürün olasılıkları farklı, arada boş sepetler de olan küçük bir veri seti"""
+    rng = np.random.default_rng(tohum)
+    olasiliklar = rng.uniform(0.15, 0.6, urun_sayisi)
+    sepetler = [[f"u{urun}" for urun in np.flatnonzero(rng.random(urun_sayisi) < olasiliklar)]
+                for _ in range(sepet_sayisi)]
+    return listelerden_sepet_verisi(sepetler, UrunSozlugu())
+
+
+def tum_kume_sayilari(sepet_verisi):
+    """Her öğe kümesinin sepet sayısı (tüm alt kümeler tek tek sayılır)"""
+    sepetler = [set(sepet) for sepet in sepet_verisi.sepet_idleri()]
+    urunler = range(len(sepet_verisi.sozluk))
+    return {kume: sum(set(kume) <= sepet for sepet in sepetler)
+            for uzunluk in range(1, len(urunler) + 1)
+            for kume in combinations(urunler, uzunluk)}
+
+
+def sik_kume_sayilari(sepet_verisi, min_support):
+    min_sepet_sayisi = max(int(min_support * sepet_verisi.sepet_sayisi), 1)
+    return {kume: sayi for kume, sayi in tum_kume_sayilari(sepet_verisi).items()
+            if sayi >= min_sepet_sayisi}
+
+
+def sayilar(sonuc):
+    return {kume: bilgi['sepet_sayisi'] for kume, bilgi in sonuc.items()}
+
+
+@pytest.mark.parametrize('algoritma', sorted(MADENCILER))
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_madenciler_kaba_kuvvetle_ayni(algoritma, tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    beklenen = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    assert sayilar(MADENCILER[algoritma](sepet_verisi, MIN_SUPPORT)) == beklenen
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_kapali_kumeler(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    sik = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    beklenen = {kume: sayi for kume, sayi in sik.items()
+                if not any(set(kume) < set(diger) and diger_sayi == sayi
+                           for diger, diger_sayi in sik.items())}
+    assert sayilar(kapali_kumeler(sepet_verisi, MIN_SUPPORT)) == beklenen
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_maksimal_kumeler(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    sik = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    beklenen = {kume: sayi for kume, sayi in sik.items()
+                if not any(set(kume) < set(diger) for diger in sik)}
+    assert sayilar(maksimal_kumeler(sepet_verisi, MIN_SUPPORT)) == beklenen
+
+
+@pytest.mark.parametrize('k', [1, 5, 20])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_en_sik_k_kume(tohum, k):
+    sepet_verisi = rastgele_sepetler(tohum)
+    tum = {kume: sayi for kume, sayi in tum_kume_sayilari(sepet_verisi).items()
+           if len(kume) >= 2 and sayi > 0}
+    sonuc = sayilar(en_sik_k_kume(sepet_verisi, k=k, min_uzunluk=2))
+
+    # Sayılar doğru, destekler en büyük k ile aynı; eşitlikte hangi kümenin
+    # seçildiği serbest ama k'inci destekten büyük her küme sonuçta olmalı
+    assert all(tum[kume] == sayi for kume, sayi in sonuc.items())
+    en_iyiler = sorted(tum.values(), reverse=True)[:k]
+    assert sorted(sonuc.values(), reverse=True) == en_iyiler
+    assert {kume for kume, sayi in tum.items() if sayi > en_iyiler[-1]} <= set(sonuc)
+
+
+@pytest.mark.parametrize('algoritma', sorted(MADENCILER))
+def test_son_madencilik_tek_surecle_ayni(algoritma):
+    sepet_verisi = rastgele_sepetler(0, sepet_sayisi=200)
+    beklenen = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    sonuc = son_madencilik(sepet_verisi, MIN_SUPPORT, algoritma=algoritma,
+                           is_sayisi=2, bolum_sayisi=3)
+    assert sayilar(sonuc) == beklenen
@@ -0,0 +1,50 @@
+"""
+Örneklemli ön izlemenin doğrulanmış sonucunun tam veri madenciliğiyle ve kaba
+kuvvet sayımıyla birebir aynı olduğunu kontrol eder.
+
+    python -m pytest -q
+"""
+
+import pytest
+
+from oge_madenciligi import MADENCILER
+from onizleme import ornek_madencilik, negatif_sinir
+from test_oge_madenciligi import (
+    TOHUMLAR, MIN_SUPPORT, rastgele_sepetler, tum_kume_sayilari, sik_kume_sayilari, sayilar
+)
+
+
+@pytest.mark.parametrize('ornek_boyutu', [10, 40, 1000])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_dogrulanmis_sonuc_tam_madencilikle_ayni(tohum, ornek_boyutu):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=120)
+    sonuc, ozet = ornek_madencilik(sepet_verisi, MIN_SUPPORT, ornek_boyutu=ornek_boyutu,
+                                   dogrula=True, tohum=tohum)
+
+    beklenen = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    assert sayilar(sonuc) == beklenen
+    assert sayilar(sonuc) == sayilar(MADENCILER['Apriori'](sepet_verisi, MIN_SUPPORT))
+    assert all(bilgi['guven_araligi'] == (bilgi['support'],) * 2 for bilgi in sonuc.values())
+    assert ozet['dogrulandi'] == (ozet['sinir_ihlali'] == 0)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_orneklem_tum_veriyse_sonuc_kesin(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    sonuc, ozet = ornek_madencilik(sepet_verisi, MIN_SUPPORT, ornek_boyutu=10_000)
+    assert ozet['ornek_boyutu'] == sepet_verisi.sepet_sayisi
+    assert sayilar(sonuc) == sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_negatif_sinir(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    sik = sik_kume_sayilari(sepet_verisi, MIN_SUPPORT)
+    urun_sayisi = len(sepet_verisi.sozluk)
+
+    # Sık olmayan ve bir eksik alt kümelerinin hepsi sık olan kümeler (tekler dahil)
+    beklenen = {kume for kume in tum_kume_sayilari(sepet_verisi)
+                if kume not in sik
+                and (len(kume) == 1 or all(kume[:i] + kume[i + 1:] in sik
+                                           for i in range(len(kume))))}
+    assert set(negatif_sinir(sik, urun_sayisi)) == beklenen
@@ -0,0 +1,83 @@
+"""
+Sonuç önbelleğinin isabet, ıska ve veri değişince geçersiz sayılma davranışını
+kontrol eder; önbelleğe gelen sonuç doğrudan hesapla aynı olmalı.
+
+    python -m pytest -q
+"""
+
+import os
+
+import pytest
+
+import sonuc_onbellegi
+from sepet_veri import UrunSozlugu, listelerden_sepet_verisi
+from birliktelik_motoru import birliktelik_hesapla
+from sonuc_onbellegi import SonucOnbellegi, onbellekli
+
+
+CAGRILAR = []
+
+
+def sayan_hesap(sepet_verisi, min_support=0.1):
+    """Kaç kez gerçekten hesaplandığını CAGRILAR'a yazan birliktelik hesabı"""
+    CAGRILAR.append(min_support)
+    return birliktelik_hesapla(sepet_verisi, min_support=min_support)
+
+
+def sepetler(*sepet_listesi):
+    return listelerden_sepet_verisi([list(sepet) for sepet in sepet_listesi], UrunSozlugu())
+
+
+@pytest.fixture(autouse=True)
+def gecici_onbellek(tmp_path, monkeypatch):
+    monkeypatch.setattr(sonuc_onbellegi, 'ortak_onbellek', SonucOnbellegi(str(tmp_path)))
+    CAGRILAR.clear()
+
+
+def test_isabet_ve_iska():
+    sepet_verisi = sepetler('ab', 'abc', 'bc', 'a')
+    beklenen = birliktelik_hesapla(sepet_verisi, min_support=0.25)
+
+    ilk = onbellekli(sepet_verisi.parmak_izi(), sayan_hesap, sepet_verisi, min_support=0.25)
+    ikinci = onbellekli(sepet_verisi.parmak_izi(), sayan_hesap, sepet_verisi, min_support=0.25)
+    assert ilk == ikinci == beklenen
+    assert CAGRILAR == [0.25]
+
+    # Farklı parametre ayrı anahtardır
+    onbellekli(sepet_verisi.parmak_izi(), sayan_hesap, sepet_verisi, min_support=0.5)
+    assert CAGRILAR == [0.25, 0.5]
+
+
+def test_parmak_izi_degisince_yeniden_hesaplanir():
+    eski = sepetler('ab', 'abc', 'bc', 'a')
+    yeni = sepetler('ab', 'abc', 'bc', 'c')
+    assert eski.parmak_izi() != yeni.parmak_izi()
+
+    onbellekli(eski.parmak_izi(), sayan_hesap, eski, min_support=0.25)
+    sonuc = onbellekli(yeni.parmak_izi(), sayan_hesap, yeni, min_support=0.25)
+    assert sonuc == birliktelik_hesapla(yeni, min_support=0.25)
+    assert CAGRILAR == [0.25, 0.25]
+
+    # Eski verinin sonucu hâlâ önbellekte
+    onbellekli(eski.parmak_izi(), sayan_hesap, eski, min_support=0.25)
+    assert len(CAGRILAR) == 2
+
+
+def test_bozuk_dosya_iska_sayilir(tmp_path):
+    onbellek = SonucOnbellegi(str(tmp_path))
+    anahtar = onbellek.anahtar('iz', 'f', {})
+    (tmp_path / (anahtar + '.pkl')).write_bytes(b'bozuk')
+    assert onbellek.hesapla('iz', 'f', {}, lambda: 42) == 42
+    assert onbellek.getir(anahtar) == (True, 42)
+
+
+def test_boyut_siniri_en_eskiyi_siler(tmp_path):
+    onbellek = SonucOnbellegi(str(tmp_path))
+    onbellek.kaydet('eski', list(range(100)))
+    onbellek.kaydet('yeni', list(range(100)))
+    os.utime(tmp_path / 'eski.pkl', ns=(0, 0))
+
+    onbellek.max_boyut = (tmp_path / 'yeni.pkl').stat().st_size
+    onbellek.temizle()
+    assert onbellek.getir('eski') == (False, None)
+    assert onbellek.getir('yeni') == (True, list(range(100)))
@@ -0,0 +1,150 @@
+"""
+Ürün ağının kenarlarını kaba kuvvet çift sayımıyla karşılaştırır; etiket
+yayılımının planlı kümeleri bulduğunu ve modülerliğin networkx ile aynı
+olduğunu kontrol eder.
+
+    python -m pytest -q
+"""
+
+from itertools import combinations
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy import sparse
+
+from sepet_veri import UrunSozlugu, listelerden_sepet_verisi
+from birliktelik_motoru import eslesme_matrisi
+from urun_agi import agi_kur, etiket_yayilimi, modulerlik, kumeleme
+from test_oge_madenciligi import TOHUMLAR, rastgele_sepetler
+
+
+def kaba_kuvvet_kenarlari(sepet_verisi, urun_idleri, min_support, min_lift):
+    """{(ürün ID, ürün ID): (sepet sayısı, lift)}; her çift sepetler tek tek taranarak sayılır"""
+    sepetler = [set(sepet) for sepet in sepet_verisi.sepet_idleri()]
+    toplam = len(sepetler)
+    kenarlar = {}
+    for urun1, urun2 in combinations(sorted(urun_idleri), 2):
+        sayi = sum(urun1 in sepet and urun2 in sepet for sepet in sepetler)
+        f1 = sum(urun1 in sepet for sepet in sepetler)
+        f2 = sum(urun2 in sepet for sepet in sepetler)
+        if sayi == 0:
+            continue
+        lift = sayi * toplam / (f1 * f2)
+        if sayi / toplam >= min_support and lift >= min_lift:
+            kenarlar[(urun1, urun2)] = (sayi, lift)
+    return kenarlar
+
+
+def ag_kenarlari(ag):
+    return {tuple(sorted((int(ag.urunler[kaynak]), int(ag.urunler[hedef])))): (sayi, lift)
+            for kaynak, hedef, sayi, lift in zip(ag.kaynak, ag.hedef, ag.sayilar, ag.lift)}
+
+
+@pytest.mark.parametrize('seyrek', [False, True])
+@pytest.mark.parametrize('min_support, min_lift', [(0.0, 0.0), (0.05, 1.0), (0.1, 1.2)])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_agi_kur_kaba_kuvvetle_ayni(tohum, min_support, min_lift, seyrek):
+    sepet_verisi = rastgele_sepetler(tohum)
+    # Küçük kataloglarda eşleşme yoğun dizidir; büyük katalogların seyrek hali de sınanır
+    eslesme = eslesme_matrisi(sepet_verisi)
+    if seyrek:
+        eslesme = sparse.csr_matrix(eslesme)
+    toplam = sepet_verisi.sepet_sayisi
+
+    ag = agi_kur(eslesme, toplam, min_support, min_lift)
+    gorulen = [urun for urun in range(len(sepet_verisi.sozluk))
+               if any(urun in sepet for sepet in sepet_verisi.sepet_idleri())]
+    assert ag.urunler.tolist() == gorulen
+    beklenen = kaba_kuvvet_kenarlari(sepet_verisi, gorulen, min_support, min_lift)
+    kenarlar = ag_kenarlari(ag)
+    assert kenarlar.keys() == beklenen.keys()
+    for cift, (sayi, lift) in kenarlar.items():
+        assert sayi == beklenen[cift][0]
+        assert lift == pytest.approx(beklenen[cift][1])
+
+    # Komşuluk matrisi ve dereceler kenar listesiyle tutarlı
+    komsuluk = ag.komsuluk('sayilar').toarray()
+    assert (komsuluk == komsuluk.T).all()
+    assert komsuluk.sum() == 2 * sum(sayi for sayi, _ in beklenen.values())
+    assert ag.dereceler().tolist() == (komsuluk > 0).sum(axis=1).tolist()
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_secili_urunlerle_ag(tohum):
+    sepet_verisi = rastgele_sepetler(tohum)
+    secili = [5, 0, 3]
+    ag = agi_kur(eslesme_matrisi(sepet_verisi), sepet_verisi.sepet_sayisi,
+                 min_support=0.05, min_lift=1.0, urun_idleri=secili)
+
+    # Seçilen sırayla düğüm olurlar, kenarsız kalsalar bile
+    assert ag.urunler.tolist() == secili
+    assert ag_kenarlari(ag).keys() == kaba_kuvvet_kenarlari(sepet_verisi, secili, 0.05, 1.0).keys()
+
+
+def planli_bolumleme(tohum, kume_sayisi=4, kume_boyutu=8, ic_olasilik=0.9, dis_olasilik=0.02):
+    """Kümeler içinde yoğun, arasında seyrek rastgele ağırlıklı ağ: (komşuluk, gerçek kümeler)"""
+    rng = np.random.default_rng(tohum)
+    gercek = np.repeat(np.arange(kume_sayisi), kume_boyutu)
+    n = len(gercek)
+    ayni = gercek[:, None] == gercek[None, :]
+    kenar = np.triu(rng.random((n, n)) < np.where(ayni, ic_olasilik, dis_olasilik), k=1)
+    agirlik = np.where(kenar, rng.uniform(1, 2, (n, n)), 0.0)
+    return sparse.csr_matrix(agirlik + agirlik.T), gercek
+
+
+def ayni_bolumleme(etiketler1, etiketler2):
+    """İki etiketlemenin (numaralardan bağımsız olarak) aynı kümeleri verip vermediği"""
+    ciftler = set(zip(etiketler1.tolist(), etiketler2.tolist()))
+    return len(ciftler) == len(set(etiketler1.tolist())) == len(set(etiketler2.tolist()))
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_etiket_yayilimi_planli_kumeleri_bulur(tohum):
+    komsuluk, gercek = planli_bolumleme(tohum)
+    etiketler = etiket_yayilimi(komsuluk, tohum=tohum)
+    assert ayni_bolumleme(etiketler, gercek)
+
+    # Küme numaraları büyükten küçüğe 0, 1, 2...
+    boyutlar = np.bincount(etiketler)
+    assert (np.diff(boyutlar) <= 0).all()
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_modulerlik_networkx_ile_ayni(tohum):
+    komsuluk, gercek = planli_bolumleme(tohum)
+    G = nx.from_scipy_sparse_array(komsuluk)
+    rng = np.random.default_rng(tohum)
+    for etiketler in [gercek, rng.integers(0, 4, len(gercek)), np.zeros(len(gercek), dtype=int)]:
+        topluluklar = [set(np.flatnonzero(etiketler == etiket).tolist())
+                       for etiket in np.unique(etiketler)]
+        assert modulerlik(komsuluk, etiketler) == pytest.approx(
+            nx.community.modularity(G, topluluklar, weight='weight'))
+
+
+def test_kenarsiz_ag():
+    komsuluk = sparse.csr_matrix((5, 5))
+    etiketler = etiket_yayilimi(komsuluk)
+    assert sorted(etiketler.tolist()) == list(range(5))
+    assert modulerlik(komsuluk, etiketler) == 0.0
+
+
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_kumeleme_planli_reyonlari_bulur(tohum):
+    # Her sepet tek bir "reyondan" ürün alır; reyonlar kümeleme sonucunda ayrılmalı
+    rng = np.random.default_rng(tohum)
+    reyonlar = [[f"r{reyon}u{urun}" for urun in range(5)] for reyon in range(3)]
+    sepetler = []
+    for _ in range(300):
+        reyon = reyonlar[rng.integers(3)]
+        sepetler.append([urun for urun in reyon if rng.random() < 0.5])
+    sepet_verisi = listelerden_sepet_verisi(sepetler, UrunSozlugu())
+
+    eslesme = eslesme_matrisi(sepet_verisi)
+    kumeler, q = kumeleme(eslesme, sepet_verisi.sepet_sayisi, tohum=tohum)
+    gercek = np.array([int(urun[1]) for urun in sepet_verisi.urunler])
+    assert ayni_bolumleme(kumeler, gercek)
+
+    ag = agi_kur(eslesme, sepet_verisi.sepet_sayisi, 0.0, 1.0)
+    assert q == pytest.approx(modulerlik(ag.komsuluk('lift'), kumeler[ag.urunler]))
+    assert q > 0.3
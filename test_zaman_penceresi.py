@@ -0,0 +1,127 @@
+"""
+Zaman penceresi sayaçlarını kaba kuvvet sayımıyla kontrol eder: kayan pencere
+her parçadan sonra son N sepetin / son N günün yeniden sayımıyla, sönümlü sayaç
+2^(-yaş / yarı ömür) ağırlıklı sayımla aynı olmalı.
+
+    python -m pytest -q
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sepet_veri import sepetleri_sec
+from zaman_penceresi import KayanPencereSayaci, SonumluSayac
+from test_oge_madenciligi import TOHUMLAR, rastgele_sepetler
+
+
+BASLANGIC = pd.Timestamp('2024-01-01')
+
+
+def parcalara_bol(sepet_verisi, tohum):
+    """Sepetleri rastgele boyutlu ardışık parçalara böler: (başlangıç, parça) üretir"""
+    rng = np.random.default_rng(tohum)
+    bas = 0
+    while bas < sepet_verisi.sepet_sayisi:
+        son = min(bas + int(rng.integers(1, 30)), sepet_verisi.sepet_sayisi)
+        yield bas, sepetleri_sec(sepet_verisi, np.arange(bas, son))
+        bas = son
+
+
+def agirlikli_sayimlar(sepetler, agirliklar, urun_sayisi):
+    """(ürün, çift, sepet boyutu, toplam) sayımları; her sepet kendi ağırlığıyla"""
+    urunler = np.zeros(urun_sayisi)
+    ciftler = Counter()
+    boyutlar = np.zeros(urun_sayisi + 1)
+    for sepet, agirlik in zip(sepetler, agirliklar):
+        urunler[list(sepet)] += agirlik
+        boyutlar[len(sepet)] += agirlik
+        for cift in combinations(sorted(sepet), 2):
+            ciftler[cift] += agirlik
+    return urunler, ciftler, boyutlar, float(np.sum(agirliklar))
+
+
+def sayaci_karsilastir(sayac, sepetler, agirliklar, urun_sayisi):
+    urunler, ciftler, boyutlar, toplam = agirlikli_sayimlar(sepetler, agirliklar, urun_sayisi)
+    assert sayac.toplam_sepet == pytest.approx(toplam)
+    assert sayac.urun_sayilari()[:urun_sayisi] == pytest.approx(urunler)
+    assert sayac.sepet_boyutu_dagilimi()[:urun_sayisi + 1] == pytest.approx(boyutlar)
+    sayilar = {cift: bilgi['sepet_sayisi'] for cift, bilgi in sayac.destekli_ciftler(0).items()}
+    for cift in set(sayilar) | set(ciftler):
+        assert sayilar.get(cift, 0) == pytest.approx(ciftler.get(cift, 0), abs=1e-6)
+
+
+@pytest.mark.parametrize('son_sepet', [1, 25, 80, 1000])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_sepet_penceresi_son_n_sepetle_ayni(tohum, son_sepet):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200)
+    sepetler = list(sepet_verisi.sepet_idleri())
+    urun_sayisi = len(sepet_verisi.sozluk)
+
+    sayac = KayanPencereSayaci(son_sepet=son_sepet)
+    for bas, parca in parcalara_bol(sepet_verisi, tohum):
+        sayac.ekle(parca)
+        son = bas + parca.sepet_sayisi
+        penceredekiler = sepetler[max(son - son_sepet, 0):son]
+        sayaci_karsilastir(sayac, penceredekiler, np.ones(len(penceredekiler)), urun_sayisi)
+        assert isinstance(sayac.toplam_sepet, int)
+
+
+@pytest.mark.parametrize('son_gun', [0.5, 3, 10])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_gun_penceresi_son_n_gunle_ayni(tohum, son_gun):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200)
+    sepetler = list(sepet_verisi.sepet_idleri())
+    urun_sayisi = len(sepet_verisi.sozluk)
+    gunler = np.sort(np.random.default_rng(tohum).uniform(0, 30, sepet_verisi.sepet_sayisi))
+
+    sayac = KayanPencereSayaci(son_gun=son_gun)
+    for bas, parca in parcalara_bol(sepet_verisi, tohum):
+        son = bas + parca.sepet_sayisi
+        # Parça içindeki sıra karışık gelebilir; sayaç kendisi sıralar
+        sira = np.random.default_rng(bas).permutation(parca.sepet_sayisi)
+        zamanlar = BASLANGIC + pd.to_timedelta(gunler[bas:son][sira], unit='D')
+        sayac.ekle(sepetleri_sec(parca, sira), zamanlar)
+
+        penceredekiler = [sepet for sepet, gun in zip(sepetler[:son], gunler[:son])
+                          if gun > gunler[son - 1] - son_gun]
+        sayaci_karsilastir(sayac, penceredekiler, np.ones(len(penceredekiler)), urun_sayisi)
+
+
+@pytest.mark.parametrize('yari_omur', [0.5, 3, 40])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_sepet_sonumu_kaba_kuvvetle_ayni(tohum, yari_omur):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200)
+    sepetler = list(sepet_verisi.sepet_idleri())
+    urun_sayisi = len(sepet_verisi.sozluk)
+
+    # Küçük yarı ömürlerde referans birkaç kez yeniden ölçeklenir
+    sayac = SonumluSayac(yari_omur_sepet=yari_omur)
+    for bas, parca in parcalara_bol(sepet_verisi, tohum):
+        sayac.ekle(parca)
+        son = bas + parca.sepet_sayisi
+        yaslar = (son - 1) - np.arange(son)
+        sayaci_karsilastir(sayac, sepetler[:son], np.exp2(-yaslar / yari_omur), urun_sayisi)
+
+
+@pytest.mark.parametrize('yari_omur', [0.25, 2, 30])
+@pytest.mark.parametrize('tohum', TOHUMLAR)
+def test_gun_sonumu_kaba_kuvvetle_ayni(tohum, yari_omur):
+    sepet_verisi = rastgele_sepetler(tohum, sepet_sayisi=200)
+    sepetler = list(sepet_verisi.sepet_idleri())
+    urun_sayisi = len(sepet_verisi.sozluk)
+    gunler = np.sort(np.random.default_rng(tohum).uniform(0, 60, sepet_verisi.sepet_sayisi))
+
+    sayac = SonumluSayac(yari_omur_gun=yari_omur)
+    for bas, parca in parcalara_bol(sepet_verisi, tohum):
+        son = bas + parca.sepet_sayisi
+        sayac.ekle(parca, BASLANGIC + pd.to_timedelta(gunler[bas:son], unit='D'))
+        yaslar = gunler[son - 1] - gunler[:son]
+        sayaci_karsilastir(sayac, sepetler[:son], np.exp2(-yaslar / yari_omur), urun_sayisi)
+
+    # Destek sönümlü çift ağırlığının sönümlü sepet sayısına oranıdır
+    for bilgi in sayac.destekli_ciftler(0).values():
+        assert bilgi['support'] == pytest.approx(bilgi['sepet_sayisi'] / sayac.toplam_sepet)
@@ -0,0 +1,250 @@
+"""
+ÜRÜN AĞI
+Ürün ilişki ağı eşleşme matrisinden (Xᵀ·X) doğrudan kurulur: support ve lift
+eşikleri dizi maskeleriyle uygulanır, sepetler yeniden taranmaz. Kenarlar seyrek
+(kaynak, hedef) dizileri olarak tutulur.
+
+Yerleşim (layout) vektörel Fruchterman-Reingold ile hesaplanır; önceki bir
+yerleşimden başlatılırsa (ılık başlangıç) birkaç iterasyonda dengelenir.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from birliktelik_motoru import ust_ucgen_ciftleri
+
+
+_ITME_ORNEGI = 500        # Daha büyük ağlarda itme kuvveti bu kadar düğümlük örnekle hesaplanır
+_SOGUK_ITERASYON = 50     # Rastgele başlangıçta iterasyon sayısı
+_ILIK_ITERASYON = 15      # Önceki yerleşimden başlarken iterasyon sayısı
+_ILK_SICAKLIK = 0.1       # Bir iterasyondaki en büyük adım ([-1, 1] alanında)
+_ILIK_SICAKLIK = 0.02
+
+
+class UrunAgi:
+    """
+    Düğümler: urunler dizisindeki ürün ID'leri (sıra numarasıyla indekslenir)
+    Kenarlar: (kaynak, hedef) düğüm sıra numaraları; her kenarın sepet sayısı,
+    support'u ve lift'i paralel dizilerde tutulur
+    """
+
+    def __init__(self, urunler, frekanslar, kaynak, hedef, sayilar, toplam_sepet):
+        self.urunler = urunler
+        self.frekanslar = frekanslar      # Düğümlerin sepet sayıları
+        self.kaynak = kaynak
+        self.hedef = hedef
+        self.sayilar = sayilar
+        self.toplam_sepet = toplam_sepet
+        self.support = sayilar / toplam_sepet
+        self.lift = sayilar * toplam_sepet / (frekanslar[kaynak] * frekanslar[hedef])
+
+    @property
+    def dugum_sayisi(self):
+        return len(self.urunler)
+
+    @property
+    def kenar_sayisi(self):
+        return len(self.kaynak)
+
+    def komsuluk(self, agirlik=None):
+        """
+        Simetrik seyrek komşuluk matrisi (düğüm sırası x düğüm sırası)
+        agirlik: None (0/1), 'sayilar', 'support' veya 'lift'
+        """
+        veri = np.ones(self.kenar_sayisi) if agirlik is None else getattr(self, agirlik)
+        n = self.dugum_sayisi
+        ust = sparse.coo_matrix((veri, (self.kaynak, self.hedef)), shape=(n, n))
+        return (ust + ust.T).tocsr()
+
+    def dereceler(self):
+        """Her düğümün bağlantı sayısı"""
+        return np.bincount(np.concatenate([self.kaynak, self.hedef]),
+                           minlength=self.dugum_sayisi)
+
+    def yogunluk(self):
+        """Var olan kenarların olası kenarlara oranı"""
+        n = self.dugum_sayisi
+        return 2 * self.kenar_sayisi / (n * (n - 1)) if n > 1 else 0.0
+
+
+def agi_kur(eslesme, toplam_sepet, min_support=0.05, min_lift=1.2, urun_idleri=None):
+    """
+    Eşleşme matrisinden support ve lift eşiklerini geçen çiftlerle ağı kurar
+    urun_idleri: ağa alınacak ürünler (None: sepetlerde görülen tüm katalog)
+    Kenarı olmayan seçili ürünler de düğüm olarak kalır.
+    """
+    frekanslar = (eslesme.diagonal() if sparse.issparse(eslesme)
+                  else np.diag(eslesme)).astype(np.float64)
+    if urun_idleri is None:
+        urun_idleri = np.flatnonzero(frekanslar)
+    urun_idleri = np.asarray(urun_idleri, dtype=np.int64)
+
+    # Ürün ID'si -> düğüm sırası (ağ dışındaki ürünler -1)
+    dugum_sirasi = np.full(len(frekanslar), -1, dtype=np.int64)
+    dugum_sirasi[urun_idleri] = np.arange(len(urun_idleri))
+
+    satirlar, sutunlar, sayilar = ust_ucgen_ciftleri(eslesme,
+                                                     max(int(min_support * toplam_sepet), 1))
+    kaynak, hedef = dugum_sirasi[satirlar], dugum_sirasi[sutunlar]
+    lift = sayilar * toplam_sepet / (frekanslar[satirlar] * frekanslar[sutunlar])
+    maske = ((kaynak >= 0) & (hedef >= 0)
+             & (sayilar / toplam_sepet >= min_support) & (lift >= min_lift))
+
+    return UrunAgi(urun_idleri, frekanslar[urun_idleri], kaynak[maske], hedef[maske],
+                   np.asarray(sayilar[maske], dtype=np.float64), toplam_sepet)
+
+
+def yerlesim_hesapla(ag, onceki=None, iterasyon=None, tohum=0):
+    """
+    Fruchterman-Reingold yerleşimi; {ürün ID: (x, y)} döndürür ([-1, 1] alanında)
+    onceki: önceki bir yerleşim; ortak ürünler oradan başlar ve sistem düşük
+            sıcaklıkla az iterasyonda dengelenir (eşik değişince ılık başlangıç)
+    Kenarlar lift ile ağırlıklı çeker; büyük ağlarda itme kuvveti rastgele bir
+    düğüm örneğinden hesaplanıp ölçeklenir (iterasyon başına O(n·örnek + kenar)).
+    """
+    n = ag.dugum_sayisi
+    if n == 0:
+        return {}
+    rng = np.random.default_rng(tohum)
+    konum = rng.uniform(-1, 1, (n, 2))
+
+    sicaklik = _ILK_SICAKLIK
+    varsayilan_iterasyon = _SOGUK_ITERASYON
+    if onceki:
+        urunler = ag.urunler.tolist()
+        bilinen = np.array([urun in onceki for urun in urunler])
+        if bilinen.any():
+            konum[bilinen] = [onceki[urun] for urun, var in zip(urunler, bilinen) if var]
+            sicaklik = _ILIK_SICAKLIK
+            varsayilan_iterasyon = _ILIK_ITERASYON
+    iterasyon = varsayilan_iterasyon if iterasyon is None else iterasyon
+
+    k = np.sqrt(4.0 / n)                     # İdeal kenar uzunluğu
+    agirlik = (ag.lift / ag.lift.mean())[:, None] if ag.kenar_sayisi else None
+    soguma = sicaklik / (iterasyon + 1)
+
+    for _ in range(iterasyon):
+        # İtme: her düğüm diğerlerini k²/d ile iter
+        if n <= _ITME_ORNEGI:
+            ornek, olcek = konum, 1.0
+        else:
+            ornek, olcek = konum[rng.choice(n, _ITME_ORNEGI, replace=False)], n / _ITME_ORNEGI
+        dx = konum[:, :1] - ornek[:, 0]
+        dy = konum[:, 1:] - ornek[:, 1]
+        ters_uzaklik2 = 1.0 / np.maximum(dx * dx + dy * dy, 1e-9)
+        yer_degistirme = olcek * k ** 2 * np.column_stack([(dx * ters_uzaklik2).sum(axis=1),
+                                                           (dy * ters_uzaklik2).sum(axis=1)])
+
+        # Çekme: kenarın iki ucu d²/k ile birbirine yaklaşır
+        if agirlik is not None:
+            kenar_farki = konum[ag.kaynak] - konum[ag.hedef]
+            uzunluk = np.sqrt((kenar_farki ** 2).sum(axis=1))[:, None]
+            cekme = kenar_farki * uzunluk / k * agirlik
+            for eksen in range(2):
+                yer_degistirme[:, eksen] -= np.bincount(ag.kaynak, cekme[:, eksen], minlength=n)
+                yer_degistirme[:, eksen] += np.bincount(ag.hedef, cekme[:, eksen], minlength=n)
+
+        # Adım boyu sıcaklıkla sınırlanır, sıcaklık her iterasyonda düşer
+        boy = np.maximum(np.sqrt((yer_degistirme ** 2).sum(axis=1)), 1e-9)
+        konum += yer_degistirme * (np.minimum(boy, sicaklik) / boy)[:, None]
+        sicaklik -= soguma
+
+    konum -= konum.mean(axis=0)
+    konum /= max(np.abs(konum).max(), 1e-9)
+    return dict(zip(ag.urunler.tolist(), map(tuple, konum.tolist())))
+
+
+def etiket_yayilimi(komsuluk, max_iterasyon=100, tohum=0):
+    """
+    Ağırlıklı etiket yayılımı (label propagation) ile topluluk bulma
+    Her düğüm, komşularında toplam ağırlığı en yüksek etikete geçer; komşu
+    etiket ağırlıkları tek bir seyrek çarpımla (A · etiket matrisi) hesaplanır.
+    Salınımı önlemek için her turda değişmek isteyen düğümlerin rastgele
+    yarısı güncellenir. Küme numaraları büyükten küçüğe 0, 1, 2... verilir.
+    """
+    komsuluk = sparse.csr_matrix(komsuluk)
+    n = komsuluk.shape[0]
+    rng = np.random.default_rng(tohum)
+    etiketler = np.arange(n)
+    satirlar = np.arange(n)
+
+    for _ in range(max_iterasyon):
+        etiket_matrisi = sparse.csr_matrix((np.ones(n), (satirlar, etiketler)), shape=(n, n))
+        agirliklar = (komsuluk @ etiket_matrisi).tocsr()
+        # Eşit ağırlıklı etiketler arasında rastgele seçim için çok küçük gürültü
+        agirliklar.data *= 1 + 1e-9 * rng.random(agirliklar.nnz)
+
+        en_iyi, en_iyi_agirlik = _satir_en_buyukleri(agirliklar, etiketler)
+        satir_no = np.repeat(satirlar, np.diff(agirliklar.indptr))
+        kendi = agirliklar.indices == etiketler[satir_no]
+        mevcut_agirlik = np.bincount(satir_no[kendi], agirliklar.data[kendi], minlength=n)
+
+        # Sadece kesin daha iyi bir etiket bulan düğümler değişir (izole düğümler kalır)
+        isteyen = en_iyi_agirlik > mevcut_agirlik * (1 + 1e-6)
+        if not isteyen.any():
+            break
+        degisen = isteyen & (rng.random(n) < 0.5)
+        etiketler[degisen] = en_iyi[degisen]
+
+    # Etiketleri küme büyüklüğüne göre 0'dan numaralandır
+    tekil, ters, boyutlar = np.unique(etiketler, return_inverse=True, return_counts=True)
+    sira = np.argsort(-boyutlar, kind='stable')
+    yeni_numara = np.empty(len(tekil), dtype=np.int64)
+    yeni_numara[sira] = np.arange(len(tekil))
+    return yeni_numara[ters.ravel()]
+
+
+def _satir_en_buyukleri(matris, varsayilan):
+    """
+    CSR matrisin her satırındaki en büyük değer ve sütunu (vektörel)
+    Boş satırlarda sütun varsayilan'dan alınır, değer 0'dır.
+    """
+    n = matris.shape[0]
+    dolu = np.diff(matris.indptr) > 0
+    en_buyuk = np.zeros(n)
+    en_buyuk[dolu] = np.maximum.reduceat(matris.data, matris.indptr[:-1][dolu])
+
+    # Her satırda en büyük değere eşit ilk konum
+    satir_no = np.repeat(np.arange(n), np.diff(matris.indptr))
+    esit = np.flatnonzero(matris.data == en_buyuk[satir_no])
+    _, ilk = np.unique(satir_no[esit], return_index=True)
+    sutunlar = varsayilan.copy()
+    sutunlar[satir_no[esit[ilk]]] = matris.indices[esit[ilk]]
+    return sutunlar, en_buyuk
+
+
+def modulerlik(komsuluk, etiketler):
+    """
+    Kümelemenin modülerliği: Q = Σ_c [ iç_c / 2m - (derece_c / 2m)² ]
+    (0 civarı: rastgele; 0.3 üzeri: belirgin topluluk yapısı)
+    """
+    komsuluk = sparse.coo_matrix(komsuluk)
+    iki_m = komsuluk.sum()
+    if iki_m == 0:
+        return 0.0
+    ic = komsuluk.data[etiketler[komsuluk.row] == etiketler[komsuluk.col]].sum()
+    dereceler = np.asarray(komsuluk.sum(axis=1)).ravel()
+    kume_dereceleri = np.bincount(etiketler, weights=dereceler)
+    return float(ic / iki_m - ((kume_dereceleri / iki_m) ** 2).sum())
+
+
+def kumeleme(eslesme, toplam_sepet, min_support=0.0, min_lift=1.0, tohum=0):
+    """
+    Tüm katalog için ürün kümeleri ("reyonlar"): lift ağırlıklı eşleşme ağında
+    etiket yayılımı. (kümeler, modülerlik) döndürür; kümeler ürün ID'si ile
+    indekslenen küme numarası dizisidir (sepetlerde hiç görülmeyen ürünler -1),
+    modülerlik kümelemenin yapıldığı aynı ağ üzerinde hesaplanır.
+    """
+    ag = agi_kur(eslesme, toplam_sepet, min_support, min_lift)
+    frekanslar = eslesme.diagonal() if sparse.issparse(eslesme) else np.diag(eslesme)
+    komsuluk = ag.komsuluk('lift')
+    etiketler = etiket_yayilimi(komsuluk, tohum=tohum)
+
+    kumeler = np.full(len(frekanslar), -1, dtype=np.int64)
+    kumeler[ag.urunler] = etiketler
+    return kumeler, modulerlik(komsuluk, etiketler)
+
+
+def urun_kumeleri(eslesme, toplam_sepet, min_support=0.0, min_lift=1.0, tohum=0):
+    """Sadece küme numaraları (bkz. kumeleme)"""
+    return kumeleme(eslesme, toplam_sepet, min_support, min_lift, tohum)[0]
@@ -0,0 +1,248 @@
+"""
+ZAMAN PENCERESİ
+Zaman damgalı sepet akışlarında eski satışların etkisini sınırlayan iki sayaç:
+
+    KayanPencereSayaci : sadece son N sepetin veya son N günün ürün/çift sayıları
+                         (pencereden çıkan sepetler sayımlardan düşülür)
+    SonumluSayac       : her sepetin ağırlığı yaşı bir yarı ömür arttıkça yarıya iner
+
+İkisi de yeni parçayı eklerken sadece o parçayı (ve pencereden çıkan sepetleri)
+tarar; güncelleme maliyeti toplam veri boyutuna değil parça boyutuna bağlıdır.
+"""
+
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from sepet_veri import sepetleri_sec
+from birliktelik_motoru import cift_frekanslari, destek_filtrele
+
+
+_NS_GUN = 86_400 * 10**9         # Bir gündeki nanosaniye
+_YENIDEN_OLCEKLEME = 64          # Bu kadar yarı ömürde bir ağırlıklar yeniden ölçeklenir
+_UNUTMA_ESIGI = 1e-6             # Ağırlığı bunun altına düşen çiftler tablodan atılır
+
+
+def zamanlari_gune_cevir(zamanlar):
+    """Zaman damgalarını (tarih metni, datetime, datetime64) gün cinsinden sayılara çevirir"""
+    return np.asarray(pd.to_datetime(np.asarray(zamanlar)),
+                      dtype='datetime64[ns]').astype(np.int64) / _NS_GUN
+
+
+def _buyut(dizi, yeni_uzunluk):
+    if len(dizi) >= yeni_uzunluk:
+        return dizi
+    return np.concatenate([dizi, np.zeros(yeni_uzunluk - len(dizi), dtype=dizi.dtype)])
+
+
+class _ZamanliSayac:
+    """Ürün, çift ve sepet boyutu sayımlarını tutan ortak taban"""
+
+    _tur = np.int64
+
+    def __init__(self):
+        self.urunler = np.zeros(0, dtype=self._tur)
+        self.ciftler = Counter()
+        self.boyutlar = np.zeros(1, dtype=self._tur)
+        self.toplam = 0
+
+    def _boyutlandir(self, urun_sayisi):
+        self.urunler = _buyut(self.urunler, urun_sayisi)
+        self.boyutlar = _buyut(self.boyutlar, urun_sayisi + 1)
+
+
+class KayanPencereSayaci(_ZamanliSayac):
+    """
+    Son son_sepet sepetin ve/veya son son_gun günün sayımları
+    Penceredeki sepetler parçalar halinde tutulur; pencere kaydıkça en eski
+    parçanın çıkan sepetleri yeniden sayılıp tablolardan düşülür.
+    Parçaların zaman sırasıyla geldiği varsayılır (parça içi sıralama yapılır).
+    """
+
+    def __init__(self, son_sepet=None, son_gun=None):
+        if son_sepet is None and son_gun is None:
+            raise ValueError("son_sepet veya son_gun verilmeli")
+        super().__init__()
+        self.son_sepet = son_sepet
+        self.son_gun = son_gun
+        self.zaman_gerekli = son_gun is not None
+        self.son_zaman = -np.inf
+        self._parcalar = deque()   # (SepetVerisi, gün dizisi veya None)
+
+    @property
+    def toplam_sepet(self):
+        return self.toplam
+
+    def ekle(self, parca, zamanlar=None):
+        """Yeni parçayı pencereye ekler ve pencereyi kaydırır"""
+        gunler = None
+        if zamanlar is not None:
+            gunler = zamanlari_gune_cevir(zamanlar)
+            if len(gunler) != parca.sepet_sayisi:
+                raise ValueError("Her sepet için bir zaman damgası verilmeli")
+            sira = np.argsort(gunler, kind='stable')
+            if np.any(np.diff(sira) < 0):
+                parca, gunler = sepetleri_sec(parca, sira), gunler[sira]
+            if len(gunler):
+                self.son_zaman = max(self.son_zaman, gunler[-1])
+        elif self.son_gun is not None:
+            raise ValueError("Gün penceresi için sepet zaman damgaları gerekli")
+
+        self._sayimlari_ekle(parca, 1)
+        self._parcalar.append((parca, gunler))
+        self._kaydir()
+
+    def _kaydir(self):
+        """Pencere dışında kalan en eski sepetleri sayımlardan düşer"""
+        while self._parcalar:
+            parca, gunler = self._parcalar[0]
+
+            cikan = 0
+            if self.son_sepet is not None:
+                cikan = min(max(self.toplam - self.son_sepet, 0), parca.sepet_sayisi)
+            if self.son_gun is not None:
+                sinir = self.son_zaman - self.son_gun
+                cikan = max(cikan, int(np.searchsorted(gunler, sinir, side='right')))
+
+            if cikan == 0:
+                break
+            if cikan < parca.sepet_sayisi:
+                # Parçanın sadece başı pencereden çıkıyor; kalanı yerinde tutulur
+                self._sayimlari_ekle(sepetleri_sec(parca, np.arange(cikan)), -1)
+                self._parcalar[0] = (sepetleri_sec(parca, np.arange(cikan, parca.sepet_sayisi)),
+                                     gunler[cikan:] if gunler is not None else None)
+                break
+            self._sayimlari_ekle(parca, -1)
+            self._parcalar.popleft()
+
+    def _sayimlari_ekle(self, parca, isaret):
+        urun_sayisi = len(parca.sozluk)
+        self._boyutlandir(urun_sayisi)
+
+        self.urunler += isaret * np.bincount(parca.indices, minlength=len(self.urunler))
+        self.boyutlar += isaret * np.bincount(parca.sepet_boyutlari(),
+                                              minlength=len(self.boyutlar))
+        self.toplam += isaret * parca.sepet_sayisi
+
+        if isaret > 0:
+            self.ciftler.update(cift_frekanslari(parca))
+            return
+        for cift, sayi in cift_frekanslari(parca).items():
+            kalan = self.ciftler[cift] - sayi
+            if kalan:
+                self.ciftler[cift] = kalan
+            else:
+                del self.ciftler[cift]
+
+    def urun_sayilari(self):
+        return self.urunler
+
+    def sepet_boyutu_dagilimi(self):
+        return self.boyutlar
+
+    def destekli_ciftler(self, min_support=0.05):
+        return destek_filtrele(self.ciftler, self.toplam, min_support)
+
+
+class SonumluSayac(_ZamanliSayac):
+    """
+    Üstel sönümlü sayımlar: yaşı a olan sepetin ağırlığı 2^(-a / yarı ömür)
+    Yaş, en yeni sepete göre gün (yari_omur_gun) veya sepet sırası (yari_omur_sepet)
+    cinsindendir. Tablolar sabit bir referans zamana göre büyüyen ağırlıklarla
+    tutulur; böylece yeni parça eklerken eski sayımların hepsini küçültmek
+    gerekmez, okurken tek bir ölçek çarpanı uygulanır.
+    """
+
+    _tur = np.float64
+
+    def __init__(self, yari_omur_gun=None, yari_omur_sepet=None):
+        if (yari_omur_gun is None) == (yari_omur_sepet is None):
+            raise ValueError("yari_omur_gun veya yari_omur_sepet'ten biri verilmeli")
+        super().__init__()
+        self.yari_omur_gun = yari_omur_gun
+        self.zaman_gerekli = yari_omur_gun is not None
+        self.yari_omur = yari_omur_gun if yari_omur_gun is not None else yari_omur_sepet
+        self._referans = None
+        self._son = -np.inf
+        self._sepet_sirasi = 0
+
+    def _olcek(self):
+        """Tablodaki ağırlıkları en yeni sepet anındaki değerlerine çeviren çarpan"""
+        if self._referans is None:
+            return 1.0
+        return np.exp2(-(self._son - self._referans) / self.yari_omur)
+
+    @property
+    def toplam_sepet(self):
+        """Sönümlü (etkin) sepet sayısı"""
+        return self.toplam * self._olcek()
+
+    def ekle(self, parca, zamanlar=None):
+        """Yeni parçayı sepet yaşlarına göre ağırlıklandırarak ekler"""
+        if self.yari_omur_gun is not None:
+            if zamanlar is None:
+                raise ValueError("Gün cinsinden yarı ömür için sepet zaman damgaları gerekli")
+            konumlar = zamanlari_gune_cevir(zamanlar)
+            if len(konumlar) != parca.sepet_sayisi:
+                raise ValueError("Her sepet için bir zaman damgası verilmeli")
+        else:
+            konumlar = self._sepet_sirasi + np.arange(parca.sepet_sayisi, dtype=np.float64)
+            self._sepet_sirasi += parca.sepet_sayisi
+        if not len(konumlar):
+            return
+
+        if self._referans is None:
+            self._referans = konumlar.min()
+        self._son = max(self._son, konumlar.max())
+        if (self._son - self._referans) / self.yari_omur > _YENIDEN_OLCEKLEME:
+            self._yeniden_olcekle()
+
+        agirliklar = np.exp2((konumlar - self._referans) / self.yari_omur)
+        self._agirlikli_ekle(parca, agirliklar)
+
+    def _agirlikli_ekle(self, parca, agirliklar):
+        """Sepet ağırlıklı sayımlar: çiftler için Xᵀ·W·X"""
+        urun_sayisi = len(parca.sozluk)
+        self._boyutlandir(urun_sayisi)
+        boyutlar = parca.sepet_boyutlari()
+        oge_agirliklari = np.repeat(agirliklar, boyutlar)
+
+        self.urunler += np.bincount(parca.indices, weights=oge_agirliklari,
+                                    minlength=len(self.urunler))
+        self.boyutlar += np.bincount(boyutlar, weights=agirliklar, minlength=len(self.boyutlar))
+        self.toplam += agirliklar.sum()
+
+        sekil = (parca.sepet_sayisi, urun_sayisi)
+        X = sparse.csr_matrix((np.ones(len(parca.indices)), parca.indices, parca.indptr),
+                              shape=sekil)
+        W = sparse.csr_matrix((oge_agirliklari, parca.indices, parca.indptr), shape=sekil)
+        ust = sparse.triu(W.T @ X, k=1).tocoo()
+        self.ciftler.update(dict(zip(zip(ust.row.tolist(), ust.col.tolist()), ust.data.tolist())))
+
+    def _yeniden_olcekle(self):
+        """Referansı en yeni ana taşır; sönüp gitmiş çiftleri tablodan atar"""
+        carpan = self._olcek()
+        self.urunler *= carpan
+        self.boyutlar *= carpan
+        self.toplam *= carpan
+        self.ciftler = Counter({cift: agirlik * carpan for cift, agirlik in self.ciftler.items()
+                                if agirlik * carpan >= _UNUTMA_ESIGI})
+        self._referans = self._son
+
+    def urun_sayilari(self):
+        return self.urunler * self._olcek()
+
+    def sepet_boyutu_dagilimi(self):
+        return self.boyutlar * self._olcek()
+
+    def destekli_ciftler(self, min_support=0.05):
+        # Etkin sepet sayısı kesirli olduğundan eşik doğrudan oran üzerinden uygulanır
+        olcek = self._olcek()
+        sonuc = {}
+        for cift, agirlik in self.ciftler.items():
+            support = agirlik / self.toplam
+            if support >= min_support:
+                sonuc[cift] = {'sepet_sayisi': agirlik * olcek, 'support': support}
+        return sonuc